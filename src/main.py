@@ -1,19 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
+import queue
 import os
 import shutil
 import glob
-from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from .modules.video_to_text import VideoToText
 from .modules.gemini_responder import GeminiResponder
 from .modules.gamma_automator import GammaAutomator
 from .modules.fliki_video_generator import FlikiVideoGenerator
+from .utils.gemini_scheduler import get_scheduler
+from .utils.browser_session_pool import get_session_pool
+from .utils.stream_metrics import get_stream_metrics
+from .utils.streaming_writer import StreamingTextWriter
+from .utils.youtube_utils import extract_video_id
 
 DATA_DIR = "data"
 GENERATED_TEXT_DIR = os.path.join(DATA_DIR, "generated_texts")
 RESULT_DIR = os.path.join(DATA_DIR, "results")
 AUDIO_DIR = os.path.join(DATA_DIR, "audio")
+AUDIENCES = ["초등학생", "중학생", "고등학생", "일반인"]
+# 첫 조각이나 다음 조각이 이 시간(초) 동안 오지 않으면 대체 모델에도 요청하여 멈춘 응답이 GUI를 붙잡지 않게 합니다.
+HEDGE_AFTER_SECONDS = 30
 
 def ensure_dir(directory):
     if not os.path.exists(directory):
@@ -30,6 +39,133 @@ def save_generated_script(content: str, filename: str):
         messagebox.showerror("파일 저장 오류", f"파일 저장 중 오류 발생 ('{file_path}'): {e}")
         return None
 
+def _generate_to_file(responder, filename, output_queue=None, title=None, **data):
+    # 생성 중인 조각을 바로 파일(.part)과 GUI 출력 큐로 보내고, 완료되면 파일을 확정합니다.
+    try:
+        writer = StreamingTextWriter(os.path.join(GENERATED_TEXT_DIR, filename))
+    except OSError as e:
+        print(f"경고: 스트리밍 파일을 열 수 없어 완료 후 저장합니다: {e}")
+        writer = None
+    if output_queue is not None and title:
+        output_queue.put(("start", f"\n===== {title} =====\n"))
+
+    def on_chunk(text):
+        if writer:
+            writer.write(text)
+        if output_queue is not None:
+            output_queue.put(("chunk", text))
+
+    def on_reset():
+        if writer:
+            writer.reset()
+        if output_queue is not None:
+            output_queue.put(("reset", None))
+
+    try:
+        content = responder.generate_response(on_chunk=on_chunk, on_reset=on_reset, **data)
+    finally:
+        if writer:
+            writer.close()
+    if not content:
+        return None, None
+    if writer:
+        return content, writer.commit()
+    return content, save_generated_script(content, filename)
+
+def _generate_audience_variant(original_script, audience, lecture_title, professor_name, suffix, use_context_cache, output_queue=None):
+    result = {"script": None, "detail": None, "script_path": None, "detail_path": None}
+
+    script_responder = GeminiResponder(
+        prompt_mode="script",
+        target_audience=audience,
+        use_cache=True,
+        use_context_cache=use_context_cache,
+        hedge_after_seconds=HEDGE_AFTER_SECONDS,
+        use_similarity_index=True,
+    )
+    result["script"], result["script_path"] = _generate_to_file(
+        script_responder,
+        f"generated_script{suffix}.txt",
+        output_queue,
+        f"{audience} 대상 강의 스크립트",
+        script=original_script,
+        lecture_title=lecture_title,
+        professor_name=professor_name,
+    )
+    if not result["script"]:
+        return result
+
+    detail_responder = GeminiResponder(
+        prompt_mode="detail",
+        target_audience=audience,
+        use_cache=True,
+        hedge_after_seconds=HEDGE_AFTER_SECONDS,
+    )
+    result["detail"], result["detail_path"] = _generate_to_file(
+        detail_responder,
+        f"detail_page{suffix}.txt",
+        output_queue,
+        f"{audience} 대상 상세 페이지",
+        lecture_title=lecture_title,
+        script=result["script"],
+        professor_name=professor_name,
+    )
+    return result
+
+def generate_audience_variants(original_script, audiences, lecture_title, professor_name, max_workers=4, output_queue=None):
+    """
+    여러 학습 대상자용 스크립트와 상세 페이지를 동시에 생성합니다.
+
+    대상이 둘 이상이면 대상별 파일(`generated_script_<대상>.txt`, `detail_page_<대상>.txt`)로
+    저장하고, 원본 스크립트는 서버 측 컨텍스트 캐시로 공유합니다.
+
+    Args:
+        original_script (str): YouTube에서 추출한 원본 스크립트.
+        audiences (list[str]): 생성할 학습 대상자 목록.
+        lecture_title (str): 강의 제목.
+        professor_name (str): 교수명.
+        max_workers (int, optional): 동시에 생성할 최대 대상 수. Defaults to 4.
+        output_queue (queue.Queue, optional): 첫 번째 대상의 생성 조각을 받을 큐.
+            `("start" | "chunk" | "reset", 텍스트)` 형태로 넣습니다.
+
+    Returns:
+        dict: 대상자별 `script`, `detail`, `script_path`, `detail_path` 결과.
+    """
+    fan_out = len(audiences) > 1
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _generate_audience_variant,
+                    original_script,
+                    audience,
+                    lecture_title,
+                    professor_name,
+                    f"_{audience}" if fan_out else "",
+                    fan_out,
+                    output_queue if audience == audiences[0] else None,
+                ): audience
+                for audience in audiences
+            }
+            for future in as_completed(futures):
+                audience = futures[future]
+                try:
+                    results[audience] = future.result()
+                except Exception as e:
+                    print(f"Error: '{audience}' 대상 자료 생성 중 오류 발생: {e}")
+                    results[audience] = {"script": None, "detail": None, "script_path": None, "detail_path": None}
+    finally:
+        if fan_out:
+            GeminiResponder.release_context_caches()
+        for usage in get_scheduler().key_stats().values():
+            label = usage.pop("label")
+            print(f"[API 키 사용량] {label}: {usage}")
+        print(f"[헤지 요청 통계] {GeminiResponder.hedge_stats()}")
+        for key, summary in get_stream_metrics().summary().items():
+            print(f"[스트리밍 지표] {key}: {summary}")
+    return results
+
 def get_latest_file(directory, extension):
     list_of_files = glob.glob(os.path.join(directory, f"*.{extension}"))
     if not list_of_files:
@@ -55,6 +191,8 @@ class AICreatorGUI(tk.Tk):
         self.difficulty_level = tk.StringVar(value="초")
         self.lecture_number = tk.StringVar()
         self.target_audience = tk.StringVar(value="일반인")
+        self.generate_all_audiences = tk.BooleanVar(value=False)
+        self.prefer_captions = tk.BooleanVar(value=False)
 
         # 단계별 결과 변수
         self.new_script = None
@@ -65,7 +203,11 @@ class AICreatorGUI(tk.Tk):
         self.fliki_prompt_path = None
         self.video_path = None
 
+        # 생성 스레드가 넣은 텍스트 조각을 메인 스레드에서 진행 창에 출력합니다.
+        self.stream_queue = queue.Queue()
+
         self._setup_ui()
+        self.after(100, self._drain_stream_queue)
 
     def _setup_ui(self):
         self.notebook = ttk.Notebook(self)
@@ -112,9 +254,17 @@ class AICreatorGUI(tk.Tk):
         ttk.Label(frame, text="학습 대상자:").pack(pady=5, anchor="w")
         audience_frame = ttk.Frame(frame)
         audience_frame.pack(fill="x", pady=2)
-        for audience in ["초등학생", "중학생", "고등학생", "일반인"]:
+        for audience in AUDIENCES:
             ttk.Radiobutton(audience_frame, text=audience, variable=self.target_audience, value=audience).pack(
                 side="left", padx=5)
+        ttk.Checkbutton(
+            frame, text="모든 학습 대상자용 스크립트/상세 페이지 동시 생성", variable=self.generate_all_audiences
+        ).pack(pady=2, anchor="w")
+        ttk.Checkbutton(
+            frame,
+            text="YouTube 자막이 있으면 음성 인식 대신 자막 사용 (빠르지만 자동 생성 자막은 품질이 낮을 수 있음)",
+            variable=self.prefer_captions,
+        ).pack(pady=2, anchor="w")
 
         ttk.Button(frame, text="다음", command=lambda: self._run_in_thread(self._step1_next)).pack(pady=20, fill="x")
 
@@ -185,6 +335,36 @@ class AICreatorGUI(tk.Tk):
         self.progress_bar = ttk.Progressbar(self.progress_win, orient="horizontal", length=300, mode="indeterminate")
         self.progress_bar.pack(pady=10)
         self.progress_bar.start()
+        self.progress_output = None
+
+    def _progress_output_widget(self):
+        if not hasattr(self, "progress_win") or not self.progress_win.winfo_exists():
+            return None
+        if self.progress_output is None:
+            self.progress_win.geometry("640x480")
+            self.progress_output = scrolledtext.ScrolledText(self.progress_win, wrap=tk.WORD, height=18)
+            self.progress_output.pack(fill="both", expand=True, padx=10, pady=10)
+        return self.progress_output
+
+    def _drain_stream_queue(self):
+        try:
+            while True:
+                kind, text = self.stream_queue.get_nowait()
+                output = self._progress_output_widget()
+                if output is None:
+                    continue
+                if kind == "start":
+                    output.insert(tk.END, text)
+                    output.mark_set("stage_start", "end-1c")
+                    output.mark_gravity("stage_start", tk.LEFT)
+                elif kind == "reset":
+                    output.delete("stage_start", tk.END)
+                else:
+                    output.insert(tk.END, text)
+                output.see(tk.END)
+        except queue.Empty:
+            pass
+        self.after(100, self._drain_stream_queue)
 
     def _update_progress(self, message):
         if hasattr(self, "progress_label"):
@@ -209,48 +389,58 @@ class AICreatorGUI(tk.Tk):
                 messagebox.showerror("입력 오류", "YouTube URL을 입력해주세요.")
                 self._hide_progress_window()
                 return
+            if not extract_video_id(url):
+                messagebox.showerror("입력 오류", "유효한 YouTube 동영상 URL이 아닙니다.")
+                self._hide_progress_window()
+                return
 
             self._update_progress("1. YouTube 동영상 스크립트 추출 시작...")
             video_to_text = VideoToText()
-            if not video_to_text.download_youtube_audio(url):
-                messagebox.showerror("오류", "YouTube 오디오 다운로드에 실패했습니다.")
+            original_script = video_to_text.get_script_from_youtube(
+                url, prefer_captions=self.prefer_captions.get()
+            )
+            if not original_script:
+                messagebox.showerror("오류", "YouTube 스크립트 추출에 실패했습니다.")
                 self._hide_progress_window()
                 return
-            original_script = video_to_text.get_script()
             
-            self._update_progress("2. 새로운 동영상 스크립트 생성 시작...")
-            script_responder = GeminiResponder(prompt_mode="script", target_audience=self.target_audience.get())
-            # --- 수정된 부분 ---
-            self.new_script = script_responder.generate_response(
-                script=original_script,
+            primary_audience = self.target_audience.get()
+            if self.generate_all_audiences.get():
+                audiences = [primary_audience] + [a for a in AUDIENCES if a != primary_audience]
+            else:
+                audiences = [primary_audience]
+
+            self._update_progress(f"2. 스크립트 및 상세 페이지 생성 시작 (대상 {len(audiences)}개)...")
+            variants = generate_audience_variants(
+                original_script,
+                audiences,
                 lecture_title=self.lecture_title.get(),
-                professor_name=self.professor_name.get()
+                professor_name=self.professor_name.get(),
+                output_queue=self.stream_queue,
             )
-            # --- 여기까지 ---
-            if not self.new_script:
+            primary = variants[primary_audience]
+            if not primary["script"]:
                 messagebox.showerror("오류", "새로운 스크립트를 생성하지 못했습니다.")
                 self._hide_progress_window()
                 return
-            self.script_path = save_generated_script(self.new_script, "generated_script.txt")
-            
-            self._update_progress("3. 상세 페이지 생성 시작...")
-            detail_responder = GeminiResponder(prompt_mode="detail", target_audience=self.target_audience.get())
-            # --- 수정된 부분 ---
-            detail_page_content = detail_responder.generate_response(
-                lecture_title=self.lecture_title.get(),
-                script=self.new_script,
-                professor_name=self.professor_name.get()
-            )
-            # --- 여기까지 ---
-            if not detail_page_content:
+            if not primary["detail"]:
                 messagebox.showerror("오류", "상세 페이지 내용을 생성하지 못했습니다.")
                 self._hide_progress_window()
                 return
-            self.detail_path = save_generated_script(detail_page_content, "detail_page.txt")
+            self.new_script = primary["script"]
+            self.script_path = primary["script_path"]
+            self.detail_path = primary["detail_path"]
+
+            failed = [audience for audience, v in variants.items() if not v["detail_path"]]
+            if failed:
+                messagebox.showwarning("경고", f"다음 대상의 자료 생성에 실패했습니다: {', '.join(failed)}")
 
             self.script_path_label.config(text=f"파일 경로: {self.script_path}")
             self.detail_path_label.config(text=f"파일 경로: {self.detail_path}")
 
+            # 2단계로 넘어갈 때만, 사용자가 결과를 확인하는 동안 Gamma 브라우저 세션을 미리 준비
+            get_session_pool().warm(GammaAutomator.DOWNLOAD_SUBDIR, GammaAutomator.START_URL)
+
             self._hide_progress_window()
             self._go_to_step(2)
         except Exception as e:
@@ -258,6 +448,8 @@ class AICreatorGUI(tk.Tk):
             messagebox.showerror("오류", f"1단계 처리 중 오류 발생: {e}")
             
     def _step2_next(self):
+        gamma_automator = None
+        session_healthy = True
         try:
             self._update_progress("4. Gamma를 사용하여 PPT 생성 시작...")
             gamma_automator = GammaAutomator(target_audience=self.target_audience.get())
@@ -288,16 +480,23 @@ class AICreatorGUI(tk.Tk):
             with open(self.gamma_prompt_path, 'r', encoding='utf-8') as f:
                 self.gamma_prompt_text.insert(tk.END, f.read())
 
+            # 3단계로 넘어갈 때만 Fliki 브라우저 세션을 미리 준비
+            get_session_pool().warm(FlikiVideoGenerator.DOWNLOAD_SUBDIR, FlikiVideoGenerator.START_URL)
+
             self._hide_progress_window()
             self._go_to_step(3)
         except Exception as e:
+            session_healthy = False
             self._hide_progress_window()
             messagebox.showerror("오류", f"2단계 처리 중 오류 발생: {e}")
         finally:
-            if hasattr(gamma_automator, "driver") and gamma_automator.driver:
-                gamma_automator.driver.quit()
+            # 브라우저 세션은 종료하지 않고 다음 작업을 위해 풀에 돌려줌
+            if gamma_automator:
+                gamma_automator.release(healthy=session_healthy)
 
     def _step3_next(self):
+        fliki_generator = None
+        session_healthy = True
         try:
             self._update_progress("5. Fliki를 사용하여 동영상 생성 시작...")
             fliki_generator = FlikiVideoGenerator(
@@ -340,11 +539,12 @@ class AICreatorGUI(tk.Tk):
             self._hide_progress_window()
             self._go_to_step(4)
         except Exception as e:
+            session_healthy = False
             self._hide_progress_window()
             messagebox.showerror("오류", f"3단계 처리 중 오류 발생: {e}")
         finally:
-            if hasattr(fliki_generator, "driver") and fliki_generator.driver:
-                fliki_generator.driver.quit()
+            if fliki_generator:
+                fliki_generator.release(healthy=session_healthy)
 
     def _go_to_step(self, step_number):
         for i in range(4):
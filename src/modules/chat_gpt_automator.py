@@ -1,10 +1,10 @@
-import time
 import platform
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from dotenv import load_dotenv
-from ..utils.selenium_setup import setup_selenium_driver
+from ..utils.browser_session_pool import get_session_pool
 from ..utils.selenium_utils import (
     chrome_focuse,
     press_shift_tab_multiple_times,
@@ -18,6 +18,8 @@ load_dotenv(override=True)
 
 
 class ChatGPTAutomator:
+    DOWNLOAD_SUBDIR = "pdfs"
+    START_URL = "https://chatgpt.com"
     BASE_PROMPT = """
 아래와 같은 조건으로 썸네일용 이미지를 생성하려고 합니다. 별도의 질문/답변 없이 바로 생성해주세요.
 
@@ -89,13 +91,32 @@ class ChatGPTAutomator:
     """
     
     def __init__(self):
-        self.driver, self.chrome_browser_opened_by_script = setup_selenium_driver(
-            download_subdir="pdfs", start_url="https://chatgpt.com"
+        self.driver, self.chrome_browser_opened_by_script = get_session_pool().acquire(
+            download_subdir=self.DOWNLOAD_SUBDIR, start_url=self.START_URL
         )
         if not self.driver:
             print("WebDriver 초기화 실패. ChatGPTAutomator 인스턴스 생성 중단.")
 
+    def release(self, healthy=True):
+        """
+        WebDriver 세션을 세션 풀에 돌려줍니다.
+
+        Args:
+            healthy (bool, optional): False이면 세션을 재사용하지 않고 종료합니다. 기본값은 True.
+        """
+        if self.driver:
+            get_session_pool().release(self.driver, healthy=healthy)
+            self.driver = None
+
     def login(self):
+        """
+        ChatGPT 로그인 버튼을 키 입력으로 눌러 로그인한 뒤, 로그인 완료를 기다립니다.
+
+        자동 입력이 실패하면 사용자가 직접 로그인할 때까지 기다립니다.
+
+        Returns:
+            bool: 로그인 성공 여부.
+        """
         try:
             WebDriverWait(self.driver, 5).until(
                 EC.visibility_of_all_elements_located(
@@ -107,17 +128,13 @@ class ChatGPTAutomator:
             )
             
             chrome_focuse(self.driver)
-            time.sleep(1)
             
             if self.driver.find_elements(By.XPATH, "/html/body/div[5]/div/div/div/div/div"):
-                press_shift_tab_multiple_times(3)
-                if platform.system() == "Windows":
-                    press_shift_tab_multiple_times(1)
-                press_enter()
-                
+                # Windows에서는 포커스 순서에 요소가 하나 더 있음
+                count = 4 if platform.system() == "Windows" else 3
+                press_shift_tab_multiple_times(self.driver, count)
             else:
-                press_shift_tab_multiple_times(3)
-                press_enter()
+                press_shift_tab_multiple_times(self.driver, 3)
                 
             WebDriverWait(self.driver, 10).until(
                 EC.visibility_of_all_elements_located(
@@ -127,24 +144,14 @@ class ChatGPTAutomator:
                     )
                 )
             )
-            press_tab_multiple_times(3)
-            press_enter()
-            time.sleep(3)
-        except TimeoutError:
-            print("로그인 시간 초과 또는 페이지 로딩 실패.")
-            print("자동화 프로세스를 시작할 수 없습니다.")
-            print("=" * 50)
-            self.driver.quit()
-            return False
+            press_tab_multiple_times(self.driver, 3)
         except Exception as e:
-            print(f"로그인 확인 중 오류 발생: {e}")
-            print("=" * 50)
-            self.driver.quit()
-            return False
-        finally:
-            login_complete_indicator_xpath = (
-                "/html/body/div[1]/div/div[1]/div[1]/div/div/div/nav/div[1]/div"
-            )
+            print(f"자동 로그인 입력 중 오류 발생: {e}. 수동 로그인을 기다립니다.")
+
+        login_complete_indicator_xpath = (
+            "/html/body/div[1]/div/div[1]/div[1]/div/div/div/nav/div[1]/div"
+        )
+        try:
             WebDriverWait(self.driver, 300).until(
                 EC.presence_of_element_located(
                     (By.XPATH, login_complete_indicator_xpath)
@@ -154,7 +161,17 @@ class ChatGPTAutomator:
             print("자동화 프로세스를 시작합니다.")
             print("=" * 50)
             return True
-                
+        except TimeoutException:
+            print("로그인 시간 초과 또는 페이지 로딩 실패.")
+            print("자동화 프로세스를 시작할 수 없습니다.")
+            print("=" * 50)
+            self.release(healthy=False)
+            return False
+        except Exception as e:
+            print(f"로그인 확인 중 오류 발생: {e}")
+            print("=" * 50)
+            self.release(healthy=False)
+            return False
                 
     def generate_thumbnail(self, **data):
         paste_text_to_element(
@@ -162,7 +179,7 @@ class ChatGPTAutomator:
             "/html/body/div[1]/div/div[1]/div[2]/main/div/div/div[3]/div[1]/div/div/div[2]/form/div[1]/div/div[1]/div[1]/div[2]/div/div/div/div/div/p",
             self.BASE_PROMPT.format(**data)
         )
-        press_enter()
+        press_enter(self.driver)
         
         
 
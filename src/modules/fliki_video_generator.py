@@ -1,7 +1,4 @@
-import time
 import os
-import pyautogui # pyautogui import 추가
-import glob
 import shutil
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -13,13 +10,23 @@ from ..utils.selenium_utils import (
     upload_file_to_element,
     select_dropdown_option,
     chrome_focuse,
+    press_key,
+    switch_to_new_window,
     press_tab_multiple_times,
     slider_drag,
+    wait_until,
+    wait_for_page_ready,
+    wait_for_dom_quiescence,
+    list_files,
+    wait_for_new_file,
+    start_wait_report,
 )
-from ..utils.selenium_setup import setup_selenium_driver
+from ..utils.browser_session_pool import get_session_pool
 
 
 class FlikiVideoGenerator:
+    DOWNLOAD_SUBDIR = "results"
+    START_URL = "https://app.fliki.ai/"
     BASE_SCRIP = """{target_audience}도 충분히 이해할 수 있도록 '{lecture_title}'이라는 개념을 쉽고 명확하게 설명하는 교육용 영상을 제작해줘.
 설명은 너무 기술적이거나 전문적인 용어를 사용하지 말고, 일상생활에서 쉽게 접할 수 있는 상황이나 친숙한 예시를 활용해 설명해줘.
 핵심 개념은 짧고 간결하게 정리하되, 아이들이 자연스럽게 흥미를 가질 수 있도록 이야기하듯 전달해줘.
@@ -33,14 +40,27 @@ class FlikiVideoGenerator:
 
         공통 Selenium WebDriver 설정을 로드하고 Fliki 웹사이트로 이동합니다.
         """
-        self.driver, self.chrome_browser_opened_by_script = setup_selenium_driver(
-            download_subdir="results", start_url="https://app.fliki.ai/"
+        self.driver, self.chrome_browser_opened_by_script = get_session_pool().acquire(
+            download_subdir=self.DOWNLOAD_SUBDIR, start_url=self.START_URL
         )
         if not self.driver:
             print("WebDriver 초기화 실패. FlikiVideoGenerator 인스턴스 생성 중단.")
 
         self.target_audience = data.get("target_audience", "일반인")
         self.lecture_title = data.get("lecture_title", "강의 제목")
+        # 로그인부터 동영상 다운로드까지를 한 번의 실행으로 보고 대기 시간을 집계합니다.
+        self.wait_report = start_wait_report(self.driver)
+
+    def release(self, healthy=True):
+        """
+        WebDriver 세션을 세션 풀에 돌려줍니다.
+
+        Args:
+            healthy (bool, optional): False이면 세션을 재사용하지 않고 종료합니다. 기본값은 True.
+        """
+        if self.driver:
+            get_session_pool().release(self.driver, healthy=healthy)
+            self.driver = None
 
     def login(self):
         """
@@ -61,43 +81,43 @@ class FlikiVideoGenerator:
                     )
                 )
             )
-            time.sleep(3)
+            wait_for_page_ready(self.driver, timeout=10)
 
             chrome_focuse(self.driver)
-            time.sleep(5)
+            main_window = self.driver.current_window_handle
 
             # --- 변경된 로그인 키 순서 ---
+            # CDP로 탭에 직접 키를 보내고, Enter 뒤에는 화면이 바뀔 때까지 기다립니다.
             # 1. 탭 3, 엔터
-            for _ in range(3):
-                pyautogui.press("tab")
-                time.sleep(0.2)
-            pyautogui.press("enter")
-            time.sleep(1)
+            press_key(self.driver, "tab", 3, interval=0.2)
+            press_key(self.driver, "enter")
+            wait_for_dom_quiescence(self.driver, timeout=3)
 
             # 2. 방향키↓ 1, 엔터
-            pyautogui.press("down")
-            time.sleep(0.2)
-            pyautogui.press("enter")
-            time.sleep(1)
+            press_key(self.driver, "down", interval=0.2)
+            press_key(self.driver, "enter")
+            wait_for_dom_quiescence(self.driver, timeout=3)
 
             # 3. 탭 1, 엔터
-            pyautogui.press("tab")
-            time.sleep(0.2)
-            pyautogui.press("enter")
-            time.sleep(3)
+            known_windows = self.driver.window_handles
+            press_key(self.driver, "tab", interval=0.2)
+            press_key(self.driver, "enter")
+            # 계정 선택 창이 팝업으로 열리면 그 창으로 전환해 키를 보냄
+            if switch_to_new_window(self.driver, known_windows, timeout=5):
+                chrome_focuse(self.driver)
+            wait_for_page_ready(self.driver, timeout=10)
 
             # 4. 방향키↓ 2, 엔터
-            for _ in range(2):
-                pyautogui.press("down")
-                time.sleep(0.2)
-            pyautogui.press("enter")
-            time.sleep(1)
+            press_key(self.driver, "down", 2, interval=0.2)
+            press_key(self.driver, "enter")
+            wait_for_dom_quiescence(self.driver, timeout=3)
 
             # 5. 탭 2, 엔터
-            for _ in range(2):
-                pyautogui.press("tab")
-                time.sleep(0.2)
-            pyautogui.press("enter")
+            press_key(self.driver, "tab", 2, interval=0.2)
+            press_key(self.driver, "enter")
+
+            if main_window in self.driver.window_handles:
+                self.driver.switch_to.window(main_window)
             # --- 여기까지 변경 ---
 
             return True
@@ -119,12 +139,12 @@ class FlikiVideoGenerator:
                 print("로그인 시간 초과 또는 페이지 로딩 실패.")
                 print("자동화 프로세스를 시작할 수 없습니다.")
                 print("=" * 50)
-                self.driver.quit()
+                self.release(healthy=False)
                 return False
             except Exception as e:
                 print(f"로그인 확인 중 오류 발생: {e}")
                 print("=" * 50)
-                self.driver.quit()
+                self.release(healthy=False)
                 return False
 
     def _handle_upload_step(self, ppt_file_path):
@@ -200,7 +220,6 @@ class FlikiVideoGenerator:
             print(f"업로드 실패 (input: {file_input_xpath}).")
             return False
         print("PPT 파일 업로드 요청 성공.")
-        time.sleep(5)
 
         upload_next_button_xpath = "//button[.//span[text()='Next']]"
         print(f"Next 버튼 클릭 시도: {upload_next_button_xpath}")
@@ -275,7 +294,6 @@ class FlikiVideoGenerator:
 
         style_skip_button_xpath = "//button[.//span[text()='Skip']]"
         print(f"Skip 버튼 클릭 시도: {style_skip_button_xpath}")
-        time.sleep(1)
         if not element_click(self.driver, style_skip_button_xpath):
             print("오류: 스타일 단계의 Skip 버튼 클릭 실패.")
             return False
@@ -347,8 +365,22 @@ class FlikiVideoGenerator:
             f"비디오 생성 완료 대기 중... (오버레이 사라짐 감지: {generation_overlay_xpath})"
         )
         try:
-            WebDriverWait(self.driver, 600).until(
-                EC.invisibility_of_element_located((By.XPATH, generation_overlay_xpath))
+            # 제출 직후에는 오버레이가 아직 없을 수 있으므로 먼저 나타나기를 잠시 기다림
+            wait_until(
+                self.driver,
+                EC.visibility_of_element_located((By.XPATH, generation_overlay_xpath)),
+                timeout=15,
+                label="생성 오버레이 표시",
+            )
+        except TimeoutException:
+            print("생성 오버레이가 표시되지 않았습니다. 이미 생성이 끝났을 수 있습니다.")
+        try:
+            wait_until(
+                self.driver,
+                EC.invisibility_of_element_located((By.XPATH, generation_overlay_xpath)),
+                timeout=600,
+                poll_interval=1,
+                label="비디오 생성",
             )
             print("비디오 생성 완료 감지됨.")
         except TimeoutException:
@@ -360,7 +392,18 @@ class FlikiVideoGenerator:
             print(f"오류: 비디오 생성 대기 중 예상치 못한 오류 발생: {e}")
             return False
 
-        time.sleep(3)
+        wait_for_dom_quiescence(self.driver, quiet_ms=500, timeout=10)
+
+        current_file_dir = os.path.dirname(os.path.abspath(__file__))
+        download_directory = os.path.join(current_file_dir, "..", "..", "data", "results")
+        
+        # 다운로드 디렉토리 생성
+        if not os.path.exists(download_directory):
+            os.makedirs(download_directory)
+
+        # 다운로드가 빨리 끝나도 놓치지 않도록 다운로드 버튼을 누르기 전에 기존 파일 목록을 구함
+        downloads_folder = download_directory
+        initial_files = list_files(downloads_folder, "*.mp4")
 
         download_button_1_xpath = "//button[.//span[text()='Download']]" #/html/body/div/main/div/div/div[1]/nav[2]/button[3]
         print(f"다운로드 버튼 1 클릭 시도: {download_button_1_xpath}")
@@ -368,7 +411,7 @@ class FlikiVideoGenerator:
             print("오류: 다운로드 버튼 1 클릭 실패.")
             print("페이지 새로고침 후 재시도...")
             self.driver.refresh()
-            time.sleep(5)
+            wait_for_page_ready(self.driver, timeout=30)
             if not element_click(self.driver, download_button_1_xpath):
                 print("오류: 새로고침 후에도 다운로드 버튼 1 클릭 실패.")
                 return False
@@ -433,32 +476,12 @@ class FlikiVideoGenerator:
         except Exception as e:
             print(f"오류: 최종 확인 버튼 ({final_confirmation_button_xpath}) 처리 중 예상치 못한 오류 발생: {e}")
         
-        time.sleep(15)  # 다운로드가 완료될 시간을 줌
-
-        current_file_dir = os.path.dirname(os.path.abspath(__file__))
-        download_directory = os.path.join(current_file_dir, "..", "..", "data", "results")
-        
-        # 다운로드 디렉토리 생성
-        if not os.path.exists(download_directory):
-            os.makedirs(download_directory)
-
-        # 시스템의 기본 다운로드 폴더에서 가장 최근에 다운로드된 동영상 파일을 찾음
-        downloads_folder = download_directory
-        if not os.path.exists(downloads_folder):
-            print("오류: 시스템의 다운로드 폴더를 찾을 수 없습니다.")
-            return False
-            
-        initial_files = set(glob.glob(os.path.join(downloads_folder, '*.mp4')))
-        
-        new_file_path = None
-        for _ in range(30):  # 최대 30초 대기
-            current_files = set(glob.glob(os.path.join(downloads_folder, '*.mp4')))
-            new_files = current_files - initial_files
-            if new_files:
-                new_file_path = max(new_files, key=os.path.getctime)
-                print(f"새 동영상 파일 감지: {new_file_path}")
-                break
-            time.sleep(1)
+        # 다운로드가 끝나 .crdownload가 .mp4로 바뀌는 즉시 진행 (최대 5분 대기)
+        new_file_path = wait_for_new_file(
+            downloads_folder, "*.mp4", initial_files, timeout=300, driver=self.driver
+        )
+        if new_file_path:
+            print(f"새 동영상 파일 감지: {new_file_path}")
         
         if not new_file_path:
             print("오류: 지정된 시간 내에 새 동영상 파일이 다운로드되지 않았습니다.")
@@ -551,10 +574,11 @@ class FlikiVideoGenerator:
             return False
 
         print("--- 비디오 생성 프로세스 성공적으로 제출 완료 ---")
-        time.sleep(5)
 
         print("--- 비디오 생성 완료 대기 및 다운로드 시작 ---")
-        if not self._wait_and_download_video():
+        downloaded = self._wait_and_download_video()
+        self.wait_report.print_report("Fliki 대기 시간")
+        if not downloaded:
             print("비디오 다운로드 실패.")
             return True
         else:
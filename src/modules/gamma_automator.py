@@ -1,7 +1,5 @@
 import time
 import os
-import pyautogui
-import glob
 import shutil
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -11,22 +9,45 @@ from ..utils.selenium_utils import (
     paste_text_to_element,
     press_tab_multiple_times,
     chrome_focuse,
+    press_key,
+    wait_for_page_ready,
+    wait_for_dom_quiescence,
+    list_files,
+    wait_for_new_file,
+    switch_to_new_window,
+    start_wait_report,
 )
-from ..utils.selenium_setup import setup_selenium_driver
+from ..utils.browser_session_pool import get_session_pool
 
 
 class GammaAutomator:
+    DOWNLOAD_SUBDIR = "results"
+    START_URL = "https://gamma.app/create/paste"
+
     def __init__(self, target_audience="일반인"):
         """
         GammaAutomator 클래스를 초기화합니다.
         """
-        self.driver, self.chrome_browser_opened_by_script = setup_selenium_driver(
-            download_subdir="results", start_url="https://gamma.app/create/paste"
+        self.driver, self.chrome_browser_opened_by_script = get_session_pool().acquire(
+            download_subdir=self.DOWNLOAD_SUBDIR, start_url=self.START_URL
         )
         if not self.driver:
             print("WebDriver 초기화 실패. GammaAutomator 인스턴스 생성 중단.")
 
         self.target_audience = target_audience
+        # 로그인부터 PDF 내보내기까지를 한 번의 실행으로 보고 대기 시간을 집계합니다.
+        self.wait_report = start_wait_report(self.driver)
+
+    def release(self, healthy=True):
+        """
+        WebDriver 세션을 세션 풀에 돌려줍니다.
+
+        Args:
+            healthy (bool, optional): False이면 세션을 재사용하지 않고 종료합니다. 기본값은 True.
+        """
+        if self.driver:
+            get_session_pool().release(self.driver, healthy=healthy)
+            self.driver = None
 
     def login(self):
         """
@@ -47,30 +68,35 @@ class GammaAutomator:
                     )
                 )
             )
-            time.sleep(3)
+            wait_for_page_ready(self.driver, timeout=10)
 
             if self.chrome_browser_opened_by_script:
                 chrome_focuse(self.driver)
-                time.sleep(1)
-            
+            main_window = self.driver.current_window_handle
+
             # --- 변경된 로그인 키 순서 ---
+            # CDP로 탭에 직접 키를 보내고, 키 사이에는 0.7초 간격을 둡니다.
             # 1. 탭 7
-            for _ in range(7):
-                pyautogui.press("tab")
-                time.sleep(0.7)
+            press_key(self.driver, "tab", 7, interval=0.7)
 
             # 2. 방향키 ↓ 3, 엔터
-            for _ in range(3):  
-                pyautogui.press("down")
-                time.sleep(0.7)
-            pyautogui.press("enter")
-            time.sleep(0.7)
-            
+            known_windows = self.driver.window_handles
+            press_key(self.driver, "down", 3, interval=0.7)
+            press_key(self.driver, "enter")
+            # 계정 선택 창이 팝업으로 열리면 그 창으로 전환해 키를 보냄
+            if switch_to_new_window(self.driver, known_windows, timeout=5):
+                chrome_focuse(self.driver)
+                wait_for_page_ready(self.driver, timeout=10)
+            else:
+                wait_for_dom_quiescence(self.driver, timeout=3)
+
             # 3. 탭 3, 엔터
-            for _ in range(3):
-                pyautogui.press("tab")
-                time.sleep(0.7)
-            pyautogui.press("enter")
+            press_key(self.driver, "tab", 3, interval=0.7)
+            press_key(self.driver, "enter")
+
+            if main_window in self.driver.window_handles:
+                self.driver.switch_to.window(main_window)
+            # --- 여기까지 변경 ---
 
             return True
         except Exception as _:
@@ -91,12 +117,12 @@ class GammaAutomator:
                 print("로그인 시간 초과 또는 페이지 로딩 실패.")
                 print("자동화 프로세스를 시작할 수 없습니다.")
                 print("=" * 50)
-                self.driver.quit()
+                self.release(healthy=False)
                 return False
             except Exception as e:
                 print(f"로그인 확인 중 오류 발생: {e}")
                 print("=" * 50)
-                self.driver.quit()
+                self.release(healthy=False)
                 return False
 
     def _paste_script_and_continue(self, script):
@@ -252,7 +278,7 @@ class GammaAutomator:
                 EC.presence_of_element_located((By.XPATH, completion_indicator_xpath))
             )
             print("PPT 생성 완료")
-            time.sleep(2)
+            wait_for_dom_quiescence(self.driver, quiet_ms=500, timeout=10)
             return True
         except TimeoutError:
             print("PPT 생성 시간 초과")
@@ -284,12 +310,25 @@ class GammaAutomator:
                     )
                 )
                 export_button.click()
-                time.sleep(1)
+                wait_for_dom_quiescence(self.driver, timeout=3)
                 print("내보내기 버튼 클릭 (텍스트 기반)")
             except Exception as e:
                 print(f"내보내기 버튼 클릭 실패: {e}")
                 return False
 
+        # 다운로드 경로 설정
+        current_file_dir = os.path.dirname(os.path.abspath(__file__))
+        download_directory = os.path.join(current_file_dir, "..", "..", "data", "results")
+
+        # 시스템의 기본 다운로드 폴더에서 가장 최근에 다운로드된 PDF 파일을 찾음
+        downloads_folder = download_directory
+        if not os.path.exists(downloads_folder):
+            print("오류: 시스템의 다운로드 폴더를 찾을 수 없습니다.")
+            return False
+
+        # 다운로드가 빨리 끝나도 놓치지 않도록 내보내기 전에 기존 파일 목록을 구함
+        initial_files = list_files(downloads_folder, "*.pdf")
+
         export_pdf_button_xpath = (
             "/html/body/div[311]/div[3]/div/section/div/div[2]/div[2]/button[1]"
         )
@@ -306,30 +345,12 @@ class GammaAutomator:
                 print(f"PDF로 내보내기 버튼 클릭 실패: {e}")
                 return False
         
-        time.sleep(5)  # 다운로드가 시작될 시간을 줌
-        
-        # 다운로드 경로 설정
-        current_file_dir = os.path.dirname(os.path.abspath(__file__))
-        download_directory = os.path.join(current_file_dir, "..", "..", "data", "results")
-
-        # 시스템의 기본 다운로드 폴더에서 가장 최근에 다운로드된 PDF 파일을 찾음
-        downloads_folder = download_directory
-        if not os.path.exists(downloads_folder):
-            print("오류: 시스템의 다운로드 폴더를 찾을 수 없습니다.")
-            return False
-            
-        initial_files = set(glob.glob(os.path.join(downloads_folder, '*.pdf')))
-        
-        # 새 PDF 파일이 다운로드 될 때까지 기다림
-        new_file_path = None
-        for _ in range(60): # 최대 60초 대기
-            current_files = set(glob.glob(os.path.join(downloads_folder, '*.pdf')))
-            new_files = current_files - initial_files
-            if new_files:
-                new_file_path = max(new_files, key=os.path.getctime)
-                print(f"새 PDF 파일 감지: {new_file_path}")
-                break
-            time.sleep(1)
+        # 새 PDF 파일이 다운로드 될 때까지 기다림 (최대 65초)
+        new_file_path = wait_for_new_file(
+            downloads_folder, "*.pdf", initial_files, timeout=65, driver=self.driver
+        )
+        if new_file_path:
+            print(f"새 PDF 파일 감지: {new_file_path}")
         
         if not new_file_path:
             print("오류: 지정된 시간 내에 새 PDF 파일이 다운로드되지 않았습니다.")
@@ -401,6 +422,7 @@ class GammaAutomator:
         except Exception as e:
             print(f"PPT 생성 및 내보내기 중 오류 발생: {e}")
         finally:
+            self.wait_report.print_report("Gamma 대기 시간")
             print("자동화 작업 완료.")
 
 
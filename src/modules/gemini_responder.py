@@ -1,11 +1,71 @@
 import os
-from google import genai
-from google.genai import types
-
+import re
+import json
+import asyncio
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 
+from ..utils.disk_cache import get_disk_cache
+from ..utils.gemini_context_cache import GeminiContextCache
+from ..utils.gemini_client import get_gemini_client, resolve_api_keys
+from ..utils.gemini_scheduler import estimate_text_tokens, get_scheduler
+from ..utils.near_duplicate_index import NearDuplicateIndex
+from ..utils.stream_metrics import get_stream_metrics
+from ..utils.transcript_cleaner import clean_transcript
+
 load_dotenv()
 
+RESPONSE_CACHE_DIR = os.path.join("data", "cache", "responses")
+SIMILARITY_INDEX_PATH = os.path.join("data", "cache", "similarity_index.json")
+
+# 같은 강의 스크립트로 여러 대상 청중의 스크립트를 만들 때 서버 측 캐시를 공유합니다.
+_context_cache = GeminiContextCache()
+
+# 다른 영상 ID로 올라온 같은 강의의 결과를 재사용하기 위한 유사도 인덱스입니다. 처음 사용할 때 불러옵니다.
+_similarity_index = None
+_similarity_index_lock = threading.Lock()
+
+# 헤지 요청 통계: 모델에 보낸 전체 생성 요청 수, 실제로 헤지가 발생한 수, 대체 모델이 먼저 끝난 수.
+_hedge_stats = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+_hedge_lock = threading.Lock()
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+
+def _get_similarity_index():
+    global _similarity_index
+    with _similarity_index_lock:
+        if _similarity_index is None:
+            _similarity_index = NearDuplicateIndex(SIMILARITY_INDEX_PATH)
+        return _similarity_index
+
+
+def split_into_sections(text, max_chars):
+    """문장 경계를 유지하면서 텍스트를 `max_chars` 이하의 구간들로 나눕니다."""
+    sections = []
+    current = ""
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        while len(sentence) > max_chars:
+            if current:
+                sections.append(current)
+                current = ""
+            sections.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            sections.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        sections.append(current)
+    return sections
+
 
 class GeminiResponder:
     AUDIENCE_INSTRUCTIONS = {
@@ -19,6 +79,11 @@ class GeminiResponder:
             "script_guidelines": "- 약간 어려운 용어도 쓸 수 있지만 반드시 쉬운 설명을 덧붙여 주세요.\n- 예시는 학교생활, 친구 관계, 스마트폰, 유튜브 등 학습자의 생활과 밀접한 사례를 활용해 주세요.\n- 내용은 지루하지 않도록 재미있고 친근한 톤으로 작성해 주세요.\n- 조금 더 자세한 이유나 원리도 포함해 주세요.",
             "detail_guidelines": "- 설명은 중학생의 수준에 맞게 쉽게 풀어 주세요.\n- 약간 어려운 용어도 쓸 수 있지만 반드시 쉬운 설명을 덧붙여 주세요.\n- 예시는 학교생활, 친구 관계, 스마트폰, 유튜브 등 학습자의 생활과 밀접한 사례를 활용해 주세요.\n- 내용은 지루하지 않도록 재미있고 친근한 톤으로 작성해 주세요.\n- 조금 더 자세한 이유나 원리도 포함해 주세요.",
         },
+        "고등학생": {
+            "description": "고등학생",
+            "script_guidelines": "- 교과서 수준의 전문 용어를 사용하되, 처음 등장할 때 짧게 정의해 주세요.\n- 예시는 교과 과목, 진로 탐색, 시사 이슈 등 학습자가 관심을 가질 만한 사례를 활용해 주세요.\n- 톤은 친근하되 지나치게 가볍지 않게 작성해 주세요.\n- 개념의 원리와 이유를 논리적으로 설명하고, 핵심 개념 사이의 관계도 짚어 주세요.",
+            "detail_guidelines": "- 설명은 고등학생의 수준에 맞게 풀어 주세요.\n- 교과서 수준의 전문 용어를 사용하되, 처음 등장할 때 짧게 정의해 주세요.\n- 예시는 교과 과목, 진로 탐색, 시사 이슈 등 학습자가 관심을 가질 만한 사례를 활용해 주세요.\n- 톤은 친근하되 지나치게 가볍지 않게 작성해 주세요.\n- 개념의 원리와 이유를 논리적으로 설명하고, 핵심 개념 사이의 관계도 짚어 주세요.",
+        },
         "일반인": {
             "description": "해당 분야에 처음 입문하는 일반인",
             "script_guidelines": "- 비전공자도 쉽게 이해할 수 있도록 설명해야 합니다.",
@@ -26,6 +91,12 @@ class GeminiResponder:
         },
     }
 
+    # 단계별 기본 모델과 헤지 요청에 사용할 대체 모델입니다.
+    STAGE_MODEL_POLICIES = {
+        "script": {"model": "gemini-2.5-flash", "hedge_model": "gemini-2.5-flash-lite"},
+        "detail": {"model": "gemini-2.5-flash-lite", "hedge_model": "gemini-2.5-flash"},
+    }
+
     SCRIPT_BASE_PROMPT = """# 프롬프트
 
 ## 역할
@@ -61,6 +132,21 @@ class GeminiResponder:
 ## 유튜브 영상 요약 스크립트
 
 {script}
+"""
+
+    SCRIPT_CONTEXT_TEMPLATE = """## 유튜브 영상 요약 스크립트
+
+{script}
+"""
+
+    CACHED_SCRIPT_REFERENCE = "(유튜브 영상 요약 스크립트는 앞서 제공된 컨텍스트를 참고하세요.)"
+
+    SECTION_SUMMARY_PROMPT = """다음은 강의 영상 스크립트의 전체 {total}개 구간 중 {index}번째 구간입니다.
+이 구간의 핵심 개념, 설명 흐름, 중요한 예시와 용어를 빠짐없이 담아 요약해주세요.
+답변에는 요약 이외의 다른 문장을 포함하지 마세요.
+====================
+{section}
+====================
 """
 
     DETAIL_PAGE_PROMPT = """다음은 강의 영상의 전체 스크립트입니다. 이 스크립트를 기반으로 강의 영상의 상세 페이지를 작성해주세요. 상세 페이지의 구성은 다음과 같습니다:
@@ -83,7 +169,7 @@ class GeminiResponder:
     def __init__(
         self,
         api_key=None,
-        model_name="gemini-2.5-flash",  
+        model_name=None,
         temperature=1.0,
         top_p=0.95,
         top_k=64,
@@ -91,34 +177,65 @@ class GeminiResponder:
         system_instruction="한국어로 답변해줘",
         prompt_mode="script",
         target_audience="일반인",
+        use_cache=False,
+        cache_ttl_seconds=7 * 24 * 60 * 60,
+        cache_max_entries=500,
+        use_context_cache=False,
+        long_input_threshold_tokens=30000,
+        section_target_tokens=8000,
+        max_section_workers=4,
+        hedge_model_name=None,
+        hedge_after_seconds=None,
+        clean_input=True,
+        use_similarity_index=False,
     ):
         """GeminiResponder 클래스의 인스턴스를 초기화합니다.
 
         Args:
-            api_key (str, optional): Google API 키. Defaults to None. 환경 변수 `GOOGLE_API_KEY` 또는 `GEMINI_API_KEY`에서 로드됩니다.
-                model_name (str, optional): 사용할 Gemini 모델의 이름. Defaults to "gemini-2.5-flash".
+            api_key (str or list, optional): Google API 키 또는 키 목록. Defaults to None. 환경 변수 `GOOGLE_API_KEYS`, `GOOGLE_API_KEY`, `GEMINI_API_KEY`에서 로드됩니다.
+                model_name (str, optional): 사용할 Gemini 모델의 이름. Defaults to None. 없으면 `prompt_mode`별 정책(`STAGE_MODEL_POLICIES`)을 따릅니다.
                 temperature (float, optional): 생성 다양성을 제어하는 값 (0.0 ~ 1.0). Defaults to 1.0.
             top_p (float, optional): 다음 토큰을 선택할 때 고려할 확률 질량의 비율. Defaults to 0.95.
             top_k (int, optional): 다음 토큰을 선택할 때 고려할 상위 토큰의 개수. Defaults to 64.
             max_output_tokens (int, optional): 생성할 최대 토큰 수. Defaults to 8192.
             system_instruction (str, optional): 모델에 제공할 시스템 수준 지침. Defaults to "한국어로 답변해줘".
             prompt_mode (str, optional): 프롬프트 생성 모드 ("script" 또는 "detail"). Defaults to "script".
-            target_audience (str, optional): 대상 청중 레벨 ("초등학생", "중학생", "일반인"). Defaults to "일반인".
+            target_audience (str, optional): 대상 청중 레벨 ("초등학생", "중학생", "고등학생", "일반인"). Defaults to "일반인".
+            use_cache (bool, optional): 디스크 응답 캐시 사용 여부. Defaults to False.
+            cache_ttl_seconds (int, optional): 캐시된 응답의 유효 기간(초). Defaults to 7일.
+            cache_max_entries (int, optional): 캐시에 보관할 최대 응답 수. Defaults to 500.
+            use_context_cache (bool, optional): "script" 모드에서 원본 스크립트를 서버 측
+                컨텍스트 캐시에 올려 여러 요청이 공유하도록 할지 여부. Defaults to False.
+            long_input_threshold_tokens (int, optional): "script" 모드에서 원본 스크립트가 이 토큰 수를
+                넘으면 구간별 요약 후 최종 스크립트를 생성합니다. None이면 사용하지 않습니다. Defaults to 30000.
+            section_target_tokens (int, optional): 요약할 구간 하나의 목표 토큰 수. Defaults to 8000.
+            max_section_workers (int, optional): 동시에 요약할 최대 구간 수. Defaults to 4.
+            hedge_model_name (str, optional): 헤지 요청에 사용할 대체 모델. Defaults to None.
+                없으면 `prompt_mode`별 정책을 따릅니다.
+            hedge_after_seconds (float, optional): 주 모델이 첫 조각을 보내기 전이나 조각 사이에서
+                이 시간(초) 동안 멈추면 대체 모델에도 같은 요청을 보내고, 먼저 끝난 답변을 사용하며
+                다른 쪽은 취소합니다. 한쪽이 실패하면 남은 쪽의 답변을 사용합니다. None이면 헤지하지 않습니다.
+            clean_input (bool, optional): "script" 모드에서 원본 스크립트의 군말, 반복 표현, 공백을
+                프롬프트 작성 전에 정리할지 여부. Defaults to True.
+            use_similarity_index (bool, optional): "script" 모드에서 거의 같은 원본 스크립트로 같은 청중,
+                강의 제목, 강사명에 대해 만든 이전 결과가 있으면 새로 생성하지 않고 재사용할지 여부.
+                Defaults to False.
 
         Raises:
             ValueError: API 키가 제공되지 않거나 환경 변수에 설정되어 있지 않은 경우.
+            ValueError: `target_audience`가 `AUDIENCE_INSTRUCTIONS`에 없는 값인 경우.
             ValueError: Google Gen AI 클라이언트 초기화에 실패한 경우.
         """
-        if not api_key:
-            api_key = os.getenv("GOOGLE_API_KEY")
-            if not api_key:
-                api_key = os.getenv("GEMINI_API_KEY")
-            if not api_key:
-                raise ValueError(
-                    "Error: API 키가 환경 변수로 설정되지 않았습니다. GOOGLE_API_KEY 환경 변수를 설정하거나 api_key 매개변수를 통해 설정하세요."
-                )
-
-        self.model_name = model_name
+        api_keys = resolve_api_keys(api_key)
+
+        policy = self.STAGE_MODEL_POLICIES.get(
+            prompt_mode, self.STAGE_MODEL_POLICIES["script"]
+        )
+        self.model_name = model_name or policy["model"]
+        self.hedge_model_name = hedge_model_name or policy["hedge_model"]
+        self.hedge_after_seconds = hedge_after_seconds
+        self.clean_input = clean_input
+        self.use_similarity_index = use_similarity_index
         self.temperature = temperature
         self.top_p = top_p
         self.top_k = top_k
@@ -127,26 +244,59 @@ class GeminiResponder:
         self.prompt_mode = prompt_mode
 
         if target_audience not in self.AUDIENCE_INSTRUCTIONS:
-            print(
-                f"Warning: 유효하지 않은 target_audience 값입니다: '{target_audience}'. '일반인'으로 기본 설정됩니다."
+            raise ValueError(
+                f"유효하지 않은 target_audience 값입니다: '{target_audience}'. "
+                f"사용 가능한 값: {', '.join(self.AUDIENCE_INSTRUCTIONS)}"
             )
-            self.target_audience = "일반인"
-        else:
-            self.target_audience = target_audience
-
-        try:
-            # genai.configure(api_key=api_key) # 이 줄을 제거합니다.
-            self.client = genai.Client(api_key=api_key) # genai.Client 인스턴스를 추가합니다.
-            # self.model = self.client.models.GenerativeModel(self.model_name) # client를 통해 model을 초기화합니다.
-        except Exception as e:
-            raise ValueError(f"Error initializing Google Gen AI Client: {e}")
-
-    def generate_response(self, **data):
+        self.target_audience = target_audience
+
+        # 프로세스 전체에서 공유하는 클라이언트를 사용하여 HTTP 연결을 재사용합니다.
+        # 여러 키가 설정되어 있으면 요청마다 남은 한도가 가장 큰 키를 사용합니다.
+        self.api_keys = api_keys
+        self.api_key = api_keys[0]
+        self.client = get_gemini_client(self.api_key)
+        self.response_cache = (
+            get_disk_cache(
+                RESPONSE_CACHE_DIR,
+                max_entries=cache_max_entries,
+                ttl_seconds=cache_ttl_seconds,
+            )
+            if use_cache
+            else None
+        )
+        self.use_context_cache = use_context_cache
+        self.long_input_threshold_tokens = long_input_threshold_tokens
+        self.section_target_tokens = section_target_tokens
+        self.max_section_workers = max_section_workers
+
+    @classmethod
+    def release_context_caches(cls):
+        """이 프로세스에서 생성한 서버 측 컨텍스트 캐시를 모두 삭제합니다."""
+        _context_cache.release_all()
+
+    @classmethod
+    def hedge_stats(cls):
+        """헤지 요청 통계와 헤지 발생률, 대체 모델 승률을 반환합니다."""
+        with _hedge_lock:
+            stats = dict(_hedge_stats)
+        stats["hedge_rate"] = stats["hedged"] / stats["requests"] if stats["requests"] else 0.0
+        stats["win_rate"] = stats["hedge_wins"] / stats["hedged"] if stats["hedged"] else 0.0
+        return stats
+
+    def generate_response(self, bypass_cache=False, on_chunk=None, on_reset=None, **data):
         """제공된 데이터를 기반으로 Gemini 모델을 사용하여 응답을 생성합니다.
 
         `prompt_mode`에 따라 다른 프롬프트를 사용하여 스크립트 또는 상세 페이지 내용을 생성합니다.
+        `use_cache`가 켜져 있으면 같은 프롬프트와 생성 설정으로 만든 이전 응답을 재사용합니다.
 
         Args:
+            bypass_cache (bool, optional): True이면 캐시를 조회하지 않고 새로 생성한 뒤 캐시를 갱신합니다.
+                Defaults to False.
+            on_chunk (callable, optional): 생성된 텍스트 조각을 받을 함수. 생성 스레드에서 호출됩니다.
+                캐시에 적중하면 전체 응답으로 한 번 호출됩니다.
+            on_reset (callable, optional): 이미 전달한 조각을 버려야 할 때 호출됩니다. 주 모델이 멈춰
+                보낸 헤지 요청에서 대체 모델의 답변이 먼저 끝나면 호출된 뒤, 그 답변 전체가 `on_chunk`로
+                한 번에 전달됩니다. 대체 모델의 답변은 응답 캐시에 저장하지 않습니다.
             **data: 프롬프트 생성에 필요한 데이터.
                 - `prompt_mode`가 "script"인 경우:
                     - script (str): 원본 유튜브 영상 요약 스크립트.
@@ -160,7 +310,323 @@ class GeminiResponder:
         Returns:
             str: 생성된 응답 텍스트. 오류 발생 시 None을 반환합니다.
         """
-        prompt = None
+        data = self._clean_script_input(data)
+        prompt = self._build_prompt(data)
+        if not prompt:
+            print("Error: 프롬프트가 준비되지 않았습니다.")
+            return None
+
+        print("\n[Google Gen AI SDK 프롬프트]")
+        # print(prompt) # 너무 길어서 주석 처리
+
+        generation_config = self._generation_config()
+
+        cache_key, cached_response = self._lookup_response_cache(
+            prompt, generation_config, bypass_cache
+        )
+        if cached_response is not None:
+            if on_chunk:
+                on_chunk(cached_response)
+            return cached_response
+
+        similar_response = self._lookup_similar_response(data, bypass_cache)
+        if similar_response is not None:
+            if self.response_cache:
+                self.response_cache.set(cache_key, similar_response)
+            if on_chunk:
+                on_chunk(similar_response)
+            return similar_response
+
+        source_data = data
+        data, prompt = self._condense_long_input(data, prompt)
+
+        print("\n[답변 생성 중]")
+        with _hedge_lock:
+            _hedge_stats["requests"] += 1
+        result_model = self.model_name
+        try:
+            if self.hedge_after_seconds is None or self.hedge_model_name == self.model_name:
+                response_parts = []
+                for text in self._stream_model(self.model_name, data, prompt, generation_config):
+                    print(text, end="")
+                    response_parts.append(text)
+                    if on_chunk:
+                        on_chunk(text)
+                result = "".join(response_parts)
+            else:
+                # 두 모델의 출력이 섞이지 않도록 먼저 끝난 답변만 출력합니다.
+                result_model, result = self._generate_hedged(
+                    data, prompt, generation_config, on_chunk, on_reset
+                )
+                print(result, end="")
+            print("\n[답변 생성 완료]")
+        except Exception as e:
+            print(f"Error during Google Gen AI API call: {e}")
+            return None
+
+        # 대체 모델의 답변은 주 모델의 답변으로 재사용되지 않도록 캐시와 유사도 인덱스에 남기지 않습니다.
+        if result_model != self.model_name:
+            return result
+        if self.response_cache and result:
+            self.response_cache.set(cache_key, result)
+        self._store_similar_response(source_data, result)
+        return result
+
+    def _stream_model(
+        self, model, data, prompt, generation_config, cancel_event=None, use_context_cache=True
+    ):
+        # 컨텍스트 캐시는 만든 키의 프로젝트에서만 쓸 수 있으므로, 선택된 키로 캐시를 준비합니다.
+        def request(api_key):
+            client = get_gemini_client(api_key)
+            if use_context_cache:
+                contents, request_config = self._apply_context_cache(
+                    data, prompt, generation_config, client
+                )
+            else:
+                contents, request_config = prompt, generation_config
+            return client.models.generate_content_stream(
+                model=model,
+                contents=contents,
+                config=request_config, # 딕셔너리 형태의 config를 전달
+            )
+
+        # 공유 스케줄러가 키·모델별 분당 한도 안에서 요청을 보내고, 429/5xx는 재시도합니다.
+        stream = get_scheduler().stream(
+            model, request, estimate_text_tokens(prompt), self.api_keys
+        )
+        for chunk in get_stream_metrics().track(stream, model, self.prompt_mode):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            if chunk.text:
+                yield chunk.text
+
+    def _generate_hedged(self, data, prompt, generation_config, on_chunk=None, on_reset=None):
+        # 주 모델이 첫 조각 전이나 조각 사이에서 hedge_after_seconds 동안 멈추면 대체 모델에도 요청하고,
+        # 먼저 끝난 답변을 사용합니다. 한쪽이 실패하면 남은 요청의 답변을 기다립니다.
+        # 컨텍스트 캐시는 모델별로 만들어야 하므로 대체 모델 요청은 전체 프롬프트를 보냅니다.
+        # 주 모델의 조각은 도착하는 대로 on_chunk로 전달하고, 대체 모델이 이기면 on_reset 후 전체 답변을 전달합니다.
+        cancel_events = {
+            self.model_name: threading.Event(),
+            self.hedge_model_name: threading.Event(),
+        }
+        forward_lock = threading.Lock()
+        forward_state = {
+            "last_progress": time.monotonic(),
+            "delivered": False,
+            "stopped": False,
+        }
+
+        def collect(model, use_context_cache):
+            parts = []
+            for text in self._stream_model(
+                model, data, prompt, generation_config, cancel_events[model], use_context_cache
+            ):
+                parts.append(text)
+                if model != self.model_name:
+                    continue
+                with forward_lock:
+                    forward_state["last_progress"] = time.monotonic()
+                    if on_chunk and not forward_state["stopped"]:
+                        forward_state["delivered"] = True
+                        on_chunk(text)
+            if cancel_events[model].is_set():
+                return model, None
+            return model, "".join(parts)
+
+        executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            pending = {executor.submit(collect, self.model_name, True)}
+            while True:
+                done, _ = wait(pending, timeout=min(1.0, self.hedge_after_seconds))
+                if done:
+                    break
+                with forward_lock:
+                    stalled = time.monotonic() - forward_state["last_progress"]
+                if stalled >= self.hedge_after_seconds:
+                    print(
+                        f"\n[헤지 요청] {self.hedge_after_seconds}초 동안 응답 조각이 없어 "
+                        f"{self.hedge_model_name} 모델에도 요청합니다."
+                    )
+                    with _hedge_lock:
+                        _hedge_stats["hedged"] += 1
+                    pending.add(executor.submit(collect, self.hedge_model_name, False))
+                    break
+
+            error = None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        model, text = future.result()
+                    except Exception as e:
+                        # 다른 요청이 남아 있으면 그 답변을 기다립니다.
+                        print(f"\n[헤지 요청 실패] {e}")
+                        error = e
+                        continue
+                    if not text:
+                        continue
+                    # 먼저 끝난 답변을 사용하고, 남은 요청은 바로 취소합니다.
+                    for cancel_event in cancel_events.values():
+                        cancel_event.set()
+                    if model != self.model_name:
+                        print(f"\n[헤지 응답 사용] {model} 모델의 답변이 먼저 완료되었습니다.")
+                        with _hedge_lock:
+                            _hedge_stats["hedge_wins"] += 1
+                        with forward_lock:
+                            forward_state["stopped"] = True
+                            if forward_state["delivered"] and on_reset:
+                                on_reset()
+                            if on_chunk:
+                                on_chunk(text)
+                    return model, text
+            if error:
+                raise error
+            return self.model_name, ""
+        finally:
+            # 늦게 끝난 요청은 다음 조각을 받을 때 스트림을 닫고 종료합니다.
+            for cancel_event in cancel_events.values():
+                cancel_event.set()
+            executor.shutdown(wait=False)
+
+    async def stream_response_async(self, bypass_cache=False, **data):
+        """`generate_response`의 비동기 스트리밍 버전입니다.
+
+        SDK의 asyncio 클라이언트(`client.aio`)를 사용하므로, 하나의 이벤트 루프에서
+        여러 생성 작업을 동시에 실행하고 태스크 취소로 바로 중단할 수 있습니다.
+        응답 캐시에 적중하면 캐시된 응답 전체를 한 번에 반환합니다.
+
+        Args:
+            bypass_cache (bool, optional): True이면 캐시를 조회하지 않고 새로 생성합니다. Defaults to False.
+            **data: `generate_response`와 동일한 프롬프트 데이터.
+
+        Yields:
+            str: 생성된 텍스트 조각.
+
+        Raises:
+            Exception: Google Gen AI API 호출 중 발생한 오류.
+        """
+        data = self._clean_script_input(data)
+        prompt = self._build_prompt(data)
+        if not prompt:
+            print("Error: 프롬프트가 준비되지 않았습니다.")
+            return
+
+        generation_config = self._generation_config()
+        cache_key, cached_response = self._lookup_response_cache(
+            prompt, generation_config, bypass_cache
+        )
+        if cached_response is not None:
+            yield cached_response
+            return
+
+        # 유사도 계산과 구간 요약, 컨텍스트 캐시 생성은 동기 호출이므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+        similar_response = await asyncio.to_thread(
+            self._lookup_similar_response, data, bypass_cache
+        )
+        if similar_response is not None:
+            if self.response_cache:
+                self.response_cache.set(cache_key, similar_response)
+            yield similar_response
+            return
+
+        source_data = data
+        data, prompt = await asyncio.to_thread(self._condense_long_input, data, prompt)
+
+        async def request(api_key):
+            client = get_gemini_client(api_key)
+            contents, request_config = await asyncio.to_thread(
+                self._apply_context_cache, data, prompt, generation_config, client
+            )
+            return await client.aio.models.generate_content_stream(
+                model=self.model_name,
+                contents=contents,
+                config=request_config,
+            )
+
+        with _hedge_lock:
+            _hedge_stats["requests"] += 1
+        response_parts = []
+        stream = get_scheduler().stream_async(
+            self.model_name, request, estimate_text_tokens(prompt), self.api_keys
+        )
+        async for chunk in get_stream_metrics().track_async(
+            stream, self.model_name, self.prompt_mode
+        ):
+            if not chunk.text:
+                continue
+            response_parts.append(chunk.text)
+            yield chunk.text
+
+        if self.response_cache and response_parts:
+            self.response_cache.set(cache_key, "".join(response_parts))
+        await asyncio.to_thread(
+            self._store_similar_response, source_data, "".join(response_parts)
+        )
+
+    async def generate_response_async(self, bypass_cache=False, **data):
+        """`generate_response`의 비동기 버전입니다.
+
+        Args:
+            bypass_cache (bool, optional): True이면 캐시를 조회하지 않고 새로 생성합니다. Defaults to False.
+            **data: `generate_response`와 동일한 프롬프트 데이터.
+
+        Returns:
+            str: 생성된 응답 텍스트. 오류 발생 시 None을 반환합니다.
+        """
+        try:
+            response_parts = [
+                chunk
+                async for chunk in self.stream_response_async(bypass_cache, **data)
+            ]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error during Google Gen AI API call: {e}")
+            return None
+        return "".join(response_parts) or None
+
+    def _lookup_response_cache(self, prompt, generation_config, bypass_cache):
+        if not self.response_cache:
+            return None, None
+        cache_key = self._response_cache_key(prompt, generation_config)
+        if bypass_cache:
+            return cache_key, None
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            print("\n[응답 캐시 적중]")
+        return cache_key, cached_response
+
+    def _similarity_conditions(self, data):
+        # 스크립트에 강의 제목과 강사명이 들어가므로 청중과 함께 모두 같아야 재사용합니다.
+        return {
+            "target_audience": self.target_audience,
+            "lecture_title": data.get("lecture_title"),
+            "professor_name": data.get("professor_name"),
+        }
+
+    def _lookup_similar_response(self, data, bypass_cache):
+        if not self.use_similarity_index or self.prompt_mode != "script" or bypass_cache:
+            return None
+        match = _get_similarity_index().query(
+            data["script"], self._similarity_conditions(data)
+        )
+        if match is None:
+            return None
+        response, similarity = match
+        print(f"\n[유사 스크립트 적중] 추정 유사도 {similarity:.2f}, 이전 생성 결과를 재사용합니다.")
+        return response
+
+    def _store_similar_response(self, data, response):
+        if not self.use_similarity_index or self.prompt_mode != "script" or not response:
+            return
+        try:
+            _get_similarity_index().add(
+                data["script"], self._similarity_conditions(data), response
+            )
+        except OSError as e:
+            print(f"경고: 유사도 인덱스를 저장하지 못했습니다: {e}")
+
+    def _build_prompt(self, data):
         audience_data = self.AUDIENCE_INSTRUCTIONS[self.target_audience]
         audience_level_description = audience_data["description"]
 
@@ -177,7 +643,7 @@ class GeminiResponder:
                     ],
                     **data,
                 }
-                prompt = self.SCRIPT_BASE_PROMPT.format(**format_params)
+                return self.SCRIPT_BASE_PROMPT.format(**format_params)
             elif self.prompt_mode == "detail":
                 required_keys = ["script", "lecture_title", "professor_name"]
                 if not all(key in data for key in required_keys):
@@ -190,7 +656,7 @@ class GeminiResponder:
                     ],
                     **data,
                 }
-                prompt = self.DETAIL_PAGE_PROMPT.format(**format_params)
+                return self.DETAIL_PAGE_PROMPT.format(**format_params)
             else:
                 print(f"Error: 유효하지 않은 prompt_mode입니다: {self.prompt_mode}")
                 return None
@@ -198,36 +664,141 @@ class GeminiResponder:
             print(f"Error: 프롬프트 포맷팅 중 오류 발생. 누락된 키: {e}")
             return None
 
-        if not prompt:
-            print("Error: 프롬프트가 준비되지 않았습니다.")
-            return None
-
-        print("\n[Google Gen AI SDK 프롬프트]")
-        # print(prompt) # 너무 길어서 주석 처리
+    def _clean_script_input(self, data):
+        # 원본 음성 스크립트의 군말과 반복을 로컬에서 정리해 이후 모든 프롬프트를 줄입니다.
+        if not self.clean_input or self.prompt_mode != "script" or not data.get("script"):
+            return data
+        script = data["script"]
+        cleaned = clean_transcript(script)
+        if cleaned == script:
+            return data
+        print(
+            f"\n[스크립트 정리] 약 {estimate_text_tokens(script)} → "
+            f"{estimate_text_tokens(cleaned)} 토큰 ({len(script)}자 → {len(cleaned)}자)"
+        )
+        return {**data, "script": cleaned}
+
+    def _condense_long_input(self, data, prompt):
+        # 긴 원본 스크립트는 구간별로 병렬 요약한 뒤, 합친 요약으로 최종 프롬프트를 다시 만듭니다.
+        if self.prompt_mode != "script" or not self.long_input_threshold_tokens:
+            return data, prompt
+
+        script = data["script"]
+        # 토큰 수가 글자 수를 넘는 경우는 드물므로, 짧은 입력은 토큰 계산 호출 없이 넘어갑니다.
+        if len(script) <= self.long_input_threshold_tokens:
+            return data, prompt
+        total_tokens = self._count_tokens(script)
+        if total_tokens <= self.long_input_threshold_tokens:
+            return data, prompt
+
+        chars_per_token = len(script) / max(total_tokens, 1)
+        sections = split_into_sections(
+            script, int(self.section_target_tokens * chars_per_token)
+        )
+        print(
+            f"\n[긴 입력 감지] {total_tokens} 토큰 → {len(sections)}개 구간을 병렬 요약합니다."
+        )
+
+        summaries = [None] * len(sections)
+        with ThreadPoolExecutor(max_workers=self.max_section_workers) as executor:
+            futures = {
+                executor.submit(self._summarize_section, section, i, len(sections)): i
+                for i, section in enumerate(sections)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    summaries[i] = future.result()
+                except Exception as e:
+                    print(f"Error: 구간 {i + 1} 요약 중 오류 발생: {e}")
+
+        if not all(summaries):
+            print("Warning: 일부 구간 요약에 실패하여 원본 스크립트 전체를 사용합니다.")
+            return data, prompt
+
+        merged_summary = "\n\n".join(
+            f"[구간 {i + 1}]\n{summary}" for i, summary in enumerate(summaries)
+        )
+        print(f"[구간 요약 완료] {len(script)}자 → {len(merged_summary)}자")
+        condensed_data = {**data, "script": merged_summary}
+        return condensed_data, self._build_prompt(condensed_data)
+
+    def _count_tokens(self, text):
+        try:
+            return self.client.models.count_tokens(
+                model=self.model_name, contents=text
+            ).total_tokens
+        except Exception as e:
+            # 토큰 계산에 실패하면 한국어 기준 대략 2자당 1토큰으로 추정합니다.
+            print(f"Warning: 토큰 수 계산 실패, 글자 수로 추정합니다: {e}")
+            return len(text) // 2
+
+    def _summarize_section(self, section, index, total):
+        contents = self.SECTION_SUMMARY_PROMPT.format(
+            section=section, index=index + 1, total=total
+        )
+        response = get_scheduler().call(
+            self.model_name,
+            lambda api_key: get_gemini_client(api_key).models.generate_content(
+                model=self.model_name,
+                contents=contents,
+                config={"temperature": 0.3, "max_output_tokens": self.max_output_tokens},
+            ),
+            estimate_text_tokens(contents),
+            self.api_keys,
+        )
+        return response.text
+
+    def _apply_context_cache(self, data, prompt, generation_config, client=None):
+        # 원본 스크립트는 서버 측 캐시로 보내고, 요청에는 나머지 지침만 담습니다.
+        # 응답 캐시 키는 캐시 이름과 무관하도록 원래 프롬프트와 설정으로 계산합니다.
+        if not self.use_context_cache or self.prompt_mode != "script":
+            return prompt, generation_config
+
+        # 컨텍스트 캐시를 쓰는 요청에는 시스템 지침을 함께 보낼 수 없으므로 캐시에 넣어 둡니다.
+        system_instruction = generation_config.get("system_instruction")
+        cache_name = _context_cache.get_or_create(
+            client or self.client,
+            self.model_name,
+            self.SCRIPT_CONTEXT_TEMPLATE.format(script=data["script"]),
+            display_name=f"script:{data.get('lecture_title', '')}"[:128],
+            system_instruction=system_instruction,
+        )
+        if not cache_name:
+            return prompt, generation_config
+
+        contents = self._build_prompt(
+            {**data, "script": self.CACHED_SCRIPT_REFERENCE}
+        )
+        request_config = {
+            key: value
+            for key, value in generation_config.items()
+            if key != "system_instruction"
+        }
+        return contents, {**request_config, "cached_content": cache_name}
 
+    def _generation_config(self):
         generation_config = {
             "temperature": self.temperature,
             "top_p": self.top_p,
             "top_k": self.top_k,
             "max_output_tokens": self.max_output_tokens,
         }
-        
-        if self.system_instruction:
-            pass
 
-        print("\n[답변 생성 중]")
-        try:
-            response = self.client.models.generate_content_stream(
-                model=self.model_name,
-                contents=prompt,
-                config=generation_config, # 딕셔너리 형태의 config를 전달
-            )
-            response_parts = []
-            for chunk in response:
-                print(chunk.text, end="")
-                response_parts.append(chunk.text)
-            print("\n[답변 생성 완료]")
-            return "".join(response_parts)
-        except Exception as e:
-            print(f"Error during Google Gen AI API call: {e}")
-            return None
\ No newline at end of file
+        if self.system_instruction:
+            generation_config["system_instruction"] = self.system_instruction
+
+        return generation_config
+
+    def _response_cache_key(self, prompt, generation_config):
+        # 프롬프트 전체를 인덱스에 남기지 않도록 해시로 키를 만듭니다.
+        payload = json.dumps(
+            {
+                "model": self.model_name,
+                "config": generation_config,
+                "prompt": prompt,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
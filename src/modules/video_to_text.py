@@ -1,36 +1,316 @@
 import os
+import time
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
 import yt_dlp
+from ..utils.audio_utils import (
+    ffmpeg_available,
+    get_audio_duration,
+    preprocess_audio,
+    split_audio,
+)
+from ..utils.disk_cache import get_disk_cache
+from ..utils.gemini_client import get_gemini_client, resolve_api_keys
+from ..utils.gemini_file_cache import get_file_cache
+from ..utils.gemini_scheduler import AUDIO_TOKENS_PER_SECOND, get_scheduler
+from ..utils.stream_metrics import get_stream_metrics
+from ..utils.youtube_utils import (
+    extract_video_id,
+    select_caption_track,
+    clean_vtt_captions,
+)
 
 load_dotenv()
 
+AUDIO_DIR = os.path.join("data", "audio")
+AUDIO_PATH = os.path.join(AUDIO_DIR, "lecture_audio.wav")
+TRANSCRIPT_CACHE_DIR = os.path.join("data", "cache", "transcripts")
+GEMINI_FILE_INDEX_PATH = os.path.join("data", "cache", "gemini_files.json")
+TRANSCRIBE_PROMPT = "첨부한 오디오 파일의 스크립트를 추출해주세요. 스크립트 외의 다른 출력이 답변에 포함되지 않도록 해주세요."
 
-class VideoToText:
-    def __init__(self, api_key=None, model_name: str = "gemini-2.5-flash"): # 모델 이름 수정
-        if api_key:
-            self.api_key = api_key
-        else:
-            self.api_key = os.environ.get("GOOGLE_API_KEY")
-            if not self.api_key:
-                self.api_key = os.environ.get("GEMINI_API_KEY")
-            if not self.api_key: 
-                raise ValueError(
-                    "Error: API 키가 환경 변수로 설정되지 않았습니다. GOOGLE_API_KEY 환경 변수를 설정하거나 api_key 매개변수를 통해 설정하세요."
-                )
 
+class VideoToText:
+    def __init__(
+        self,
+        api_key=None,
+        model_name: str = "gemini-2.5-flash",  # 모델 이름 수정
+        use_cache: bool = True,
+        cache_max_entries: int = 200,
+        cache_max_bytes: int = 200 * 1024 * 1024,
+    ):
+        # 여러 키가 설정되어 있으면 요청마다 남은 한도가 가장 큰 키를 사용합니다.
+        self.api_keys = resolve_api_keys(api_key)
+        self.api_key = self.api_keys[0]
         self.model_name = model_name
-        self.client = genai.Client(api_key=self.api_key)
-        
-    def download_youtube_audio(self, youtube_url: str) -> str:
+        self.client = get_gemini_client(self.api_key)
+        self.transcript_cache = (
+            get_disk_cache(
+                TRANSCRIPT_CACHE_DIR,
+                max_entries=cache_max_entries,
+                max_bytes=cache_max_bytes,
+            )
+            if use_cache
+            else None
+        )
+        self.file_cache = get_file_cache(GEMINI_FILE_INDEX_PATH) if use_cache else None
+
+    def get_script_from_youtube(
+        self,
+        youtube_url: str,
+        prefer_captions: bool = False,
+        caption_languages=("ko",),
+        audio_path: str = AUDIO_PATH,
+        **script_options,
+    ) -> str:
+        """
+        YouTube URL의 스크립트를 반환합니다.
+
+        동영상 ID와 모델 이름으로 스크립트 캐시를 먼저 조회하고, 캐시에 있으면
+        오디오 다운로드, 업로드, 모델 호출을 모두 건너뜁니다.
+        `prefer_captions`가 True이면 오디오 추출 전에 YouTube 자막을 먼저 시도하고,
+        사용할 수 있는 자막이 없을 때만 오디오 경로로 넘어갑니다.
+
+        Args:
+            youtube_url (str): YouTube 동영상 URL.
+            prefer_captions (bool, optional): 자막 우선 사용 여부. Defaults to False.
+            caption_languages (tuple[str], optional): 선호 자막 언어. Defaults to ("ko",).
+            audio_path (str, optional): 오디오를 내려받을 경로. Defaults to AUDIO_PATH.
+            **script_options: `get_script`에 전달할 추출 옵션 (예: `chunked=True`).
+
+        Returns:
+            str or None: 추출된 스크립트. 실패 시 None.
+        """
+        video_id = extract_video_id(youtube_url)
+        script = self._get_script_without_audio(
+            youtube_url, video_id, prefer_captions, caption_languages
+        )
+        if script is not None:
+            return script
+
+        if not self.download_youtube_audio(youtube_url, audio_path):
+            return None
+        return self._get_script_and_cache(video_id, audio_path, **script_options)
+
+    def get_scripts_from_playlist(
+        self,
+        youtube_urls,
+        max_download_workers: int = 3,
+        max_transcribe_workers: int = 2,
+        prefer_captions: bool = False,
+        caption_languages=("ko",),
+        **script_options,
+    ):
+        """
+        재생목록/채널/동영상 URL들을 펼쳐 여러 동영상의 스크립트를 일괄 추출합니다.
+
+        오디오는 최대 `max_download_workers`개까지 동시에 내려받고, 다운로드가
+        끝난 동영상은 나머지 다운로드를 기다리지 않고 바로 스크립트 추출을
+        시작합니다. 결과는 완료되는 순서대로 반환됩니다.
+
+        Args:
+            youtube_urls (str | list[str]): 재생목록, 채널 또는 동영상 URL (또는 그 목록).
+            max_download_workers (int, optional): 동시 다운로드 수. Defaults to 3.
+            max_transcribe_workers (int, optional): 동시 스크립트 추출 수. Defaults to 2.
+            prefer_captions (bool, optional): 자막 우선 사용 여부. Defaults to False.
+            caption_languages (tuple[str], optional): 선호 자막 언어. Defaults to ("ko",).
+            **script_options: `get_script`에 전달할 추출 옵션.
+
+        Yields:
+            tuple[str, str | None]: (동영상 URL, 추출된 스크립트 또는 실패 시 None).
+        """
+        if isinstance(youtube_urls, str):
+            youtube_urls = [youtube_urls]
+        video_urls = []
+        for url in youtube_urls:
+            for video_url in self.expand_youtube_url(url):
+                if video_url not in video_urls:
+                    video_urls.append(video_url)
+        print(f"[일괄 처리 시작] 동영상 {len(video_urls)}개")
+
+        script_options.setdefault("stream_output", False)
+
+        def prepare(video_url):
+            video_id = extract_video_id(video_url)
+            script = self._get_script_without_audio(
+                video_url, video_id, prefer_captions, caption_languages
+            )
+            if script is not None:
+                return video_id, None, script
+            file_stem = video_id or hashlib.sha1(video_url.encode("utf-8")).hexdigest()[:11]
+            audio_path = os.path.join(AUDIO_DIR, f"{file_stem}.wav")
+            if not self.download_youtube_audio(video_url, audio_path):
+                return video_id, None, None
+            return video_id, audio_path, None
+
+        # 호출자가 중간에 반복을 멈춰도 남은 다운로드를 기다리지 않도록 직접 종료합니다.
+        download_pool = ThreadPoolExecutor(max_workers=max_download_workers)
+        transcribe_pool = ThreadPoolExecutor(max_workers=max_transcribe_workers)
+        try:
+            download_futures = {
+                download_pool.submit(prepare, video_url): video_url
+                for video_url in video_urls
+            }
+            transcribe_futures = {}
+            pending = set(download_futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in download_futures:
+                        video_url = download_futures[future]
+                        try:
+                            video_id, audio_path, script = future.result()
+                        except Exception as e:
+                            print(f"[오류] {video_url} 준비 중 오류 발생: {e}")
+                            yield video_url, None
+                            continue
+                        if audio_path is None:
+                            yield video_url, script
+                            continue
+                        transcribe_future = transcribe_pool.submit(
+                            self._get_script_and_cache,
+                            video_id,
+                            audio_path,
+                            **script_options,
+                        )
+                        transcribe_futures[transcribe_future] = video_url
+                        pending.add(transcribe_future)
+                    else:
+                        video_url = transcribe_futures[future]
+                        try:
+                            yield video_url, future.result()
+                        except Exception as e:
+                            print(f"[오류] {video_url} 스크립트 추출 중 오류 발생: {e}")
+                            yield video_url, None
+        finally:
+            download_pool.shutdown(wait=False, cancel_futures=True)
+            transcribe_pool.shutdown(wait=False, cancel_futures=True)
+
+    def expand_youtube_url(self, youtube_url: str, _depth: int = 0):
+        """
+        재생목록/채널 URL을 yt-dlp의 flat 추출로 개별 동영상 URL 목록으로 펼칩니다.
+
+        Args:
+            youtube_url (str): 재생목록, 채널 또는 동영상 URL.
+
+        Returns:
+            list[str]: 동영상 URL 목록. 단일 동영상이면 해당 URL만 포함합니다.
+        """
+        if extract_video_id(youtube_url) and "list=" not in youtube_url:
+            return [youtube_url]
+
+        ydl_opts = {
+            "extract_flat": "in_playlist",
+            "skip_download": True,
+            "quiet": True,
+        }
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(youtube_url, download=False)
+        except Exception as e:
+            print(f"[예외 발생] URL 목록 조회 중 오류 발생 ({youtube_url}): {e}\n")
+            return []
+
+        if info.get("_type") not in ("playlist", "multi_video"):
+            return [info.get("webpage_url") or youtube_url]
+
+        video_urls = []
+        for entry in info.get("entries") or []:
+            if not entry:
+                continue
+            if entry.get("_type") == "playlist" or entry.get("ie_key") == "YoutubeTab":
+                # 채널 URL은 '동영상', 'Shorts' 등의 탭 재생목록으로 한 번 더 펼쳐집니다.
+                if _depth < 2 and entry.get("url"):
+                    video_urls.extend(self.expand_youtube_url(entry["url"], _depth + 1))
+                continue
+            if entry.get("id"):
+                video_urls.append(f"https://www.youtube.com/watch?v={entry['id']}")
+            elif entry.get("url"):
+                video_urls.append(entry["url"])
+        return video_urls
+
+    def _get_script_without_audio(
+        self, youtube_url, video_id, prefer_captions, caption_languages
+    ):
+        cache_key = f"{video_id}:{self.model_name}" if video_id else None
+
+        if self.transcript_cache and cache_key:
+            cached_script = self.transcript_cache.get(cache_key)
+            if cached_script is not None:
+                print(f"[스크립트 캐시 적중] video_id={video_id}")
+                return cached_script
+
+        if prefer_captions:
+            caption_key = f"{video_id}:captions" if video_id else None
+            if self.transcript_cache and caption_key:
+                cached_captions = self.transcript_cache.get(caption_key)
+                if cached_captions is not None:
+                    print(f"[자막 캐시 적중] video_id={video_id}")
+                    return cached_captions
+
+            captions = self.get_captions(youtube_url, caption_languages)
+            if captions:
+                if self.transcript_cache and caption_key:
+                    self.transcript_cache.set(caption_key, captions)
+                return captions
+            print("[자막 없음] 오디오 추출로 전환합니다.")
+        return None
+
+    def _get_script_and_cache(self, video_id, audio_path, **script_options):
+        script = self.get_script(audio_path=audio_path, **script_options)
+        if script and self.transcript_cache and video_id:
+            self.transcript_cache.set(f"{video_id}:{self.model_name}", script)
+        return script
+
+    def get_captions(
+        self, youtube_url: str, languages=("ko",), min_chars: int = 200
+    ) -> str:
+        """
+        YouTube 자막(수동 또는 자동 생성)을 내려받아 일반 텍스트로 정리합니다.
+
+        Args:
+            youtube_url (str): YouTube 동영상 URL.
+            languages (tuple[str], optional): 선호 자막 언어. Defaults to ("ko",).
+            min_chars (int, optional): 사용 가능한 자막으로 판단할 최소 글자 수. Defaults to 200.
+
+        Returns:
+            str or None: 정리된 자막 텍스트. 사용할 수 있는 자막이 없으면 None.
+        """
+        ydl_opts = {
+            "skip_download": True,
+            "noplaylist": True,
+            "quiet": True,
+        }
+        try:
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                info = ydl.extract_info(youtube_url, download=False)
+                track = select_caption_track(info, languages)
+                if not track:
+                    return None
+                raw_captions = ydl.urlopen(track["url"]).read().decode("utf-8")
+        except Exception as e:
+            print(f"[예외 발생] 자막 조회 중 오류 발생: {e}\n")
+            return None
+
+        captions = clean_vtt_captions(raw_captions)
+        if len(captions) < min_chars:
+            return None
+
+        kind = "자동 생성" if track["automatic"] else "수동"
+        print(f"[자막 추출 완료] {kind} 자막 ({track['language']}, {len(captions)}자)\n")
+        return captions
+
+    def download_youtube_audio(self, youtube_url: str, output_path: str = AUDIO_PATH) -> str:
         ydl_opts = {
             "format": "bestaudio",
             "extractaudio": True,
             "overwrites": True,
             "downloader": "aria2c",
             "audioformat": "wav",
-            "outtmpl": os.path.join("data", "audio", "lecture_audio.wav"),
+            "noplaylist": True,
+            "outtmpl": output_path,
         }
         
         try:
@@ -51,36 +331,238 @@ class VideoToText:
             print(f"[예외 발생] 다운로드 프로세스 중 오류 발생: {e}\n")
             return None
 
-    def get_script(self) -> str:
+    def get_script(
+        self,
+        audio_path: str = AUDIO_PATH,
+        stream_output: bool = True,
+        chunked: bool = False,
+        chunk_seconds: float = 600,
+        overlap_seconds: float = 15,
+        max_workers: int = 4,
+        max_retries: int = 2,
+        preprocess: bool = True,
+        trim_silence: bool = False,
+    ) -> str:
+        """
+        다운로드된 강의 오디오에서 스크립트를 추출합니다.
+
+        `preprocess`가 True이면 업로드 전에 오디오를 모노 16kHz Opus 파일로
+        압축합니다. `chunked`가 True이면 오디오를 서로 겹치는 시간 구간으로 나누어
+        병렬로 추출한 뒤, 겹치는 부분을 제거하며 이어 붙입니다.
+
+        Args:
+            audio_path (str, optional): 다운로드된 오디오 경로. Defaults to AUDIO_PATH.
+            stream_output (bool, optional): 추출 중인 스크립트를 콘솔에 출력할지 여부. Defaults to True.
+            chunked (bool, optional): 구간 분할 병렬 추출 사용 여부. Defaults to False.
+            chunk_seconds (float, optional): 구간 길이(초). Defaults to 600.
+            overlap_seconds (float, optional): 이웃 구간과 겹치는 길이(초). Defaults to 15.
+            max_workers (int, optional): 동시에 추출할 최대 구간 수. Defaults to 4.
+            max_retries (int, optional): 실패한 구간의 재시도 횟수. Defaults to 2.
+            preprocess (bool, optional): 업로드 전 오디오 압축 여부. Defaults to True.
+            trim_silence (bool, optional): 전처리 시 무음 구간 제거 여부. Defaults to False.
+
+        Returns:
+            str or None: 추출된 스크립트. 실패 시 None.
+        """
         print("[스크립트 추출 시작]")
-        contents: list[types.Content] = [
-            "첨부한 오디오 파일의 스크립트를 추출해주세요. 스크립트 외의 다른 출력이 답변에 포함되지 않도록 해주세요.",
-            self.client.files.upload(
-                file=os.path.join("data", "audio", "lecture_audio.wav")
-            ),
-        ]
+        has_ffmpeg = ffmpeg_available()
+        if (chunked or preprocess) and not has_ffmpeg:
+            print("[경고] ffmpeg를 찾을 수 없어 전처리 및 구간 분할 없이 추출합니다.")
+            chunked = preprocess = False
+
+        upload_path = audio_path
+        if preprocess:
+            upload_path = self._compact_audio(audio_path, trim_silence)
+
+        if chunked:
+            chunk_format = "ogg" if upload_path.endswith(".ogg") else "wav"
+            script = self._get_script_chunked(
+                upload_path,
+                chunk_seconds,
+                overlap_seconds,
+                max_workers,
+                max_retries,
+                chunk_format,
+            )
+        else:
+            script = self._transcribe_audio(upload_path, stream_output=stream_output)
+
+        if script is None:
+            print("\n[스크립트 추출 실패]")
+            return None
+        print("\n[스크립트 추출 완료]")
+        for path in {audio_path, upload_path}:
+            if os.path.exists(path):
+                os.remove(path)
+        return script
+
+    def _compact_audio(self, audio_path: str, trim_silence: bool) -> str:
+        compact_path = os.path.splitext(audio_path)[0] + ".ogg"
+        result = preprocess_audio(audio_path, compact_path, trim_silence=trim_silence)
+        if result is None:
+            print("[경고] 오디오 전처리에 실패하여 원본 파일을 업로드합니다.")
+            return audio_path
+
+        ratio = result["original_bytes"] / max(result["processed_bytes"], 1)
+        print(
+            f"[오디오 전처리 완료] {result['original_bytes'] / 1024 / 1024:.1f}MB → "
+            f"{result['processed_bytes'] / 1024 / 1024:.1f}MB "
+            f"({result['saved_bytes'] / 1024 / 1024:.1f}MB 절감, {ratio:.1f}배 축소)"
+        )
+        return compact_path
+
+    def _transcribe_audio(self, audio_path: str, stream_output: bool = False) -> str:
         generate_content_config: types.GenerateContentConfig = (
             types.GenerateContentConfig(
                 response_mime_type="text/plain",
             )
         )
 
+        # 업로드한 파일은 업로드한 키의 프로젝트에서만 보이므로, 선택된 키로 업로드와 생성을 함께 합니다.
+        def request(api_key):
+            client = get_gemini_client(api_key)
+            if self.file_cache:
+                audio_file = self.file_cache.upload(client, audio_path, api_key)
+            else:
+                audio_file = client.files.upload(file=audio_path)
+            contents: list[types.Content] = [TRANSCRIBE_PROMPT, audio_file]
+            return client.models.generate_content_stream(
+                model=self.model_name,
+                contents=contents,
+                config=generate_content_config,
+            )
+
+        # 오디오는 초당 약 32토큰으로 계산되므로, 길이를 알 수 있으면 분당 토큰 한도에 반영합니다.
+        duration = get_audio_duration(audio_path) if ffmpeg_available() else None
+        estimated_tokens = int((duration or 0) * AUDIO_TOKENS_PER_SECOND)
+
         script_chunks = []
-        for chunk in self.client.models.generate_content_stream(
-            model=self.model_name,
-            contents=contents,
-            config=generate_content_config,
-        ):
-            print(chunk.text, end="", flush=True)
+        stream = get_scheduler().stream(
+            self.model_name, request, estimated_tokens, self.api_keys
+        )
+        for chunk in get_stream_metrics().track(stream, self.model_name, "transcribe"):
+            if not chunk.text:
+                continue
+            if stream_output:
+                print(chunk.text, end="", flush=True)
             script_chunks.append(chunk.text)
-        print("\n[스크립트 추출 완료]")
-        os.remove(os.path.join("data", "audio", "lecture_audio.wav"))
         return "".join(script_chunks)
 
+    def _get_script_chunked(
+        self,
+        audio_path,
+        chunk_seconds,
+        overlap_seconds,
+        max_workers,
+        max_retries,
+        chunk_format="wav",
+    ):
+        chunk_dir = os.path.splitext(audio_path)[0] + "_chunks"
+        chunks = split_audio(
+            audio_path, chunk_dir, chunk_seconds, overlap_seconds, chunk_format
+        )
+        if not chunks:
+            return None
+        print(f"[구간 분할 완료] {len(chunks)}개 구간, 최대 {max_workers}개 동시 추출")
+
+        results = {}
+        pending = chunks
+        try:
+            for attempt in range(max_retries + 1):
+                if attempt > 0:
+                    print(f"[재시도 {attempt}/{max_retries}] 실패한 구간 {len(pending)}개")
+                    time.sleep(2**attempt)
+
+                failed = []
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(self._transcribe_audio, chunk["path"]): chunk
+                        for chunk in pending
+                    }
+                    for future in as_completed(futures):
+                        chunk = futures[future]
+                        try:
+                            results[chunk["index"]] = future.result()
+                            print(
+                                f"[구간 {chunk['index'] + 1}/{len(chunks)} 완료] "
+                                f"{chunk['start']:.0f}s ~ {chunk['end']:.0f}s"
+                            )
+                        except Exception as e:
+                            print(f"[구간 {chunk['index'] + 1}/{len(chunks)} 실패] {e}")
+                            failed.append(chunk)
+
+                pending = failed
+                if not pending:
+                    break
+
+            if pending:
+                print(f"[오류] {len(pending)}개 구간의 스크립트를 추출하지 못했습니다.")
+                return None
+        finally:
+            shutil.rmtree(chunk_dir, ignore_errors=True)
+
+        return merge_overlapping_transcripts([results[i] for i in range(len(chunks))])
+
+
+def _normalize_word(word: str) -> str:
+    return "".join(ch for ch in word if ch.isalnum()).lower()
+
+
+def merge_overlapping_transcripts(
+    transcripts, window_words: int = 80, min_match_words: int = 4
+) -> str:
+    """
+    겹치는 구간에서 추출된 스크립트들을 중복 없이 이어 붙입니다.
+
+    앞 스크립트의 끝부분과 뒤 스크립트의 앞부분에서 가장 길게 일치하는 단어
+    구간을 찾아 그 지점에서 두 스크립트를 잇습니다. 일치 구간이 충분히 길지
+    않으면 그대로 이어 붙입니다.
+
+    Args:
+        transcripts (list[str]): 시간 순서대로 정렬된 구간별 스크립트.
+        window_words (int, optional): 겹침을 탐색할 경계 부근 단어 수. Defaults to 80.
+        min_match_words (int, optional): 겹침으로 인정할 최소 일치 단어 수. Defaults to 4.
+
+    Returns:
+        str: 병합된 스크립트.
+    """
+    merged_words = []
+    for transcript in transcripts:
+        words = transcript.split()
+        if not merged_words:
+            merged_words = words
+            continue
+
+        tail_offset = max(len(merged_words) - window_words, 0)
+        tail = [_normalize_word(w) for w in merged_words[tail_offset:]]
+        head = [_normalize_word(w) for w in words[:window_words]]
+
+        best_len, best_i, best_j = 0, 0, 0
+        for i in range(len(tail)):
+            for j in range(len(head)):
+                length = 0
+                while (
+                    i + length < len(tail)
+                    and j + length < len(head)
+                    and tail[i + length]
+                    and tail[i + length] == head[j + length]
+                ):
+                    length += 1
+                if length > best_len:
+                    best_len, best_i, best_j = length, i, j
+
+        if best_len >= min_match_words:
+            merged_words = (
+                merged_words[: tail_offset + best_i + best_len]
+                + words[best_j + best_len :]
+            )
+        else:
+            merged_words = merged_words + words
+    return " ".join(merged_words)
+
 
 if __name__ == "__main__":
     video_to_text = VideoToText()
-    if video_to_text.download_youtube_audio(
+    video_to_text.get_script_from_youtube(
         "https://www.youtube.com/watch?v=k-vamAL8hEo"
-    ):
-        video_to_text.get_script()
\ No newline at end of file
+    )
\ No newline at end of file
@@ -0,0 +1,205 @@
+import os
+import shutil
+import subprocess
+
+SPEECH_SAMPLE_RATE = 16000
+SPEECH_BITRATE = "24k"
+SILENCE_FILTER = (
+    "silenceremove=start_periods=1:start_threshold=-45dB"
+    ":stop_periods=-1:stop_duration=1.5:stop_threshold=-45dB:stop_silence=0.5"
+)
+
+
+def ffmpeg_available() -> bool:
+    """ffmpeg와 ffprobe 실행 파일이 PATH에 있는지 확인합니다."""
+    return bool(shutil.which("ffmpeg") and shutil.which("ffprobe"))
+
+
+def get_audio_duration(audio_path: str):
+    """
+    ffprobe로 오디오 파일의 길이(초)를 구합니다.
+
+    Args:
+        audio_path (str): 오디오 파일 경로.
+
+    Returns:
+        float or None: 오디오 길이(초). 확인할 수 없으면 None.
+    """
+    try:
+        result = subprocess.run(
+            [
+                "ffprobe",
+                "-v",
+                "error",
+                "-show_entries",
+                "format=duration",
+                "-of",
+                "default=noprint_wrappers=1:nokey=1",
+                audio_path,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return float(result.stdout.strip())
+    except (OSError, subprocess.CalledProcessError, ValueError) as e:
+        print(f"[오류] 오디오 길이를 확인할 수 없습니다 ({audio_path}): {e}")
+        return None
+
+
+def _speech_codec_args(output_path: str, bitrate: str = SPEECH_BITRATE):
+    # .ogg 출력은 음성에 최적화된 Opus로 인코딩하고, 그 외에는 ffmpeg 기본 코덱을 사용합니다.
+    if output_path.endswith(".ogg"):
+        return ["-c:a", "libopus", "-b:a", bitrate, "-application", "voip"]
+    return []
+
+
+def preprocess_audio(
+    audio_path: str,
+    output_path: str,
+    sample_rate: int = SPEECH_SAMPLE_RATE,
+    bitrate: str = SPEECH_BITRATE,
+    trim_silence: bool = False,
+):
+    """
+    업로드 전에 오디오를 모노, 저샘플링, 음성용 Opus 압축 파일로 변환합니다.
+
+    `trim_silence`가 True이면 앞뒤 무음을 제거하고, 1.5초보다 긴 공백은
+    0.5초로 줄입니다.
+
+    Args:
+        audio_path (str): 원본 오디오 파일 경로.
+        output_path (str): 변환된 파일 경로 (.ogg 권장).
+        sample_rate (int, optional): 출력 샘플링 레이트. Defaults to 16000.
+        bitrate (str, optional): 출력 비트레이트. Defaults to "24k".
+        trim_silence (bool, optional): 무음 구간 제거 여부. Defaults to False.
+
+    Returns:
+        dict or None: `original_bytes`, `processed_bytes`, `saved_bytes` 키를 가진
+            결과 정보. 실패 시 None.
+    """
+    command = [
+        "ffmpeg",
+        "-y",
+        "-loglevel",
+        "error",
+        "-i",
+        audio_path,
+        "-vn",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+    ]
+    if trim_silence:
+        command += ["-af", SILENCE_FILTER]
+    command += _speech_codec_args(output_path, bitrate) + [output_path]
+
+    try:
+        subprocess.run(command, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"[오류] 오디오 전처리 실패: {e}")
+        return None
+
+    original_bytes = os.path.getsize(audio_path)
+    processed_bytes = os.path.getsize(output_path)
+    return {
+        "original_bytes": original_bytes,
+        "processed_bytes": processed_bytes,
+        "saved_bytes": original_bytes - processed_bytes,
+    }
+
+
+def extract_audio_segment(
+    audio_path: str, output_path: str, start: float, duration: float
+) -> bool:
+    """
+    오디오 파일의 일부 구간을 모노 16kHz 파일로 잘라 저장합니다.
+
+    출력 경로가 .ogg이면 음성용 Opus로 인코딩합니다.
+
+    Args:
+        audio_path (str): 원본 오디오 파일 경로.
+        output_path (str): 저장할 구간 파일 경로.
+        start (float): 시작 위치(초).
+        duration (float): 구간 길이(초).
+
+    Returns:
+        bool: 성공 여부.
+    """
+    try:
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-ss",
+                f"{start:.3f}",
+                "-t",
+                f"{duration:.3f}",
+                "-i",
+                audio_path,
+                "-vn",
+                "-ac",
+                "1",
+                "-ar",
+                str(SPEECH_SAMPLE_RATE),
+                *_speech_codec_args(output_path),
+                output_path,
+            ],
+            check=True,
+        )
+        return True
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"[오류] 오디오 구간 추출 실패 ({start:.1f}s~): {e}")
+        return False
+
+
+def split_audio(
+    audio_path: str,
+    output_dir: str,
+    chunk_seconds: float = 600,
+    overlap_seconds: float = 15,
+    chunk_format: str = "wav",
+):
+    """
+    오디오 파일을 서로 겹치는 시간 구간으로 분할합니다.
+
+    각 구간은 `chunk_seconds` 길이이며, 이웃한 구간과 `overlap_seconds`만큼
+    겹치도록 잘라 경계에서 문장이 끊기지 않게 합니다.
+
+    Args:
+        audio_path (str): 원본 오디오 파일 경로.
+        output_dir (str): 구간 파일을 저장할 디렉토리.
+        chunk_seconds (float, optional): 구간 길이(초). Defaults to 600.
+        overlap_seconds (float, optional): 이웃 구간과 겹치는 길이(초). Defaults to 15.
+        chunk_format (str, optional): 구간 파일 확장자 ("wav" 또는 "ogg"). Defaults to "wav".
+
+    Returns:
+        list[dict] or None: `index`, `start`, `end`, `path` 키를 가진 구간 정보 목록.
+            실패 시 None.
+    """
+    if overlap_seconds >= chunk_seconds:
+        raise ValueError("overlap_seconds는 chunk_seconds보다 작아야 합니다.")
+
+    total_duration = get_audio_duration(audio_path)
+    if total_duration is None:
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    step = chunk_seconds - overlap_seconds
+    chunks = []
+    start = 0.0
+    while start < total_duration:
+        end = min(start + chunk_seconds, total_duration)
+        chunk_path = os.path.join(output_dir, f"chunk_{len(chunks):03d}.{chunk_format}")
+        if not extract_audio_segment(audio_path, chunk_path, start, end - start):
+            return None
+        chunks.append(
+            {"index": len(chunks), "start": start, "end": end, "path": chunk_path}
+        )
+        if end >= total_duration:
+            break
+        start += step
+    return chunks
@@ -0,0 +1,240 @@
+import atexit
+import threading
+from selenium.common.exceptions import WebDriverException
+from .selenium_setup import setup_selenium_driver, download_dir_for
+from .chrome_launcher import get_chrome_launcher
+
+
+class _BrowserSession:
+    def __init__(self, driver, download_subdir, start_url, chrome_browser_open, instance=None):
+        self.driver = driver
+        self.instance = instance
+        self.download_subdir = download_subdir
+        self.start_url = start_url
+        self.chrome_browser_open = chrome_browser_open
+        self.window_handle = driver.current_window_handle
+        self.uses = 0
+        self.broken = False
+        # 반납 후 시작 페이지로 돌아가는 동안에는 내주지 않습니다.
+        self.ready = threading.Event()
+        self.ready.set()
+
+
+class BrowserSessionPool:
+    """
+    시작 URL(사이트)별로 연결된 WebDriver와 탭을 유지하며 단계와 작업 사이에 재사용합니다.
+
+    세션을 처음 만들 때만 `setup_selenium_driver`로 Chrome에 연결하고,
+    이후에는 상태 확인을 통과한 세션을 바로 내줍니다. 반납된 세션은 백그라운드에서
+    시작 페이지로 다시 이동해 두며, 실패한 실행에서 반납되었거나 상태 확인에 실패하거나
+    `max_uses`번 사용한 세션은 종료하고 새로 만듭니다.
+
+    같은 사이트의 세션이 이미 사용 중이면(여러 작업을 동시에 실행하는 경우)
+    `ChromeLauncher`로 별도 포트와 복제 프로필을 쓰는 Chrome 인스턴스를 띄워
+    새 세션을 만들고, 그 세션을 닫을 때 인스턴스도 함께 종료합니다.
+    """
+
+    def __init__(self, max_uses: int = 20):
+        """
+        Args:
+            max_uses (int, optional): 한 세션을 재사용할 최대 횟수. Defaults to 20.
+        """
+        self.max_uses = max_uses
+        self.stats = {"created": 0, "reused": 0, "closed": 0}
+        self._idle = {}
+        self._in_use = {}
+        self._lock = threading.Lock()
+        # 여러 세션이 동시에 Chrome을 띄우거나 Preferences를 쓰지 않도록 생성을 직렬화합니다.
+        self._create_lock = threading.Lock()
+
+    def acquire(self, download_subdir: str, start_url: str):
+        """
+        시작 URL에 맞는 세션을 내줍니다. 재사용할 세션이 없으면 새로 만듭니다.
+
+        Args:
+            download_subdir (str): 다운로드 파일을 저장할 하위 디렉토리 이름.
+            start_url (str): 세션이 열어 둘 시작 URL.
+
+        Returns:
+            tuple: (WebDriver 또는 None, 기존 Chrome 브라우저 사용 여부).
+                `setup_selenium_driver`와 같은 형식입니다.
+        """
+        with self._lock:
+            session = self._idle.pop(start_url, None)
+        if session is not None:
+            session.ready.wait()
+            if self._is_healthy(session):
+                session.uses += 1
+                with self._lock:
+                    self.stats["reused"] += 1
+                    self._in_use[id(session.driver)] = session
+                print(f"브라우저 세션 재사용: {start_url} ({session.uses}번째 사용)")
+                return session.driver, True
+            print(f"브라우저 세션 상태 확인 실패. 새 세션을 만듭니다: {start_url}")
+            self._close(session)
+
+        session = self._create(download_subdir, start_url)
+        if session is None:
+            return None, False
+        session.uses += 1
+        with self._lock:
+            self._in_use[id(session.driver)] = session
+        return session.driver, session.chrome_browser_open
+
+    def release(self, driver, healthy: bool = True):
+        """
+        사용이 끝난 세션을 돌려받습니다.
+
+        Args:
+            driver: `acquire`로 받은 WebDriver.
+            healthy (bool, optional): False이면 세션을 재사용하지 않고 종료합니다. Defaults to True.
+        """
+        with self._lock:
+            session = self._in_use.pop(id(driver), None)
+        if session is None:
+            # 풀에서 받지 않은 드라이버는 기존처럼 종료합니다.
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+            return
+
+        if not healthy or session.uses >= self.max_uses:
+            self._close(session)
+            return
+
+        with self._lock:
+            if session.start_url in self._idle:
+                duplicate = True
+            else:
+                duplicate = False
+                session.ready.clear()
+                self._idle[session.start_url] = session
+        if duplicate:
+            self._close(session)
+            return
+        threading.Thread(target=self._rewarm, args=(session,), daemon=True).start()
+
+    def warm(self, download_subdir: str, start_url: str, background: bool = True):
+        """
+        시작 URL의 세션을 미리 만들어 둡니다. 이미 있으면 아무것도 하지 않습니다.
+
+        Args:
+            download_subdir (str): 다운로드 파일을 저장할 하위 디렉토리 이름.
+            start_url (str): 세션이 열어 둘 시작 URL.
+            background (bool, optional): True이면 별도 스레드에서 만듭니다. Defaults to True.
+        """
+
+        def create():
+            with self._lock:
+                if start_url in self._idle or any(
+                    session.start_url == start_url for session in self._in_use.values()
+                ):
+                    return
+            session = self._create(download_subdir, start_url)
+            if session is None:
+                return
+            with self._lock:
+                if start_url not in self._idle:
+                    self._idle[start_url] = session
+                    return
+            self._close(session)
+
+        if background:
+            threading.Thread(target=create, daemon=True).start()
+        else:
+            create()
+
+    def close_all(self):
+        """풀이 가진 모든 세션을 종료합니다."""
+        with self._lock:
+            sessions = list(self._idle.values()) + list(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+        for session in sessions:
+            self._close(session)
+
+    def _create(self, download_subdir, start_url):
+        with self._create_lock:
+            # 같은 Chrome에 연결된 다른 세션이 있으면 그 탭을 건드리지 않도록 새 탭에서 시작합니다.
+            with self._lock:
+                new_tab = bool(self._idle or self._in_use)
+                isolated = any(
+                    session.start_url == start_url for session in self._in_use.values()
+                )
+
+            instance = None
+            if isolated:
+                instance = get_chrome_launcher().launch(download_dir_for(download_subdir))
+                if instance is None:
+                    return None
+                new_tab = False
+            try:
+                result = setup_selenium_driver(
+                    download_subdir,
+                    start_url,
+                    new_tab=new_tab,
+                    debugger_address=instance.debugger_address if instance else None,
+                )
+            except WebDriverException as e:
+                print(f"브라우저 세션 생성 실패: {e}")
+                result = None
+            if not result or not result[0]:
+                if instance:
+                    get_chrome_launcher().terminate(instance)
+                return None
+            driver, chrome_browser_open = result
+            session = _BrowserSession(
+                driver, download_subdir, start_url, chrome_browser_open, instance
+            )
+            with self._lock:
+                self.stats["created"] += 1
+            print(f"브라우저 세션 생성: {start_url}")
+            return session
+
+    def _rewarm(self, session):
+        try:
+            session.driver.switch_to.window(session.window_handle)
+            session.driver.get(session.start_url)
+        except WebDriverException as e:
+            print(f"브라우저 세션을 시작 페이지로 되돌리지 못했습니다: {e}")
+            session.broken = True
+        finally:
+            session.ready.set()
+
+    def _is_healthy(self, session) -> bool:
+        if session.broken:
+            return False
+        if session.instance and not session.instance.is_running():
+            return False
+        try:
+            if session.window_handle not in session.driver.window_handles:
+                return False
+            session.driver.switch_to.window(session.window_handle)
+            return session.driver.execute_script("return document.readyState") is not None
+        except WebDriverException:
+            return False
+
+    def _close(self, session):
+        with self._lock:
+            self.stats["closed"] += 1
+        try:
+            session.driver.quit()
+        except WebDriverException:
+            pass
+        if session.instance:
+            get_chrome_launcher().terminate(session.instance)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> BrowserSessionPool:
+    """프로세스 전체에서 공유하는 `BrowserSessionPool`을 반환합니다. 종료 시 모든 세션을 닫습니다."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserSessionPool()
+            atexit.register(_pool.close_all)
+        return _pool
@@ -0,0 +1,217 @@
+import os
+import atexit
+import shutil
+import socket
+import threading
+import subprocess
+from .selenium_setup import find_chrome_path, update_download_preferences, wait_for_debugger
+
+_PROJECT_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+)
+TEMPLATE_PROFILE_DIR = os.path.join(_PROJECT_DIR, "data", "selenium-dev-profile")
+INSTANCES_DIR = os.path.join(_PROJECT_DIR, "data", "chrome-instances")
+
+# 프로필을 복제할 때 건너뛸 항목: 실행 중인 Chrome의 잠금 파일과 다시 만들어지는 캐시입니다.
+_PROFILE_IGNORE = shutil.ignore_patterns(
+    "Singleton*",
+    "lockfile",
+    "LOCK",
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "ShaderCache",
+    "GrShaderCache",
+    "DawnCache",
+    "Crashpad",
+    "*.tmp",
+)
+
+
+def find_free_port() -> int:
+    """운영체제가 비어 있다고 알려주는 로컬 TCP 포트를 반환합니다."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ChromeInstance:
+    """런처가 띄운 Chrome 프로세스 하나의 디버깅 포트, 프로필 경로, 프로세스 정보입니다."""
+
+    def __init__(self, name: str, port: int, profile_dir: str, process):
+        self.name = name
+        self.port = port
+        self.profile_dir = profile_dir
+        self.process = process
+
+    @property
+    def debugger_address(self) -> str:
+        return f"127.0.0.1:{self.port}"
+
+    def is_running(self) -> bool:
+        return self.process.poll() is None
+
+
+class ChromeLauncher:
+    """
+    자동화 작업마다 별도의 Chrome 인스턴스를 띄우고 관리합니다.
+
+    인스턴스마다 비어 있는 원격 디버깅 포트를 할당하고, 로그인해 둔 템플릿 프로필을
+    `instance-<번호>` 프로필로 복제해 사용합니다. 복제한 프로필은 다음 실행에서 그대로
+    재사용하므로 처음 한 번만 복사 비용이 듭니다. 런처가 띄운 프로세스만 추적하며
+    `shutdown()` 또는 프로그램 종료 시 모두 정리합니다.
+    """
+
+    def __init__(
+        self,
+        template_profile_dir: str = TEMPLATE_PROFILE_DIR,
+        instances_dir: str = INSTANCES_DIR,
+        startup_timeout: float = 15.0,
+    ):
+        """
+        Args:
+            template_profile_dir (str, optional): 복제할 템플릿 프로필 경로.
+            instances_dir (str, optional): 인스턴스별 프로필을 둘 디렉토리.
+            startup_timeout (float, optional): Chrome 디버깅 포트가 열리기를 기다릴 시간(초).
+                Defaults to 15.0.
+        """
+        self.template_profile_dir = template_profile_dir
+        self.instances_dir = instances_dir
+        self.startup_timeout = startup_timeout
+        self._instances = {}
+        self._lock = threading.Lock()
+
+    def _claim_slot(self) -> str:
+        # 사용 중이지 않은 가장 작은 번호를 써서 같은 프로필(로그인 상태)을 계속 재사용합니다.
+        with self._lock:
+            slot = 1
+            while f"instance-{slot}" in self._instances:
+                slot += 1
+            name = f"instance-{slot}"
+            self._instances[name] = None
+            return name
+
+    def _prepare_profile(self, name: str, refresh: bool) -> str:
+        profile_dir = os.path.join(self.instances_dir, name)
+        if refresh and os.path.exists(profile_dir):
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        if not os.path.exists(profile_dir):
+            if os.path.isdir(self.template_profile_dir):
+                print(f"템플릿 프로필을 복제합니다: {self.template_profile_dir} -> {profile_dir}")
+                # 실행 중인 Chrome이 쓰고 있는 파일 때문에 복사가 중간에 실패할 수 있으므로,
+                # 임시 디렉토리에 모두 복사한 뒤에만 제자리로 옮겨 깨진 복제본이 남지 않게 합니다.
+                tmp_dir = profile_dir + ".tmp"
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                try:
+                    shutil.copytree(self.template_profile_dir, tmp_dir, ignore=_PROFILE_IGNORE)
+                    os.replace(tmp_dir, profile_dir)
+                finally:
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+            else:
+                print(f"알림: 템플릿 프로필({self.template_profile_dir})이 없어 빈 프로필을 사용합니다.")
+                os.makedirs(profile_dir)
+        return profile_dir
+
+    def launch(self, download_dir: str, refresh_profile: bool = False):
+        """
+        새 Chrome 인스턴스를 띄웁니다.
+
+        Args:
+            download_dir (str): 이 인스턴스의 다운로드 디렉토리.
+            refresh_profile (bool, optional): True이면 기존 복제본을 지우고 템플릿에서 다시 복제합니다.
+
+        Returns:
+            ChromeInstance or None: 실행된 인스턴스. 실패 시 None.
+        """
+        chrome_path = find_chrome_path()
+        if not chrome_path:
+            print("Chrome 브라우저를 찾을 수 없습니다.")
+            return None
+
+        name = self._claim_slot()
+        profile_dir = os.path.join(self.instances_dir, name)
+        # 이번 실행에서 새로 복제한 프로필만 실패 시 지웁니다. 기존 복제본의 로그인 상태는 남겨 둡니다.
+        fresh_profile = refresh_profile or not os.path.exists(profile_dir)
+        try:
+            profile_dir = self._prepare_profile(name, refresh_profile)
+            if not update_download_preferences(profile_dir, download_dir):
+                raise RuntimeError("Preferences 파일을 준비하지 못했습니다.")
+
+            port = find_free_port()
+            process = subprocess.Popen(
+                [
+                    chrome_path,
+                    f"--remote-debugging-port={port}",
+                    f"--user-data-dir={profile_dir}",
+                    "--no-first-run",
+                    "--no-default-browser-check",
+                ]
+            )
+            if not wait_for_debugger(port, self.startup_timeout, process):
+                self._stop_process(process)
+                raise RuntimeError(f"디버깅 포트 {port}가 {self.startup_timeout}초 안에 열리지 않았습니다.")
+        except Exception as e:
+            print(f"Chrome 인스턴스({name}) 실행 실패: {e}")
+            if fresh_profile:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+            with self._lock:
+                self._instances.pop(name, None)
+            return None
+
+        instance = ChromeInstance(name, port, profile_dir, process)
+        with self._lock:
+            self._instances[name] = instance
+        print(f"Chrome 인스턴스 실행: {name} (디버깅 포트 {port}, PID {process.pid})")
+        return instance
+
+    def terminate(self, instance: ChromeInstance, remove_profile: bool = False):
+        """
+        인스턴스를 종료하고 추적 목록에서 뺍니다.
+
+        Args:
+            instance (ChromeInstance): 종료할 인스턴스.
+            remove_profile (bool, optional): True이면 복제한 프로필도 지웁니다. Defaults to False.
+        """
+        with self._lock:
+            if self._instances.get(instance.name) is not instance:
+                return
+            del self._instances[instance.name]
+        self._stop_process(instance.process)
+        print(f"Chrome 인스턴스 종료: {instance.name}")
+        if remove_profile:
+            shutil.rmtree(instance.profile_dir, ignore_errors=True)
+
+    def instances(self) -> list:
+        """실행 중인 인스턴스 목록을 반환합니다."""
+        with self._lock:
+            return [instance for instance in self._instances.values() if instance]
+
+    def shutdown(self):
+        """런처가 띄운 모든 인스턴스를 종료합니다."""
+        for instance in self.instances():
+            self.terminate(instance)
+
+    @staticmethod
+    def _stop_process(process, timeout: float = 5.0):
+        if process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+_launcher = None
+_launcher_lock = threading.Lock()
+
+
+def get_chrome_launcher() -> ChromeLauncher:
+    """프로세스 전체에서 공유하는 `ChromeLauncher`를 반환합니다. 종료 시 모든 인스턴스를 정리합니다."""
+    global _launcher
+    with _launcher_lock:
+        if _launcher is None:
+            _launcher = ChromeLauncher()
+            atexit.register(_launcher.shutdown)
+        return _launcher
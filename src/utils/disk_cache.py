@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+
+class DiskCache:
+    """
+    텍스트 값을 디스크에 저장하는 크기 제한 LRU 캐시입니다.
+
+    각 값은 키의 SHA-256 해시를 파일명으로 하는 개별 파일에 저장되며,
+    접근 시각과 크기는 `index.json`에 기록됩니다. 항목 수 또는 전체 크기가
+    한도를 넘으면 가장 오래 사용되지 않은 항목부터 삭제하고, `ttl_seconds`가
+    지정된 경우 유효 기간이 지난 항목은 조회 시 미스로 처리합니다.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(
+        self,
+        cache_dir,
+        max_entries=200,
+        max_bytes=200 * 1024 * 1024,
+        ttl_seconds=None,
+    ):
+        """
+        Args:
+            cache_dir (str): 캐시 파일을 저장할 디렉토리.
+            max_entries (int, optional): 최대 항목 수. Defaults to 200.
+            max_bytes (int, optional): 최대 전체 크기(바이트). Defaults to 200MB.
+            ttl_seconds (float, optional): 항목의 유효 기간(초). None이면 만료되지 않습니다.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(cache_dir, self.INDEX_FILENAME)
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    @staticmethod
+    def _hash_key(key: str) -> str:
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _load_index(self) -> dict:
+        if not os.path.exists(self._index_path):
+            return {}
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"경고: 캐시 인덱스({self._index_path})를 읽을 수 없어 초기화합니다: {e}")
+            return {}
+
+    def _save_index(self):
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._index_path)
+
+    def _entry_path(self, hashed_key: str) -> str:
+        return os.path.join(self.cache_dir, f"{hashed_key}.txt")
+
+    def _remove_entry(self, hashed_key: str):
+        self._index.pop(hashed_key, None)
+        try:
+            os.remove(self._entry_path(hashed_key))
+        except FileNotFoundError:
+            pass
+
+    def _is_expired(self, entry: dict, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry["created"] > self.ttl_seconds
+
+    def _evict(self):
+        now = time.time()
+        for hashed_key, entry in list(self._index.items()):
+            if self._is_expired(entry, now):
+                self._remove_entry(hashed_key)
+
+        entries = sorted(self._index.items(), key=lambda item: item[1]["last_access"])
+        total_bytes = sum(entry["size"] for _, entry in entries)
+        while entries and (
+            len(entries) > self.max_entries or total_bytes > self.max_bytes
+        ):
+            hashed_key, entry = entries.pop(0)
+            total_bytes -= entry["size"]
+            self._remove_entry(hashed_key)
+
+    def get(self, key: str):
+        """
+        캐시에서 값을 조회합니다.
+
+        Args:
+            key (str): 캐시 키.
+
+        Returns:
+            str or None: 저장된 값. 없으면 None.
+        """
+        hashed_key = self._hash_key(key)
+        with self._lock:
+            entry = self._index.get(hashed_key)
+            if entry is not None and self._is_expired(entry, time.time()):
+                self._remove_entry(hashed_key)
+                self._save_index()
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            try:
+                with open(self._entry_path(hashed_key), "r", encoding="utf-8") as f:
+                    value = f.read()
+            except OSError:
+                self._remove_entry(hashed_key)
+                self._save_index()
+                self.misses += 1
+                return None
+
+            entry["last_access"] = time.time()
+            self._save_index()
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str):
+        """
+        값을 캐시에 저장하고 필요하면 오래된 항목을 정리합니다.
+
+        Args:
+            key (str): 캐시 키.
+            value (str): 저장할 값.
+        """
+        hashed_key = self._hash_key(key)
+        data = value.encode("utf-8")
+        with self._lock:
+            tmp_path = self._entry_path(hashed_key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._entry_path(hashed_key))
+
+            now = time.time()
+            self._index[hashed_key] = {
+                "key": key,
+                "size": len(data),
+                "created": now,
+                "last_access": now,
+            }
+            self._evict()
+            self._save_index()
+
+    def stats(self) -> dict:
+        """캐시 적중/미스 횟수와 현재 사용량을 반환합니다."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": sum(entry["size"] for entry in self._index.values()),
+            }
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_disk_cache(cache_dir, **options) -> DiskCache:
+    """
+    디렉토리별로 하나의 `DiskCache`를 공유해 반환합니다.
+
+    같은 디렉토리를 여러 인스턴스가 각자 열면 서로의 `index.json`을 덮어써
+    인덱스에 없는 파일이 남으므로, 프로세스 안에서는 항상 이 함수로 캐시를 얻습니다.
+    이미 만들어진 캐시가 있으면 `options`는 무시하고 처음 설정을 그대로 사용합니다.
+
+    Args:
+        cache_dir (str): 캐시 파일을 저장할 디렉토리.
+        **options: 처음 생성할 때 `DiskCache`에 넘길 인자(max_entries, max_bytes, ttl_seconds).
+
+    Returns:
+        DiskCache: 디렉토리에 해당하는 공유 캐시.
+    """
+    key = os.path.abspath(cache_dir)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = DiskCache(cache_dir, **options)
+            _caches[key] = cache
+        return cache
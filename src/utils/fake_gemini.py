@@ -0,0 +1,237 @@
+import os
+import time
+import random
+import asyncio
+import hashlib
+import datetime
+import threading
+from types import SimpleNamespace
+from google.genai import errors
+
+DEFAULT_RESPONSE_TEMPLATE = (
+    "[{model}] 오프라인 테스트용 응답입니다. 입력은 {prompt_chars}자이며 "
+    "다음 내용으로 시작합니다: {prompt_preview}\n"
+)
+
+
+def _contents_text(contents) -> str:
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, (list, tuple)):
+        return "\n".join(_contents_text(item) for item in contents)
+    if getattr(contents, "parts", None):
+        return "\n".join(getattr(part, "text", None) or "" for part in contents.parts)
+    # 업로드한 파일 핸들 등은 이름으로 대신합니다.
+    return str(getattr(contents, "name", "") or getattr(contents, "text", "") or "")
+
+
+def _config_value(config, key):
+    if isinstance(config, dict):
+        return config.get(key)
+    return getattr(config, key, None)
+
+
+class _FakeModels:
+    def __init__(self, backend):
+        self._backend = backend
+
+    def generate_content_stream(self, model, contents, config=None):
+        # 실제 SDK처럼 호출 시점에 요청을 보내고(오류 주입), 조각은 반복하면서 받습니다.
+        chunks = self._backend._start_stream(model, contents, config)
+        return self._backend._iterate(chunks)
+
+    def generate_content(self, model, contents, config=None):
+        chunks = self._backend._start_stream(model, contents, config)
+        chunks = list(self._backend._iterate(chunks))
+        return SimpleNamespace(
+            text="".join(chunk.text for chunk in chunks),
+            usage_metadata=chunks[-1].usage_metadata if chunks else None,
+        )
+
+    def count_tokens(self, model, contents, config=None):
+        return SimpleNamespace(total_tokens=len(_contents_text(contents)) // 2)
+
+
+class _FakeAsyncModels:
+    def __init__(self, backend):
+        self._backend = backend
+
+    async def generate_content_stream(self, model, contents, config=None):
+        chunks = self._backend._start_stream(model, contents, config)
+        return self._backend._iterate_async(chunks)
+
+
+class _FakeFiles:
+    def __init__(self, backend):
+        self._backend = backend
+        self._files = {}
+
+    def upload(self, file, config=None):
+        digest = hashlib.sha256(str(file).encode("utf-8")).hexdigest()[:16]
+        uploaded = SimpleNamespace(
+            name=f"files/fake-{digest}",
+            uri=f"fake://files/{digest}",
+            mime_type="audio/ogg" if str(file).endswith(".ogg") else "audio/wav",
+            state=SimpleNamespace(name="ACTIVE"),
+            expiration_time=datetime.datetime.now(datetime.timezone.utc)
+            + datetime.timedelta(hours=48),
+            size_bytes=os.path.getsize(file) if os.path.exists(str(file)) else 0,
+        )
+        self._files[uploaded.name] = uploaded
+        return uploaded
+
+    def get(self, name, config=None):
+        if name not in self._files:
+            raise errors.ClientError(404, {"error": {"code": 404, "message": f"{name} not found", "status": "NOT_FOUND"}})
+        return self._files[name]
+
+
+class _FakeCaches:
+    def __init__(self, backend):
+        self._backend = backend
+        self._caches = {}
+
+    def create(self, model, config=None):
+        text = _contents_text(_config_value(config, "contents") or [])
+        name = f"cachedContents/fake-{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}"
+        self._caches[name] = text
+        return SimpleNamespace(name=name, model=model)
+
+    def delete(self, name, config=None):
+        self._caches.pop(name, None)
+
+
+class FakeGeminiClient:
+    """
+    실제 API를 호출하지 않는 Google Gen AI 클라이언트 대역입니다.
+
+    `models`, `aio.models`, `files`, `caches` 중 이 프로젝트가 사용하는 부분만 흉내 내며,
+    미리 정한 응답이나 템플릿 응답을 지정한 크기의 조각으로 나눠 스트리밍합니다.
+    첫 조각 지연과 조각 간 지연, 429/500 오류 비율을 설정할 수 있고,
+    같은 시드에서는 같은 순서의 지연과 오류가 재현됩니다.
+    """
+
+    def __init__(
+        self,
+        responses=None,
+        response_template: str = DEFAULT_RESPONSE_TEMPLATE,
+        response_repeat: int = 20,
+        chunk_chars: int = 40,
+        ttft_seconds: float = 0.3,
+        ttft_jitter_seconds: float = 0.1,
+        chunk_interval_seconds: float = 0.02,
+        ttft_sampler=None,
+        rate_limit_error_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            responses (dict or callable, optional): 모델 이름별 고정 응답 또는
+                `(model, prompt) -> str` 함수. 없으면 `response_template`을 사용합니다.
+            response_template (str, optional): 기본 응답 템플릿. `{model}`, `{prompt_chars}`,
+                `{prompt_preview}`를 사용할 수 있습니다.
+            response_repeat (int, optional): 템플릿 응답을 반복할 횟수. Defaults to 20.
+            chunk_chars (int, optional): 조각 하나의 글자 수. Defaults to 40.
+            ttft_seconds (float, optional): 첫 조각까지의 평균 지연(초). Defaults to 0.3.
+            ttft_jitter_seconds (float, optional): 첫 조각 지연의 균등 분포 폭(±초). Defaults to 0.1.
+            chunk_interval_seconds (float, optional): 조각 사이 지연(초). Defaults to 0.02.
+            ttft_sampler (callable, optional): `random.Random`을 받아 첫 조각 지연을 반환하는 함수.
+                지정하면 `ttft_seconds`와 `ttft_jitter_seconds` 대신 사용합니다 (예: 긴 꼬리 분포).
+            rate_limit_error_rate (float, optional): 요청이 429로 실패할 확률. Defaults to 0.0.
+            server_error_rate (float, optional): 요청이 500으로 실패할 확률. Defaults to 0.0.
+            seed (int, optional): 지연과 오류를 재현하기 위한 난수 시드. Defaults to 0.
+        """
+        self.responses = responses
+        self.response_template = response_template
+        self.response_repeat = response_repeat
+        self.chunk_chars = chunk_chars
+        self.ttft_seconds = ttft_seconds
+        self.ttft_jitter_seconds = ttft_jitter_seconds
+        self.chunk_interval_seconds = chunk_interval_seconds
+        self.ttft_sampler = ttft_sampler
+        self.rate_limit_error_rate = rate_limit_error_rate
+        self.server_error_rate = server_error_rate
+        self.stats = {"requests": 0, "rate_limited": 0, "server_errors": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self.models = _FakeModels(self)
+        self.files = _FakeFiles(self)
+        self.caches = _FakeCaches(self)
+        self.aio = SimpleNamespace(models=_FakeAsyncModels(self))
+
+    def _response_text(self, model: str, prompt: str) -> str:
+        if callable(self.responses):
+            return self.responses(model, prompt)
+        if isinstance(self.responses, dict) and model in self.responses:
+            return self.responses[model]
+        preview = " ".join(prompt.split())[:60]
+        return self.response_template.format(
+            model=model, prompt_chars=len(prompt), prompt_preview=preview
+        ) * self.response_repeat
+
+    def _start_stream(self, model, contents, config):
+        prompt = _contents_text(contents)
+        cache_name = _config_value(config, "cached_content")
+        if cache_name:
+            prompt = self.caches._caches.get(cache_name, "") + "\n" + prompt
+
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._random.random()
+            if self.ttft_sampler:
+                ttft = self.ttft_sampler(self._random)
+            else:
+                ttft = self.ttft_seconds + self._random.uniform(
+                    -self.ttft_jitter_seconds, self.ttft_jitter_seconds
+                )
+            if roll < self.rate_limit_error_rate:
+                self.stats["rate_limited"] += 1
+                error = errors.ClientError(
+                    429,
+                    {"error": {"code": 429, "message": "Resource has been exhausted (fake).", "status": "RESOURCE_EXHAUSTED"}},
+                )
+            elif roll < self.rate_limit_error_rate + self.server_error_rate:
+                self.stats["server_errors"] += 1
+                error = errors.ServerError(
+                    500,
+                    {"error": {"code": 500, "message": "Internal error (fake).", "status": "INTERNAL"}},
+                )
+            else:
+                error = None
+
+        text = "" if error else self._response_text(model, prompt)
+        pieces = [
+            text[i : i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)
+        ]
+        usage = SimpleNamespace(
+            prompt_token_count=len(prompt) // 2,
+            candidates_token_count=len(text) // 2,
+            total_token_count=(len(prompt) + len(text)) // 2,
+        )
+        return {"ttft": max(0.0, ttft), "error": error, "pieces": pieces, "usage": usage}
+
+    def _chunk(self, plan, index):
+        last = index == len(plan["pieces"]) - 1
+        return SimpleNamespace(
+            text=plan["pieces"][index], usage_metadata=plan["usage"] if last else None
+        )
+
+    def _iterate(self, plan):
+        time.sleep(plan["ttft"])
+        if plan["error"]:
+            raise plan["error"]
+        for index in range(len(plan["pieces"])):
+            if index:
+                time.sleep(self.chunk_interval_seconds)
+            yield self._chunk(plan, index)
+
+    async def _iterate_async(self, plan):
+        await asyncio.sleep(plan["ttft"])
+        if plan["error"]:
+            raise plan["error"]
+        for index in range(len(plan["pieces"])):
+            if index:
+                await asyncio.sleep(self.chunk_interval_seconds)
+            yield self._chunk(plan, index)
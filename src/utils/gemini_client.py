@@ -0,0 +1,175 @@
+import os
+import threading
+import httpx
+from dotenv import load_dotenv
+from google import genai
+from google.genai import types
+
+load_dotenv()
+
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 120
+
+FAKE_API_KEY = "fake-api-key"
+
+_clients = {}
+_lock = threading.Lock()
+_stats = {"clients_created": 0, "connections_opened": 0, "requests_sent": 0}
+_client_factory = None
+
+
+def set_client_factory(factory=None):
+    """
+    클라이언트를 만드는 백엔드를 교체합니다.
+
+    `factory`는 API 키를 받아 `genai.Client`와 같은 인터페이스의 객체를 반환해야 합니다
+    (예: `lambda api_key: FakeGeminiClient(server_error_rate=0.1)`). None이면 실제 API
+    클라이언트로 돌아갑니다. 이미 만든 클라이언트는 버리고 다음 호출부터 새로 만듭니다.
+    백엔드를 교체한 동안에는 API 키가 설정되어 있지 않아도 `FAKE_API_KEY`를 사용합니다.
+    환경 변수 `GEMINI_BACKEND=fake`로도 기본 설정의 오프라인 대역을 사용할 수 있습니다.
+    """
+    global _client_factory
+    with _lock:
+        _client_factory = factory
+        _clients.clear()
+
+
+def _using_fake_backend() -> bool:
+    # 교체한 백엔드는 실제 키가 필요 없다고 보고, 키가 없으면 대역용 기본 키를 넘깁니다.
+    return _client_factory is not None or os.getenv("GEMINI_BACKEND", "").lower() == "fake"
+
+
+def resolve_api_key(api_key=None) -> str:
+    """
+    API 키를 인자 또는 환경 변수(`GOOGLE_API_KEY`, `GEMINI_API_KEY`)에서 가져옵니다.
+
+    Raises:
+        ValueError: API 키를 찾을 수 없는 경우.
+    """
+    api_key = (
+        api_key
+        or os.getenv("GOOGLE_API_KEY")
+        or os.getenv("GEMINI_API_KEY")
+        or (os.getenv("GOOGLE_API_KEYS") or "").split(",")[0].strip()
+        or (FAKE_API_KEY if _using_fake_backend() else None)
+    )
+    if not api_key:
+        raise ValueError(
+            "Error: API 키가 환경 변수로 설정되지 않았습니다. GOOGLE_API_KEY 환경 변수를 설정하거나 api_key 매개변수를 통해 설정하세요."
+        )
+    return api_key
+
+
+def resolve_api_keys(api_key=None) -> list:
+    """
+    사용할 API 키 목록을 가져옵니다.
+
+    `api_key`가 주어지면 그 키(목록 또는 쉼표로 구분한 문자열)만 사용하고, 없으면
+    환경 변수 `GOOGLE_API_KEYS`(쉼표로 구분)와 `GOOGLE_API_KEY`, `GEMINI_API_KEY`를
+    합쳐 중복 없이 반환합니다.
+
+    Raises:
+        ValueError: API 키를 찾을 수 없는 경우.
+    """
+    if api_key:
+        candidates = api_key if isinstance(api_key, (list, tuple)) else api_key.split(",")
+    else:
+        candidates = (os.getenv("GOOGLE_API_KEYS") or "").split(",") + [
+            os.getenv("GOOGLE_API_KEY") or "",
+            os.getenv("GEMINI_API_KEY") or "",
+        ]
+    api_keys = list(dict.fromkeys(key.strip() for key in candidates if key and key.strip()))
+    if not api_keys:
+        # 키가 하나도 없으면 단일 키와 같은 규칙(오프라인 대역 기본 키 또는 오류)을 따릅니다.
+        api_keys = [resolve_api_key(None)]
+    return api_keys
+
+
+def _increment(stat: str):
+    with _lock:
+        _stats[stat] += 1
+
+
+def _trace(event_name, info):
+    # httpcore가 새 TCP 연결을 맺을 때만 호출되므로, 재사용된 keep-alive 연결은 세지 않습니다.
+    if event_name == "connection.connect_tcp.complete":
+        _increment("connections_opened")
+
+
+async def _trace_async(event_name, info):
+    # 비동기 전송에서는 httpcore가 trace 콜백을 await하므로 코루틴이어야 합니다.
+    _trace(event_name, info)
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    def handle_request(self, request):
+        _increment("requests_sent")
+        request.extensions["trace"] = _trace
+        return super().handle_request(request)
+
+
+class _AsyncCountingTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request):
+        _increment("requests_sent")
+        request.extensions["trace"] = _trace_async
+        return await super().handle_async_request(request)
+
+
+def _connection_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
+def _create_client(api_key: str) -> genai.Client:
+    if _client_factory is not None:
+        return _client_factory(api_key)
+    if _using_fake_backend():
+        from .fake_gemini import FakeGeminiClient
+
+        return FakeGeminiClient()
+
+    # `client.aio`(비동기 스트리밍)도 같은 연결 제한과 연결 수 집계를 쓰도록 비동기 전송을 함께 넘깁니다.
+    http_options = types.HttpOptions(
+        client_args={"transport": _CountingTransport(limits=_connection_limits())},
+        async_client_args={"transport": _AsyncCountingTransport(limits=_connection_limits())},
+    )
+    return genai.Client(api_key=api_key, http_options=http_options)
+
+
+def get_gemini_client(api_key=None) -> genai.Client:
+    """
+    프로세스 전체에서 공유하는 Google Gen AI 클라이언트를 반환합니다.
+
+    API 키별로 클라이언트를 한 번만 만들고, keep-alive 연결 풀을 재사용하여
+    단계마다 새 HTTP 연결을 맺지 않도록 합니다.
+
+    Args:
+        api_key (str, optional): Google API 키. 없으면 환경 변수에서 가져옵니다.
+
+    Returns:
+        genai.Client: 공유 클라이언트.
+
+    Raises:
+        ValueError: API 키를 찾을 수 없거나 클라이언트 생성에 실패한 경우.
+    """
+    api_key = resolve_api_key(api_key)
+    with _lock:
+        client = _clients.get(api_key)
+        if client is None:
+            try:
+                client = _create_client(api_key)
+            except Exception as e:
+                raise ValueError(f"Error initializing Google Gen AI Client: {e}")
+            _clients[api_key] = client
+            _stats["clients_created"] += 1
+    return client
+
+
+def get_client_stats() -> dict:
+    """생성된 클라이언트 수, 새로 맺은 연결 수, 보낸 요청 수를 반환합니다."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,124 @@
+import time
+import atexit
+import hashlib
+import threading
+from google.genai import errors, types
+
+# 같은 요청을 다시 보내도 결과가 바뀌지 않는 실패(최소 토큰 수 미달, 캐시 미지원 모델)입니다.
+_DETERMINISTIC_STATUS_CODES = (400, 404)
+
+
+class GeminiContextCache:
+    """
+    긴 입력(강의 스크립트 등)을 Gemini 서버 측 컨텍스트 캐시에 한 번만 올리고 재사용합니다.
+
+    같은 모델과 내용에 대한 요청은 만료 전까지 동일한 캐시 이름을 공유하므로,
+    여러 대상 청중용 요청이 같은 입력 토큰을 반복해서 보내지 않습니다.
+    최소 토큰 수 미달이나 미지원 모델처럼 다시 시도해도 실패할 내용은 기억해 두고
+    다시 시도하지 않으며, 429/503 같은 일시적 오류는 이번 요청만 캐시 없이 보냅니다.
+    프로세스 종료 시 생성한 캐시를 모두 삭제합니다.
+    """
+
+    def __init__(self, ttl_seconds: int = 1800, expiry_margin_seconds: int = 60):
+        """
+        Args:
+            ttl_seconds (int, optional): 서버 측 캐시 유지 시간(초). Defaults to 1800.
+            expiry_margin_seconds (int, optional): 만료 직전 재사용을 피하기 위한 여유 시간(초).
+                Defaults to 60.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.expiry_margin_seconds = expiry_margin_seconds
+        self.hits = 0
+        self.created = 0
+        self._entries = {}
+        self._unsupported = set()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        atexit.register(self.release_all)
+
+    @staticmethod
+    def _cache_key(client, model: str, text: str, system_instruction: str = None) -> str:
+        # 캐시는 만든 API 키의 프로젝트에서만 보이므로 클라이언트(키)별로 구분합니다.
+        digest = hashlib.sha256(
+            f"{model}\n{system_instruction or ''}\n{text}".encode("utf-8")
+        ).hexdigest()
+        return f"{id(client)}:{digest}"
+
+    def _key_lock(self, cache_key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(cache_key, threading.Lock())
+
+    def get_or_create(
+        self,
+        client,
+        model: str,
+        text: str,
+        display_name: str = None,
+        system_instruction: str = None,
+    ):
+        """
+        내용에 해당하는 캐시 이름을 반환하고, 없거나 만료되었으면 새로 만듭니다.
+
+        Args:
+            client (genai.Client): Google Gen AI 클라이언트.
+            model (str): 캐시를 사용할 모델 이름.
+            text (str): 캐시에 올릴 내용.
+            display_name (str, optional): 캐시 표시 이름.
+            system_instruction (str, optional): 캐시에 함께 저장할 시스템 지침. 캐시를 사용하는
+                요청에는 시스템 지침을 따로 보낼 수 없으므로 여기서 지정합니다.
+
+        Returns:
+            str or None: 캐시 이름(`cachedContents/...`). 캐시를 사용할 수 없으면 None.
+        """
+        cache_key = self._cache_key(client, model, text, system_instruction)
+        with self._key_lock(cache_key):
+            with self._lock:
+                if cache_key in self._unsupported:
+                    return None
+                entry = self._entries.get(cache_key)
+                if entry and entry["expires_at"] - self.expiry_margin_seconds > time.time():
+                    self.hits += 1
+                    return entry["name"]
+
+            try:
+                cached_content = client.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        contents=[
+                            types.Content(role="user", parts=[types.Part(text=text)])
+                        ],
+                        display_name=display_name,
+                        system_instruction=system_instruction,
+                        ttl=f"{self.ttl_seconds}s",
+                    ),
+                )
+            except Exception as e:
+                print(f"[컨텍스트 캐시 미사용] 캐시 생성 실패로 전체 입력을 전송합니다: {e}")
+                if (
+                    isinstance(e, errors.APIError)
+                    and e.code in _DETERMINISTIC_STATUS_CODES
+                ):
+                    with self._lock:
+                        self._unsupported.add(cache_key)
+                return None
+
+            with self._lock:
+                self.created += 1
+                self._entries[cache_key] = {
+                    "name": cached_content.name,
+                    "client": client,
+                    "expires_at": time.time() + self.ttl_seconds,
+                }
+            print(f"[컨텍스트 캐시 생성] {cached_content.name}")
+            return cached_content.name
+
+    def release_all(self):
+        """생성한 서버 측 캐시를 모두 삭제합니다."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            try:
+                entry["client"].caches.delete(name=entry["name"])
+            except Exception as e:
+                print(f"경고: 컨텍스트 캐시({entry['name']}) 삭제 실패: {e}")
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+# Gemini Files API는 업로드된 파일을 48시간 동안 보관합니다.
+DEFAULT_FILE_TTL_SECONDS = 48 * 60 * 60
+
+
+def hash_file(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class GeminiFileCache:
+    """
+    Gemini Files API에 업로드한 파일 핸들을 내용 해시 기준으로 재사용합니다.
+
+    업로드한 파일의 이름, URI, MIME 타입, 만료 시각을 JSON 인덱스에 기록해 두고,
+    같은 내용의 파일을 다시 업로드하려 하면 만료 전까지 기존 핸들을 반환합니다.
+    만료되었거나 서버에서 삭제된 파일은 자동으로 다시 업로드합니다.
+    """
+
+    def __init__(self, index_path: str, expiry_margin_seconds: int = 300):
+        """
+        Args:
+            index_path (str): 파일 핸들 인덱스(JSON) 경로.
+            expiry_margin_seconds (int, optional): 만료 직전 재사용을 피하기 위한 여유 시간(초).
+                Defaults to 300.
+        """
+        self.index_path = index_path
+        self.expiry_margin_seconds = expiry_margin_seconds
+        self.reused = 0
+        self.uploaded = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"경고: 파일 핸들 인덱스({self.index_path})를 읽을 수 없어 초기화합니다: {e}")
+            return {}
+
+    def _save_index(self):
+        now = time.time()
+        self._index = {
+            key: entry
+            for key, entry in self._index.items()
+            if entry["expires_at"] > now
+        }
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _cache_key(digest: str, api_key: str = None) -> str:
+        # 업로드된 파일은 API 키(프로젝트)별로 분리되므로 키 지문을 함께 사용합니다.
+        if not api_key:
+            return digest
+        owner = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return f"{owner}:{digest}"
+
+    def _lookup(self, client, cache_key: str):
+        with self._lock:
+            entry = self._index.get(cache_key)
+        if not entry or entry["expires_at"] - self.expiry_margin_seconds <= time.time():
+            return None
+        try:
+            file = client.files.get(name=entry["name"])
+        except Exception:
+            return None
+        state = getattr(file.state, "name", str(file.state))
+        if state == "FAILED":
+            return None
+        return file
+
+    def upload(self, client, file_path: str, api_key: str = None):
+        """
+        파일을 업로드하거나, 같은 내용의 유효한 업로드가 있으면 그 핸들을 반환합니다.
+
+        Args:
+            client (genai.Client): Google Gen AI 클라이언트.
+            file_path (str): 업로드할 파일 경로.
+            api_key (str, optional): 클라이언트가 사용하는 API 키. 키별로 핸들을 구분합니다.
+
+        Returns:
+            types.File: 업로드된(또는 재사용된) 파일 핸들.
+        """
+        cache_key = self._cache_key(hash_file(file_path), api_key)
+
+        file = self._lookup(client, cache_key)
+        if file is not None:
+            with self._lock:
+                self.reused += 1
+            print(f"[업로드 재사용] {file.name} ({os.path.basename(file_path)})")
+            return file
+
+        file = client.files.upload(file=file_path)
+        expires_at = (
+            file.expiration_time.timestamp()
+            if getattr(file, "expiration_time", None)
+            else time.time() + DEFAULT_FILE_TTL_SECONDS
+        )
+
+        with self._lock:
+            self.uploaded += 1
+            self._index[cache_key] = {
+                "name": file.name,
+                "uri": file.uri,
+                "mime_type": file.mime_type,
+                "expires_at": expires_at,
+            }
+            self._save_index()
+        return file
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_file_cache(index_path: str, **options) -> GeminiFileCache:
+    """
+    인덱스 경로별로 하나의 `GeminiFileCache`를 공유해 반환합니다.
+
+    같은 인덱스 파일을 여러 인스턴스가 각자 열면 서로의 항목을 덮어쓰므로,
+    프로세스 안에서는 항상 이 함수로 캐시를 얻습니다. 이미 만들어진 캐시가 있으면
+    `options`는 무시하고 처음 설정을 그대로 사용합니다.
+
+    Args:
+        index_path (str): 파일 핸들 인덱스(JSON) 경로.
+        **options: 처음 생성할 때 `GeminiFileCache`에 넘길 인자(expiry_margin_seconds).
+
+    Returns:
+        GeminiFileCache: 인덱스 경로에 해당하는 공유 캐시.
+    """
+    key = os.path.abspath(index_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = GeminiFileCache(index_path, **options)
+            _caches[key] = cache
+        return cache
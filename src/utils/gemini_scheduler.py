@@ -0,0 +1,330 @@
+import os
+import re
+import time
+import random
+import hashlib
+import asyncio
+import threading
+import httpx
+from google.genai import errors
+
+# 모델별 분당 요청 수(rpm)와 분당 입력 토큰 수(tpm) 한도입니다.
+# 환경 변수 GEMINI_RPM, GEMINI_TPM으로 모든 모델의 한도를 덮어쓸 수 있습니다.
+DEFAULT_MODEL_LIMITS = {
+    "gemini-2.5-pro": {"rpm": 150, "tpm": 2_000_000},
+    "gemini-2.5-flash": {"rpm": 1000, "tpm": 1_000_000},
+    "gemini-2.5-flash-lite": {"rpm": 4000, "tpm": 4_000_000},
+}
+FALLBACK_MODEL_LIMITS = {"rpm": 60, "tpm": 250_000}
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+AUDIO_TOKENS_PER_SECOND = 32
+
+
+def estimate_text_tokens(text) -> int:
+    """한국어 기준 대략 2자당 1토큰으로 입력 토큰 수를 추정합니다."""
+    return len(text) // 2 if isinstance(text, str) else 0
+
+
+class TokenBucket:
+    """분당 허용량만큼 연속적으로 채워지는 토큰 버킷입니다."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.refill_rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """`amount`만큼 사용할 수 있을 때까지 기다려야 하는 시간(초)을 반환합니다."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+def _retry_delay_from_error(error):
+    # 429 응답의 RetryInfo(예: "retryDelay": "27s")가 있으면 그 값을 우선합니다.
+    match = re.search(r"retryDelay'?\"?:\s*'?\"?(\d+(?:\.\d+)?)s", str(getattr(error, "details", "")))
+    return float(match.group(1)) if match else None
+
+
+def is_retryable_error(error) -> bool:
+    """할당량 초과(429), 일시적 서버 오류(5xx), 네트워크 오류인지 확인합니다."""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TimeoutException, httpx.NetworkError))
+
+
+def _key_id(api_key: str) -> str:
+    # 끝자리가 같은 키끼리 통계가 합쳐지지 않도록 키 전체의 짧은 해시로 구분합니다.
+    if not api_key:
+        return "(default)"
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def _key_label(api_key: str) -> str:
+    # 출력에 키 전체를 남기지 않도록 끝 4자리와 짧은 해시만 표시합니다.
+    return f"...{api_key[-4:]} ({_key_id(api_key)[:6]})" if api_key else "(default)"
+
+
+class GeminiScheduler:
+    """
+    모든 Gemini 호출이 공유하는 요청 스케줄러입니다.
+
+    API 키와 모델 조합마다 분당 요청 수와 분당 토큰 수 토큰 버킷을 두고,
+    각 요청을 남은 한도가 가장 큰 키로 보냅니다. 모든 키가 한도에 걸리면
+    도착 순서대로 대기시킵니다. 429 오류를 받은 키는 잠시 격리하고 다른 키로
+    바로 재시도하며, 그 밖의 일시적 오류는 지터가 적용된 지수 백오프로 재시도합니다.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        base_delay: float = 2.0,
+        max_delay: float = 60.0,
+        quarantine_seconds: float = 60.0,
+    ):
+        """
+        Args:
+            max_retries (int, optional): 최대 재시도 횟수. Defaults to 5.
+            base_delay (float, optional): 백오프 기본 대기 시간(초). Defaults to 2.0.
+            max_delay (float, optional): 백오프 최대 대기 시간(초). Defaults to 60.0.
+            quarantine_seconds (float, optional): 429를 받은 키를 쉬게 할 기본 시간(초).
+                서버가 retryDelay를 알려주면 그 값을 사용합니다. Defaults to 60.0.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.quarantine_seconds = quarantine_seconds
+        self.retries = 0
+        self._buckets = {}
+        self._queue_locks = {}
+        self._quarantined_until = {}
+        self._key_usage = {}
+        self._lock = threading.Lock()
+
+    def _model_limits(self, model: str) -> dict:
+        limits = dict(DEFAULT_MODEL_LIMITS.get(model, FALLBACK_MODEL_LIMITS))
+        if os.getenv("GEMINI_RPM"):
+            limits["rpm"] = float(os.getenv("GEMINI_RPM"))
+        if os.getenv("GEMINI_TPM"):
+            limits["tpm"] = float(os.getenv("GEMINI_TPM"))
+        return limits
+
+    def _key_buckets(self, model: str, api_key: str):
+        # self._lock을 잡은 상태에서 호출해야 합니다.
+        if (model, api_key) not in self._buckets:
+            limits = self._model_limits(model)
+            self._buckets[(model, api_key)] = (
+                TokenBucket(limits["rpm"]),
+                TokenBucket(limits["tpm"]),
+            )
+        return self._buckets[(model, api_key)]
+
+    def _key_stats(self, api_key: str) -> dict:
+        # self._lock을 잡은 상태에서 호출해야 합니다.
+        return self._key_usage.setdefault(
+            api_key, {"requests": 0, "tokens": 0, "rate_limited": 0}
+        )
+
+    def _queue_lock(self, model: str) -> threading.Lock:
+        with self._lock:
+            return self._queue_locks.setdefault(model, threading.Lock())
+
+    def acquire(self, model: str, estimated_tokens: int = 0, api_keys=(None,)) -> str:
+        """
+        한도 안에서 요청을 보낼 수 있는 API 키를 고를 때까지 대기합니다.
+
+        Args:
+            model (str): 호출할 모델 이름.
+            estimated_tokens (int, optional): 요청의 예상 입력 토큰 수. Defaults to 0.
+            api_keys (list, optional): 사용할 수 있는 API 키 목록.
+
+        Returns:
+            str: 선택된 API 키. 남은 한도 비율이 가장 큰 키를 고릅니다.
+        """
+        # 대기 중인 요청이 도착 순서대로 처리되도록 모델별 잠금을 잡은 채 기다립니다.
+        with self._queue_lock(model):
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    best_key, best_remaining, min_wait = None, -1.0, None
+                    for api_key in api_keys:
+                        request_bucket, token_bucket = self._key_buckets(model, api_key)
+                        wait = max(
+                            self._quarantined_until.get(api_key, 0) - now,
+                            request_bucket.wait_time(1),
+                            token_bucket.wait_time(estimated_tokens),
+                        )
+                        if wait > 0:
+                            min_wait = wait if min_wait is None else min(min_wait, wait)
+                            continue
+                        remaining = min(
+                            request_bucket.tokens / request_bucket.capacity,
+                            token_bucket.tokens / token_bucket.capacity,
+                        )
+                        if remaining > best_remaining:
+                            best_key, best_remaining = api_key, remaining
+
+                    if best_key is not None or min_wait is None:
+                        request_bucket, token_bucket = self._key_buckets(model, best_key)
+                        request_bucket.consume(1)
+                        token_bucket.consume(estimated_tokens)
+                        usage = self._key_stats(best_key)
+                        usage["requests"] += 1
+                        usage["tokens"] += estimated_tokens
+                        return best_key
+                time.sleep(min_wait)
+
+    def _backoff_delay(self, attempt: int, error) -> float:
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        retry_delay = _retry_delay_from_error(error)
+        if retry_delay is not None:
+            delay = max(delay, retry_delay)
+        return delay
+
+    def _handle_failure(self, model: str, attempt: int, error, api_key: str, api_keys):
+        """
+        재시도할 수 있는 오류이면 대기 시간(초)을, 아니면 None을 반환합니다.
+
+        429를 받은 키는 격리하고, 다른 키가 남아 있으면 기다리지 않고 바로 재시도합니다.
+        """
+        if attempt >= self.max_retries or not is_retryable_error(error):
+            return None
+        delay = self._backoff_delay(attempt, error)
+        with self._lock:
+            self.retries += 1
+            if getattr(error, "code", None) == 429:
+                self._key_stats(api_key)["rate_limited"] += 1
+                quarantine = _retry_delay_from_error(error) or self.quarantine_seconds
+                self._quarantined_until[api_key] = time.monotonic() + quarantine
+                # 격리된 키는 acquire가 알아서 피하므로, 다른 키가 있으면 바로 재시도합니다.
+                if len(api_keys) > 1:
+                    delay = 0.0
+        print(
+            f"[재시도 대기] {model} 호출 실패(키 {_key_label(api_key)}: {error}), "
+            f"{delay:.1f}초 후 재시도합니다."
+        )
+        return delay
+
+    def call(self, model: str, request_fn, estimated_tokens: int = 0, api_keys=(None,)):
+        """
+        한도 대기와 재시도를 적용하여 `request_fn(api_key)`를 호출합니다.
+
+        Args:
+            model (str): 호출할 모델 이름.
+            request_fn (callable): 선택된 API 키를 받아 API를 호출하는 함수.
+            estimated_tokens (int, optional): 요청의 예상 입력 토큰 수. Defaults to 0.
+            api_keys (list, optional): 사용할 수 있는 API 키 목록.
+
+        Returns:
+            `request_fn()`의 반환값.
+        """
+        attempt = 0
+        while True:
+            api_key = self.acquire(model, estimated_tokens, api_keys)
+            try:
+                return request_fn(api_key)
+            except Exception as e:
+                delay = self._handle_failure(model, attempt, e, api_key, api_keys)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    def stream(self, model: str, request_fn, estimated_tokens: int = 0, api_keys=(None,)):
+        """
+        스트리밍 호출에 한도 대기와 재시도를 적용합니다.
+
+        첫 조각을 받기 전에 실패한 경우에만 재시도하여, 이미 전달한 출력이
+        중복되지 않도록 합니다.
+
+        Args:
+            model (str): 호출할 모델 이름.
+            request_fn (callable): 선택된 API 키를 받아 스트림 이터레이터를 반환하는 함수.
+            estimated_tokens (int, optional): 요청의 예상 입력 토큰 수. Defaults to 0.
+            api_keys (list, optional): 사용할 수 있는 API 키 목록.
+
+        Yields:
+            스트림의 각 응답 조각.
+        """
+        attempt = 0
+        while True:
+            api_key = self.acquire(model, estimated_tokens, api_keys)
+            received = False
+            try:
+                for chunk in request_fn(api_key):
+                    received = True
+                    yield chunk
+                return
+            except Exception as e:
+                delay = None if received else self._handle_failure(
+                    model, attempt, e, api_key, api_keys
+                )
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    async def stream_async(self, model: str, request_fn, estimated_tokens: int = 0, api_keys=(None,)):
+        """
+        `stream`의 비동기 버전입니다. `request_fn(api_key)`는 비동기 스트림을 돌려주는 코루틴이어야 합니다.
+        """
+        attempt = 0
+        while True:
+            api_key = await asyncio.to_thread(
+                self.acquire, model, estimated_tokens, api_keys
+            )
+            received = False
+            try:
+                async for chunk in await request_fn(api_key):
+                    received = True
+                    yield chunk
+                return
+            except Exception as e:
+                delay = None if received else self._handle_failure(
+                    model, attempt, e, api_key, api_keys
+                )
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def key_stats(self) -> dict:
+        """
+        API 키별 요청 수, 예상 토큰 수, 429 횟수, 남은 격리 시간을 반환합니다.
+
+        결과는 키 전체의 짧은 해시로 구분하며, 표시용으로 가린 키는 "label"에 담습니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                _key_id(api_key): {
+                    "label": _key_label(api_key),
+                    **usage,
+                    "quarantined_seconds": max(
+                        0.0, self._quarantined_until.get(api_key, 0) - now
+                    ),
+                }
+                for api_key, usage in self._key_usage.items()
+            }
+
+
+_scheduler = GeminiScheduler()
+
+
+def get_scheduler() -> GeminiScheduler:
+    """프로세스 전체에서 공유하는 `GeminiScheduler`를 반환합니다."""
+    return _scheduler
@@ -0,0 +1,188 @@
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _shingles(text: str, size: int) -> set:
+    # 띄어쓰기와 문장 부호 차이에 흔들리지 않도록 글자 단위 shingle을 사용합니다.
+    normalized = _NON_WORD.sub("", text.lower())
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + size] for i in range(len(normalized) - size + 1)}
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH로 거의 같은 스크립트를 찾아 이전 생성 결과를 돌려주는 로컬 인덱스입니다.
+
+    스크립트마다 MinHash 서명을 만들어 JSON 파일에 저장하고, 서명을 여러 밴드로
+    나눈 LSH 버킷으로 후보를 고른 뒤 추정 Jaccard 유사도가 `threshold` 이상이고
+    조건(대상 청중 등)이 같은 항목만 적중으로 봅니다.
+    """
+
+    def __init__(
+        self,
+        index_path: str,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 5,
+        threshold: float = 0.8,
+        max_entries: int = 500,
+    ):
+        """
+        Args:
+            index_path (str): 인덱스를 저장할 JSON 파일 경로.
+            num_perm (int, optional): MinHash 해시 함수 수. Defaults to 64.
+            bands (int, optional): LSH 밴드 수. `num_perm`의 약수여야 합니다. Defaults to 16.
+            shingle_size (int, optional): shingle 글자 수. Defaults to 5.
+            threshold (float, optional): 적중으로 볼 최소 추정 유사도. Defaults to 0.8.
+            max_entries (int, optional): 보관할 최대 항목 수. 넘으면 오래된 항목부터 지웁니다.
+                Defaults to 500.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+        self.index_path = index_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        # 실행마다 같은 서명이 나오도록 고정된 시드로 해시 계수를 만듭니다.
+        rng = random.Random(num_perm)
+        self._permutations = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+        self._entries = self._load()
+        self._buckets = {}
+        for entry_id, entry in self._entries.items():
+            self._add_to_buckets(entry_id, entry["signature"])
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"경고: 유사도 인덱스({self.index_path})를 읽을 수 없어 초기화합니다: {e}")
+            return {}
+        # 설정이 달라 서명 길이가 맞지 않는 항목은 버립니다.
+        return {
+            entry_id: entry
+            for entry_id, entry in entries.items()
+            if len(entry.get("signature", [])) == self.num_perm
+        }
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            start = band * self.rows
+            yield f"{band}:" + ",".join(map(str, signature[start : start + self.rows]))
+
+    def _add_to_buckets(self, entry_id, signature):
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(entry_id)
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        for band_key in self._band_keys(entry["signature"]):
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def signature(self, text: str) -> list:
+        """텍스트의 MinHash 서명을 계산합니다."""
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+            for shingle in _shingles(text, self.shingle_size)
+        ]
+        if not hashes:
+            return [_MAX_HASH] * self.num_perm
+        return [
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        ]
+
+    def query(self, text: str, conditions: dict):
+        """
+        거의 같은 텍스트로 저장된 결과 중 조건이 일치하는 가장 유사한 항목을 찾습니다.
+
+        Args:
+            text (str): 찾을 텍스트.
+            conditions (dict): 함께 일치해야 하는 조건 (예: 대상 청중, 강의 제목).
+
+        Returns:
+            tuple or None: (저장된 결과, 추정 유사도). 없으면 None.
+        """
+        signature = self.signature(text)
+        with self._lock:
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(self._buckets.get(band_key, ()))
+
+            best = None
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if entry["conditions"] != conditions:
+                    continue
+                similarity = sum(
+                    x == y for x, y in zip(signature, entry["signature"])
+                ) / self.num_perm
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (entry["result"], similarity)
+
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return best
+
+    def add(self, text: str, conditions: dict, result: str):
+        """
+        텍스트와 조건에 대한 생성 결과를 인덱스에 추가합니다.
+
+        Args:
+            text (str): 원본 텍스트.
+            conditions (dict): 결과를 만든 조건.
+            result (str): 저장할 생성 결과.
+        """
+        signature = self.signature(text)
+        entry_id = hashlib.sha256(
+            json.dumps([signature, conditions], ensure_ascii=False, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        with self._lock:
+            if entry_id in self._entries:
+                self._remove(entry_id)
+            self._entries[entry_id] = {
+                "signature": signature,
+                "conditions": conditions,
+                "result": result,
+                "created": time.time(),
+            }
+            self._add_to_buckets(entry_id, signature)
+
+            while len(self._entries) > self.max_entries:
+                oldest = min(self._entries, key=lambda key: self._entries[key]["created"])
+                self._remove(oldest)
+            self._save()
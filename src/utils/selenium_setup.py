@@ -5,34 +5,80 @@ import json
 import shutil
 import subprocess
 import socket
+import urllib.request
 from dotenv import load_dotenv
 from selenium import webdriver
 
 
-def setup_selenium_driver(download_subdir: str, start_url: str):
+DEFAULT_DEBUGGING_PORT = 9222
+
+
+def wait_for_debugger(port: int, timeout: float = 15.0, process=None) -> bool:
     """
-    Selenium WebDriver를 설정하고 Chrome 브라우저를 실행하는 공통 함수입니다.
+    Chrome 원격 디버깅 엔드포인트가 응답할 때까지 기다립니다.
 
     Args:
-        download_subdir (str): 다운로드 파일을 저장할 하위 디렉토리 이름 (예: "videos", "pdfs").
-        start_url (str): WebDriver가 처음 로드할 URL.
+        port (int): 원격 디버깅 포트.
+        timeout (float, optional): 최대 대기 시간(초). Defaults to 15.0.
+        process (subprocess.Popen, optional): 기다리는 동안 종료되면 바로 실패로 볼 Chrome 프로세스.
 
     Returns:
-        webdriver.Chrome or None: 성공적으로 초기화된 WebDriver 인스턴스 또는 실패 시 None.
+        bool: 시간 안에 응답하면 True.
     """
-    load_dotenv()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{port}/json/version", timeout=1
+            ) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(0.1)
+    return False
+
+
+def find_chrome_path():
+    """
+    운영체제별 기본 위치에서 Chrome 실행 파일을 찾습니다.
 
-    current_script_dir = os.path.dirname(os.path.abspath(__file__))
-    user_data_dir_relative = os.path.join(
-        current_script_dir, "..", "..", "data", "selenium-dev-profile"
-    )
-    selenium_user_data_dir = os.path.abspath(user_data_dir_relative)
-    download_dir = os.path.abspath(
-        os.path.join(current_script_dir, "..", "..", "data", download_subdir)
-    )
+    Returns:
+        str or None: Chrome 실행 파일 경로. 찾지 못하면 None.
+    """
+    if platform.system() == "Darwin":
+        candidates = ["/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"]
+    elif platform.system() == "Windows":
+        candidates = [
+            "C:\\\\Program Files\\\\Google\\\\Chrome\\\\Application\\\\chrome.exe",
+            "C:\\\\Program Files (x86)\\\\Google\\\\Chrome\\\\Application\\\\chrome.exe",
+        ]
+    else:
+        candidates = [
+            shutil.which(name) or ""
+            for name in ("google-chrome", "google-chrome-stable", "chromium")
+        ]
+    for chrome_path in candidates:
+        if chrome_path and os.path.exists(chrome_path):
+            return chrome_path
+    return None
 
-    preferences_path = os.path.join(selenium_user_data_dir, "Default", "Preferences")
-    default_dir_path = os.path.join(selenium_user_data_dir, "Default")
+
+def update_download_preferences(user_data_dir: str, download_dir: str) -> bool:
+    """
+    Chrome 프로필의 Preferences 파일에 다운로드 경로와 다운로드 관련 설정을 씁니다.
+
+    Args:
+        user_data_dir (str): Chrome 사용자 데이터 디렉토리.
+        download_dir (str): 다운로드 파일을 저장할 디렉토리.
+
+    Returns:
+        bool: 성공하면 True, 실패하면 False.
+    """
+    preferences_path = os.path.join(user_data_dir, "Default", "Preferences")
+    default_dir_path = os.path.join(user_data_dir, "Default")
 
     if not os.path.exists(default_dir_path):
         os.makedirs(default_dir_path)
@@ -60,6 +106,7 @@ def setup_selenium_driver(download_subdir: str, start_url: str):
         with open(preferences_path, "w", encoding="utf-8") as f:
             json.dump(prefs_data, f, indent=4)
         print(f"Preferences 파일 업데이트 완료: {preferences_path}")
+        return True
 
     except json.JSONDecodeError:
         print(
@@ -79,55 +126,92 @@ def setup_selenium_driver(download_subdir: str, start_url: str):
             with open(preferences_path, "w", encoding="utf-8") as f:
                 json.dump(prefs_data, f, indent=4)
             print(f"새로운 Preferences 파일을 생성했습니다: {preferences_path}")
+            return True
         except Exception as backup_err:
             print(
                 f"Preferences 파일 처리 중 심각한 오류 발생 (백업/재생성 실패): {backup_err}"
             )
-            return
+            return False
     except Exception as e:
         print(f"Preferences 파일 처리 중 오류 발생: {e}")
-        return
-    if platform.system() == "Darwin":
-        chrome_path = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+        return False
+
+
+def download_dir_for(download_subdir: str) -> str:
+    """`data/<download_subdir>`의 절대 경로를 반환합니다."""
+    current_script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.abspath(
+        os.path.join(current_script_dir, "..", "..", "data", download_subdir)
+    )
+
+
+def setup_selenium_driver(
+    download_subdir: str,
+    start_url: str,
+    new_tab: bool = False,
+    debugger_address: str = None,
+):
+    """
+    Selenium WebDriver를 설정하고 Chrome 브라우저를 실행하는 공통 함수입니다.
+
+    Args:
+        download_subdir (str): 다운로드 파일을 저장할 하위 디렉토리 이름 (예: "videos", "pdfs").
+        start_url (str): WebDriver가 처음 로드할 URL.
+        new_tab (bool, optional): True이면 연결된 탭 대신 새 탭을 열어 사용합니다.
+            같은 Chrome에 연결된 다른 세션의 탭을 건드리지 않을 때 사용합니다.
+        debugger_address (str, optional): 이미 실행 중인 Chrome의 디버깅 주소 (예: `ChromeLauncher`로
+            띄운 인스턴스). 지정하면 기본 프로필과 포트 9222를 사용하지 않고 그 Chrome에 연결합니다.
+
+    Returns:
+        webdriver.Chrome or None: 성공적으로 초기화된 WebDriver 인스턴스 또는 실패 시 None.
+    """
+    load_dotenv()
+
+    current_script_dir = os.path.dirname(os.path.abspath(__file__))
+    user_data_dir_relative = os.path.join(
+        current_script_dir, "..", "..", "data", "selenium-dev-profile"
+    )
+    selenium_user_data_dir = os.path.abspath(user_data_dir_relative)
+    download_dir = download_dir_for(download_subdir)
+
+    if debugger_address:
+        # 런처가 프로필과 다운로드 설정을 마친 인스턴스입니다.
+        chrome_browser_open = True
     else:
-        chrome_path_pf = (
-            "C:\\\\Program Files\\\\Google\\\\Chrome\\\\Application\\\\chrome.exe"
-        )
-        chrome_path_x86 = (
-            "C:\\\\Program Files (x86)\\\\Google\\\\Chrome\\\\Application\\\\chrome.exe"
-        )
-        if os.path.exists(chrome_path_pf):
-            chrome_path = chrome_path_pf
-        elif os.path.exists(chrome_path_x86):
-            chrome_path = chrome_path_x86
-
-    # 포트가 사용 중인지 확인하는 함수
-    def is_port_in_use(port: int) -> bool:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            return s.connect_ex(("localhost", port)) == 0
-
-    if os.path.exists(chrome_path):
-        if not is_port_in_use(9222):  # 9222 포트가 사용 중이 아닐 때만 실행
-            print("Chrome 브라우저를 새로 시작합니다 (디버깅 포트 9222).")
-            subprocess.Popen(
-                [
-                    chrome_path,
-                    "--remote-debugging-port=9222",
-                    f"--user-data-dir={selenium_user_data_dir}",
-                ]
-            )
-            chrome_browser_open = False
-            time.sleep(2)  # 브라우저 시작 대기
+        if not update_download_preferences(selenium_user_data_dir, download_dir):
+            return
+
+        chrome_path = find_chrome_path()
+
+        # 포트가 사용 중인지 확인하는 함수
+        def is_port_in_use(port: int) -> bool:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                return s.connect_ex(("localhost", port)) == 0
+
+        if chrome_path:
+            if not is_port_in_use(DEFAULT_DEBUGGING_PORT):  # 9222 포트가 사용 중이 아닐 때만 실행
+                print(f"Chrome 브라우저를 새로 시작합니다 (디버깅 포트 {DEFAULT_DEBUGGING_PORT}).")
+                process = subprocess.Popen(
+                    [
+                        chrome_path,
+                        f"--remote-debugging-port={DEFAULT_DEBUGGING_PORT}",
+                        f"--user-data-dir={selenium_user_data_dir}",
+                    ]
+                )
+                chrome_browser_open = False
+                # 브라우저 시작 대기
+                wait_for_debugger(DEFAULT_DEBUGGING_PORT, process=process)
+            else:
+                chrome_browser_open = True
+                print(f"기존 Chrome 브라우저(디버깅 포트 {DEFAULT_DEBUGGING_PORT})를 사용합니다.")
         else:
-            chrome_browser_open = True
-            print("기존 Chrome 브라우저(디버깅 포트 9222)를 사용합니다.")
-    else:
-        print("Chrome 브라우저를 찾을 수 없습니다. 수동으로 Chrome을 실행해주세요.")
-        return
+            print("Chrome 브라우저를 찾을 수 없습니다. 수동으로 Chrome을 실행해주세요.")
+            return
+        debugger_address = f"127.0.0.1:{DEFAULT_DEBUGGING_PORT}"
 
     _options = webdriver.ChromeOptions()
 
-    _options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+    _options.add_experimental_option("debuggerAddress", debugger_address)
     _options.add_argument("--disable-blink-features=AutomationControlled")
     _options.add_argument(
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/88.0.4324.150 Safari/537.36"
@@ -146,6 +230,9 @@ def setup_selenium_driver(download_subdir: str, start_url: str):
 
     driver = webdriver.Chrome(options=_options)
 
+    if new_tab:
+        driver.switch_to.new_window("tab")
+
     driver.delete_all_cookies()
 
     # driver.execute_script("window.localStorage.clear();")
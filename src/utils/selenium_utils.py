@@ -1,9 +1,11 @@
 import os
 import platform
 import time
-import pyautogui
 import pyperclip
 import random
+import fnmatch
+import threading
+import weakref
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
@@ -14,9 +16,508 @@ from selenium.common.exceptions import (
     NoSuchElementException,
     TimeoutException,
     NoSuchWindowException,
+    StaleElementReferenceException,
     WebDriverException,
 )
 
+# 페이지에 MutationObserver를 한 번만 설치하고, 마지막 DOM 변경 이후 지난 시간(ms)을 반환합니다.
+_DOM_QUIET_SCRIPT = """
+if (!window.__aicaDomObserver) {
+    window.__aicaLastMutation = performance.now();
+    window.__aicaDomObserver = new MutationObserver(function () {
+        window.__aicaLastMutation = performance.now();
+    });
+    window.__aicaDomObserver.observe(document.documentElement, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+}
+return performance.now() - window.__aicaLastMutation;
+"""
+
+# fetch/XHR을 감싸 진행 중인 요청 수를 세고, 리소스 타이밍과 함께 마지막 네트워크 활동 시각을 구합니다.
+_NETWORK_STATE_SCRIPT = """
+if (!window.__aicaNetwork) {
+    var network = window.__aicaNetwork = {pending: 0, lastActivity: performance.now()};
+    var begin = function () { network.pending += 1; network.lastActivity = performance.now(); };
+    var end = function () {
+        network.pending = Math.max(0, network.pending - 1);
+        network.lastActivity = performance.now();
+    };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { end(); return response; },
+                function (error) { end(); throw error; }
+            );
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end);
+        return originalSend.apply(this, arguments);
+    };
+}
+var lastActivity = window.__aicaNetwork.lastActivity;
+performance.getEntriesByType('resource').forEach(function (entry) {
+    lastActivity = Math.max(lastActivity, entry.responseEnd);
+});
+return {
+    ready: document.readyState === 'complete',
+    pending: window.__aicaNetwork.pending,
+    idle_ms: performance.now() - lastActivity
+};
+"""
+
+# 키 입력 방식: "cdp"(기본값)는 Chrome DevTools Protocol로 탭에 직접 이벤트를 보내므로
+# 창 포커스가 필요 없고 헤드리스·병렬 실행이 가능합니다. "pyautogui"는 기존 OS 수준 입력입니다.
+INPUT_BACKEND = os.getenv("SELENIUM_INPUT_BACKEND", "cdp").lower()
+
+_CDP_KEYS = {
+    "tab": {"key": "Tab", "code": "Tab", "keyCode": 9},
+    "enter": {"key": "Enter", "code": "Enter", "keyCode": 13, "text": "\r"},
+    "space": {"key": " ", "code": "Space", "keyCode": 32, "text": " "},
+    "backspace": {"key": "Backspace", "code": "Backspace", "keyCode": 8},
+    "escape": {"key": "Escape", "code": "Escape", "keyCode": 27},
+    "left": {"key": "ArrowLeft", "code": "ArrowLeft", "keyCode": 37},
+    "up": {"key": "ArrowUp", "code": "ArrowUp", "keyCode": 38},
+    "right": {"key": "ArrowRight", "code": "ArrowRight", "keyCode": 39},
+    "down": {"key": "ArrowDown", "code": "ArrowDown", "keyCode": 40},
+    "delete": {"key": "Delete", "code": "Delete", "keyCode": 46},
+}
+_CDP_MODIFIERS = {"alt": 1, "ctrl": 2, "meta": 4, "shift": 8}
+
+# 입력 요소에는 프레임워크(React 등)가 감지하도록 네이티브 setter로 값을 넣고 이벤트를 발생시키며,
+# contenteditable 편집기에는 execCommand("insertText")로 입력 이벤트와 함께 텍스트를 넣습니다.
+_SET_TEXT_SCRIPT = """
+var element = arguments[0], text = arguments[1];
+element.focus();
+if (element.tagName === 'INPUT' || element.tagName === 'TEXTAREA') {
+    var prototype = element.tagName === 'INPUT' ? HTMLInputElement.prototype : HTMLTextAreaElement.prototype;
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, text);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+} else {
+    document.execCommand('insertText', false, text);
+}
+"""
+
+_GET_TEXT_SCRIPT = """
+var element = arguments[0];
+if (element.tagName === 'INPUT' || element.tagName === 'TEXTAREA') {
+    return element.value;
+}
+return (element.closest('[contenteditable]') || element).innerText;
+"""
+
+# 시스템 클립보드는 프로세스 전체가 공유하므로 클립보드 붙여넣기는 한 번에 하나씩만 합니다.
+_clipboard_lock = threading.Lock()
+
+# 대기 중 요소가 아직 없거나 다시 그려진 경우만 무시하고, 그 밖의 WebDriver 오류는 바로 올려 보냅니다.
+_IGNORED_WAIT_EXCEPTIONS = (
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+
+
+class WaitReport:
+    """한 자동화 실행의 고정 대기와 조건 대기 시간을 항목별로 집계합니다."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind, label, seconds):
+        with self._lock:
+            entry = self._entries.setdefault(
+                (kind, label), {"count": 0, "seconds": 0.0, "max_seconds": 0.0}
+            )
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+    def summary(self):
+        """
+        지금까지의 대기 시간 집계를 반환합니다.
+
+        Returns:
+            dict: `sleep`(고정 대기)과 `condition`(조건 대기)별 총 시간과,
+                항목별 횟수/총 시간/최대 시간.
+        """
+        with self._lock:
+            report = {"sleep": 0.0, "condition": 0.0, "items": {}}
+            for (kind, label), entry in self._entries.items():
+                report[kind] += entry["seconds"]
+                report["items"][f"{kind}:{label}"] = dict(entry)
+            return report
+
+    def print_report(self, title="대기 시간 보고서"):
+        """대기 시간 집계를 총 시간이 긴 항목부터 출력합니다."""
+        report = self.summary()
+        print(
+            f"[{title}] 고정 대기 {report['sleep']:.1f}초, 조건 대기 {report['condition']:.1f}초"
+        )
+        for name, entry in sorted(
+            report["items"].items(), key=lambda item: item[1]["seconds"], reverse=True
+        ):
+            print(
+                f"  - {name}: {entry['count']}회, 총 {entry['seconds']:.1f}초, 최대 {entry['max_seconds']:.1f}초"
+            )
+
+
+# 드라이버별 대기 시간 보고서입니다. 드라이버가 사라지면 보고서도 함께 정리됩니다.
+_wait_reports = weakref.WeakKeyDictionary()
+_wait_reports_lock = threading.Lock()
+
+
+def start_wait_report(driver):
+    """
+    드라이버에 새 대기 시간 보고서를 연결하고 반환합니다. 자동화 실행을 시작할 때 호출합니다.
+
+    이후 이 드라이버로 호출한 대기 함수의 대기 시간이 반환된 보고서에 기록되므로,
+    여러 자동화가 동시에 실행되어도 집계가 섞이지 않습니다.
+
+    Args:
+        driver: Selenium WebDriver 인스턴스. None이면 연결하지 않은 빈 보고서를 반환합니다.
+
+    Returns:
+        WaitReport: 새 보고서.
+    """
+    report = WaitReport()
+    if driver is not None:
+        with _wait_reports_lock:
+            _wait_reports[driver] = report
+    return report
+
+
+def _record_wait(driver, kind, label, seconds):
+    if driver is None:
+        return
+    with _wait_reports_lock:
+        report = _wait_reports.get(driver)
+    if report is not None:
+        report.record(kind, label, seconds)
+
+
+def pause(seconds, reason="고정 대기", driver=None):
+    """
+    페이지 상태로 판단할 수 없는 고정 대기를 수행하고 드라이버의 보고서에 기록합니다.
+
+    OS 수준 키 입력 간격처럼 조건 대기로 바꿀 수 없는 경우에만 사용합니다.
+    """
+    time.sleep(seconds)
+    _record_wait(driver, "sleep", reason, seconds)
+
+
+def wait_until(driver, condition, timeout=10, poll_interval=0.1, label="조건"):
+    """
+    조건이 참 값을 반환할 때까지 기다리고 걸린 시간을 보고서에 기록합니다.
+
+    Args:
+        driver: Selenium WebDriver 인스턴스.
+        condition (callable): driver를 받아 참 값 또는 거짓 값을 반환하는 함수.
+        timeout (float, optional): 최대 대기 시간(초). 기본값은 10.
+        poll_interval (float, optional): 확인 간격(초). 기본값은 0.1.
+        label (str, optional): 보고서에 표시할 이름.
+
+    Returns:
+        조건이 반환한 값.
+
+    Raises:
+        TimeoutException: 시간 안에 조건이 참이 되지 않은 경우.
+    """
+    start = time.monotonic()
+    try:
+        return WebDriverWait(
+            driver,
+            timeout,
+            poll_frequency=poll_interval,
+            ignored_exceptions=_IGNORED_WAIT_EXCEPTIONS,
+        ).until(condition)
+    finally:
+        _record_wait(driver, "condition", label, time.monotonic() - start)
+
+
+def wait_for_element_stable(driver, xpath, timeout=10, clickable=True):
+    """
+    요소가 클릭 가능(또는 표시)하고, 위치와 크기가 연속 두 번 같게 측정될 때까지 기다립니다.
+
+    애니메이션으로 움직이는 중인 요소를 클릭해 빗나가는 일을 막습니다.
+
+    Args:
+        driver: Selenium WebDriver 인스턴스.
+        xpath (str): 요소의 XPath.
+        timeout (float, optional): 최대 대기 시간(초). 기본값은 10.
+        clickable (bool, optional): False이면 표시 여부만 확인합니다. 기본값은 True.
+
+    Returns:
+        WebElement: 안정된 요소.
+
+    Raises:
+        TimeoutException: 시간 안에 요소가 안정되지 않은 경우.
+    """
+    locate = (
+        EC.element_to_be_clickable((By.XPATH, xpath))
+        if clickable
+        else EC.visibility_of_element_located((By.XPATH, xpath))
+    )
+    last_rect = {}
+
+    def stable(d):
+        element = locate(d)
+        if not element:
+            last_rect.clear()
+            return False
+        rect = element.rect
+        if last_rect.get("rect") == rect:
+            return element
+        last_rect["rect"] = rect
+        return False
+
+    return wait_until(driver, stable, timeout, label="요소 안정화")
+
+
+def wait_for_dom_quiescence(driver, quiet_ms=300, timeout=5):
+    """
+    DOM 변경이 `quiet_ms` 동안 없을 때까지 기다립니다.
+
+    페이지에 MutationObserver를 주입해 마지막 변경 시각을 추적합니다.
+
+    Args:
+        driver: Selenium WebDriver 인스턴스.
+        quiet_ms (int, optional): 변경이 없어야 하는 시간(ms). 기본값은 300.
+        timeout (float, optional): 최대 대기 시간(초). 기본값은 5.
+
+    Returns:
+        bool: 시간 안에 안정되면 True, 그렇지 않으면 False.
+    """
+    try:
+        wait_until(
+            driver,
+            lambda d: d.execute_script(_DOM_QUIET_SCRIPT) >= quiet_ms,
+            timeout,
+            label="DOM 안정화",
+        )
+        return True
+    except TimeoutException:
+        print(f"경고: {timeout}초 안에 DOM 변경이 멈추지 않았습니다. 계속 진행합니다.")
+        return False
+
+
+def wait_for_network_idle(driver, idle_ms=500, timeout=30):
+    """
+    문서 로딩이 끝나고, 진행 중인 fetch/XHR 요청이 없으며,
+    마지막 네트워크 활동 이후 `idle_ms`가 지날 때까지 기다립니다.
+
+    Args:
+        driver: Selenium WebDriver 인스턴스.
+        idle_ms (int, optional): 네트워크 활동이 없어야 하는 시간(ms). 기본값은 500.
+        timeout (float, optional): 최대 대기 시간(초). 기본값은 30.
+
+    Returns:
+        bool: 시간 안에 유휴 상태가 되면 True, 그렇지 않으면 False.
+    """
+
+    def idle(d):
+        state = d.execute_script(_NETWORK_STATE_SCRIPT)
+        return state["ready"] and state["pending"] == 0 and state["idle_ms"] >= idle_ms
+
+    try:
+        wait_until(driver, idle, timeout, poll_interval=0.2, label="네트워크 유휴")
+        return True
+    except TimeoutException:
+        print(f"경고: {timeout}초 안에 네트워크가 유휴 상태가 되지 않았습니다. 계속 진행합니다.")
+        return False
+
+
+def wait_for_page_ready(driver, timeout=30):
+    """네트워크 유휴와 DOM 안정화를 차례로 기다립니다. 둘 다 만족하면 True를 반환합니다."""
+    network_idle = wait_for_network_idle(driver, timeout=timeout)
+    return wait_for_dom_quiescence(driver, timeout=min(timeout, 10)) and network_idle
+
+
+def list_files(directory, pattern="*"):
+    """디렉토리에서 패턴과 일치하는 파일 이름 집합을 반환합니다. 디렉토리가 없으면 빈 집합."""
+    if not os.path.isdir(directory):
+        return set()
+    return set(fnmatch.filter(os.listdir(directory), pattern))
+
+
+def wait_for_new_file(
+    directory, pattern, initial_files, timeout=60, poll_interval=0.5, driver=None
+):
+    """
+    `initial_files`에 없던 파일이 다운로드 완료 상태로 나타날 때까지 기다립니다.
+
+    Chrome은 다운로드 중인 파일을 `.crdownload`로 저장했다가 완료 시 이름을 바꾸므로,
+    패턴과 일치하는 새 파일이 보이면 다운로드가 끝난 것으로 봅니다.
+    `initial_files`는 다운로드를 시작하기 전에 `list_files`로 구해야 합니다.
+
+    Args:
+        directory (str): 다운로드 디렉토리.
+        pattern (str): 파일 이름 패턴 (예: "*.pdf").
+        initial_files (set): 다운로드 시작 전 파일 이름 집합.
+        timeout (float, optional): 최대 대기 시간(초). 기본값은 60.
+        poll_interval (float, optional): 확인 간격(초). 기본값은 0.5.
+        driver (optional): 대기 시간을 기록할 보고서가 연결된 WebDriver.
+
+    Returns:
+        str | None: 새 파일의 전체 경로. 시간 초과 시 None.
+    """
+    start = time.monotonic()
+    try:
+        while time.monotonic() - start < timeout:
+            new_files = [
+                name
+                for name in list_files(directory, pattern) - set(initial_files)
+                if os.path.getsize(os.path.join(directory, name)) > 0
+            ]
+            if new_files:
+                newest = max(
+                    new_files, key=lambda name: os.path.getmtime(os.path.join(directory, name))
+                )
+                return os.path.join(directory, newest)
+            time.sleep(poll_interval)
+        return None
+    finally:
+        _record_wait(driver, "condition", f"파일 다운로드({pattern})", time.monotonic() - start)
+
+
+def _pyautogui():
+    # 화면이 없는 환경에서도 이 모듈을 불러올 수 있도록 필요할 때만 import합니다.
+    import pyautogui
+
+    return pyautogui
+
+
+def _use_cdp(driver):
+    return (
+        driver is not None
+        and INPUT_BACKEND != "pyautogui"
+        and hasattr(driver, "execute_cdp_cmd")
+    )
+
+
+def cdp_press_key(driver, key, count=1, modifiers=()):
+    """
+    CDP `Input.dispatchKeyEvent`로 현재 탭에 키 입력을 보냅니다.
+
+    이벤트는 탭에 직접 전달되므로 브라우저 창이 화면 맨 앞에 있을 필요가 없습니다.
+
+    Args:
+        driver: Chrome WebDriver 인스턴스.
+        key (str): 키 이름 ("tab", "enter", "down" 등).
+        count (int, optional): 누를 횟수. 기본값은 1.
+        modifiers (tuple, optional): 함께 누를 보조 키 ("shift", "ctrl", "alt", "meta").
+    """
+    spec = _CDP_KEYS[key]
+    mask = 0
+    for modifier in modifiers:
+        mask |= _CDP_MODIFIERS[modifier]
+    params = {
+        "key": spec["key"],
+        "code": spec["code"],
+        "windowsVirtualKeyCode": spec["keyCode"],
+        "nativeVirtualKeyCode": spec["keyCode"],
+        "modifiers": mask,
+    }
+    # Ctrl/Alt/Meta 조합은 문자를 입력하지 않습니다.
+    text = spec.get("text") if not mask & (1 | 2 | 4) else None
+
+    for _ in range(count):
+        key_down = dict(params, type="keyDown" if text else "rawKeyDown")
+        if text:
+            key_down["text"] = text
+            key_down["unmodifiedText"] = text
+        driver.execute_cdp_cmd("Input.dispatchKeyEvent", key_down)
+        driver.execute_cdp_cmd("Input.dispatchKeyEvent", dict(params, type="keyUp"))
+
+
+def cdp_click(driver, x, y, button="left"):
+    """CDP `Input.dispatchMouseEvent`로 뷰포트 좌표 (x, y)를 클릭합니다."""
+    driver.execute_cdp_cmd("Input.dispatchMouseEvent", {"type": "mouseMoved", "x": x, "y": y})
+    for event_type in ("mousePressed", "mouseReleased"):
+        driver.execute_cdp_cmd(
+            "Input.dispatchMouseEvent",
+            {"type": event_type, "x": x, "y": y, "button": button, "clickCount": 1},
+        )
+
+
+def cdp_click_element(driver, element):
+    """요소의 가운데를 CDP 마우스 이벤트로 클릭합니다."""
+    x, y = driver.execute_script(
+        "var rect = arguments[0].getBoundingClientRect();"
+        "return [rect.left + rect.width / 2, rect.top + rect.height / 2];",
+        element,
+    )
+    cdp_click(driver, x, y)
+
+
+def press_key(driver, key, count=1, modifiers=(), interval=None):
+    """
+    키를 누릅니다. CDP를 쓸 수 있으면 탭에 직접 보내고, 아니면 pyautogui를 사용합니다.
+
+    Args:
+        driver: Selenium WebDriver 인스턴스. None이면 pyautogui를 사용합니다.
+        key (str): 키 이름 ("tab", "enter", "down" 등).
+        count (int, optional): 누를 횟수. 기본값은 1.
+        modifiers (tuple, optional): 함께 누를 보조 키 ("shift", "ctrl", "alt", "meta").
+        interval (float, optional): 키 사이 간격(초). 페이지가 키 입력마다 화면을 갱신하는
+            메뉴처럼 간격이 필요한 경우에 지정합니다. 없으면 CDP 사용 시에는 바로 이어서 보내고,
+            pyautogui 사용 시에는 0.1~0.4초 사이에서 임의로 정합니다.
+    """
+    if _use_cdp(driver):
+        if not interval:
+            cdp_press_key(driver, key, count, modifiers)
+            return
+        for _ in range(count):
+            cdp_press_key(driver, key, 1, modifiers)
+            pause(interval, "키 입력 간격", driver)
+        return
+
+    pyautogui = _pyautogui()
+    for _ in range(count):
+        try:
+            for modifier in modifiers:
+                pyautogui.keyDown(modifier)
+            pyautogui.press(key)
+        finally:
+            for modifier in reversed(modifiers):
+                pyautogui.keyUp(modifier)
+        pause(
+            interval if interval is not None else random.randrange(1, 5) / 10,
+            "키 입력 간격",
+            driver,
+        )
+
+
+def switch_to_new_window(driver, known_handles, timeout=5):
+    """
+    `known_handles`에 없던 창(로그인 팝업 등)이 열리면 그 창으로 전환합니다.
+
+    Args:
+        driver: Selenium WebDriver 인스턴스.
+        known_handles (iterable): 동작 전의 창 핸들 목록.
+        timeout (float, optional): 새 창을 기다릴 최대 시간(초). 기본값은 5.
+
+    Returns:
+        str | None: 전환한 창 핸들. 새 창이 없으면 None.
+    """
+    known_handles = set(known_handles)
+    try:
+        handles = wait_until(
+            driver,
+            lambda d: [handle for handle in d.window_handles if handle not in known_handles],
+            timeout,
+            label="새 창",
+        )
+    except TimeoutException:
+        return None
+    driver.switch_to.window(handles[0])
+    return handles[0]
+
 
 def send_select_all_and_clear(element):
     """
@@ -37,7 +538,8 @@ def element_click(driver, xpath, timeout=10):
     """
     지정된 XPath를 사용하여 웹 요소를 찾아 클릭합니다.
 
-    요소가 클릭 가능해질 때까지 지정된 시간(timeout) 동안 기다립니다.
+    요소가 클릭 가능하고 위치가 안정될 때까지 지정된 시간(timeout) 동안 기다리고,
+    클릭 후에는 DOM 변경이 잦아들 때까지 기다립니다.
 
     Args:
         driver: Selenium WebDriver 인스턴스.
@@ -47,15 +549,10 @@ def element_click(driver, xpath, timeout=10):
     Returns:
         bool: 클릭에 성공하면 True, 그렇지 않으면 False.
     """
-    sleep_time = 1
     try:
-        time.sleep(sleep_time)
-        element = WebDriverWait(driver, timeout).until(
-            EC.element_to_be_clickable((By.XPATH, xpath))
-        )
-
+        element = wait_for_element_stable(driver, xpath, timeout)
         element.click()
-        time.sleep(sleep_time)
+        wait_for_dom_quiescence(driver, timeout=2)
         return True
 
     except Exception as e:
@@ -63,11 +560,57 @@ def element_click(driver, xpath, timeout=10):
         return False
 
 
+def _text_length(text):
+    return len("".join((text or "").split()))
+
+
+def insert_text_to_element(driver, element, text):
+    """
+    클립보드를 거치지 않고 요소에 텍스트를 넣습니다.
+
+    CDP를 쓸 수 있으면 `Input.insertText`로 포커스된 요소에 한 번에 입력하고,
+    아니면 `_SET_TEXT_SCRIPT`로 값을 넣고 입력 이벤트를 발생시킵니다.
+    편집기가 마크다운 등을 변환할 수 있으므로, 공백을 뺀 글자 수가 절반 이상
+    반영되었으면 성공으로 봅니다.
+
+    Args:
+        driver: Selenium WebDriver 인스턴스.
+        element: 포커스된 입력 요소 또는 편집기 요소.
+        text (str): 넣을 텍스트.
+
+    Returns:
+        bool: 텍스트가 반영되었으면 True.
+    """
+    try:
+        if _use_cdp(driver):
+            driver.execute_cdp_cmd("Input.insertText", {"text": text})
+        else:
+            driver.execute_script(_SET_TEXT_SCRIPT, element, text)
+        inserted = driver.execute_script(_GET_TEXT_SCRIPT, element)
+    except WebDriverException as e:
+        print(f"직접 입력 중 오류 발생: {e}")
+        return False
+    return _text_length(inserted) >= _text_length(text) / 2
+
+
+def paste_text_to_clipboard_element(element, text):
+    """시스템 클립보드에 텍스트를 복사한 뒤 Ctrl/Cmd+V로 붙여넣습니다."""
+    with _clipboard_lock:
+        pyperclip.copy(text)
+        element.click()
+        if platform.system() == "Darwin":
+            element.send_keys(Keys.COMMAND, "v")
+        else:
+            element.send_keys(Keys.CONTROL, "v")
+
+
 def paste_text_to_element(driver, xpath, text_to_paste, timeout=10):
     """
     지정된 XPath를 사용하여 웹 요소에 텍스트를 붙여넣습니다.
 
-    요소를 찾은 후, 기존 내용을 지우고 클립보드를 통해 새 텍스트를 붙여넣습니다.
+    요소를 찾은 후 기존 내용을 지우고, 클립보드 없이 텍스트를 직접 넣습니다
+    (`insert_text_to_element`). 직접 입력이 반영되지 않으면 다시 지우고
+    클립보드를 통해 붙여넣습니다.
 
     Args:
         driver: Selenium WebDriver 인스턴스.
@@ -78,28 +621,31 @@ def paste_text_to_element(driver, xpath, text_to_paste, timeout=10):
     Returns:
         bool: 텍스트 붙여넣기에 성공하면 True, 그렇지 않으면 False.
     """
-    sleep_time = 1
     try:
-        time.sleep(sleep_time)
-        element = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, xpath))
+        element = wait_until(
+            driver,
+            EC.presence_of_element_located((By.XPATH, xpath)),
+            timeout,
+            label="요소 표시",
         )
 
         send_select_all_and_clear(element)
-
-        pyperclip.copy(text_to_paste)
         element.click()
-        if platform.system() == "Darwin":
-            element.send_keys(Keys.COMMAND, "v")
+
+        if insert_text_to_element(driver, element, text_to_paste):
+            method = "직접 입력"
         else:
-            element.send_keys(Keys.CONTROL, "v")
+            print(f"요소 '{xpath}'에 직접 입력이 반영되지 않아 클립보드로 붙여넣습니다.")
+            send_select_all_and_clear(element)
+            paste_text_to_clipboard_element(element, text_to_paste)
+            method = "클립보드"
 
-        time.sleep(sleep_time)
+        wait_for_dom_quiescence(driver, timeout=2)
 
-        print(f"요소 '{xpath}'에 텍스트 붙여넣기 성공")
+        print(f"요소 '{xpath}'에 텍스트 붙여넣기 성공 ({method})")
         return True
 
-    except TimeoutError:
+    except TimeoutException:
         print(f"요소 '{xpath}' 로딩 시간 초과")
         return False
     except Exception as e:
@@ -139,16 +685,18 @@ def upload_file_to_element(
                 print(
                     f"Warning: Failed to click trigger element {trigger_xpath}, attempting upload anyway."
                 )
-            time.sleep(1)
 
         print(f"Locating file input element: {file_input_xpath}")
-        file_input = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.XPATH, file_input_xpath))
+        file_input = wait_until(
+            driver,
+            EC.presence_of_element_located((By.XPATH, file_input_xpath)),
+            timeout,
+            label="파일 입력 요소",
         )
         print("File input element located. Sending file path...")
         file_input.send_keys(abs_file_path)
         print(f"File path '{abs_file_path}' sent to input element.")
-        time.sleep(2)
+        wait_for_network_idle(driver, timeout=timeout)
         return True
     except TimeoutException:
         print(f"Error: File input element not found or timed out: {file_input_xpath}")
@@ -202,7 +750,7 @@ def select_dropdown_option(
             return False
 
         print("Dropdown option selected successfully.")
-        time.sleep(1)
+        wait_for_dom_quiescence(driver, timeout=2)
         return selected
 
     except TimeoutException:
@@ -233,51 +781,61 @@ def select_dropdown_option(
         return False
 
 
+def _focus_body(driver):
+    body = driver.find_element(By.TAG_NAME, "body")
+    if _use_cdp(driver):
+        cdp_click_element(driver, body)
+    else:
+        body.click()
+        pause(0.5, "키 입력 전 포커스", driver)
+
+
 def press_tab_multiple_times(driver, count):
-    """Press the Tab key multiple times using pyautogui."""
+    """Press the Tab key multiple times, then Enter."""
     print(f"Tab 키를 {count}번 누릅니다.")
-    
-    driver.find_element(By.TAG_NAME, "body").click()
-    time.sleep(0.5)
-    
-    for _ in range(count):
-        pyautogui.press("tab")
-        time.sleep(random.randrange(1, 5) / 10)
-    
-    press_enter()
+
+    _focus_body(driver)
+    press_key(driver, "tab", count)
+    press_enter(driver)
 
 
 def press_shift_tab_multiple_times(driver, count):
-    """Press the Shift + Tab key multiple times using pyautogui."""
+    """Press the Shift + Tab key multiple times, then Enter."""
     print(f"Shift + Tab 키를 {count}번 누릅니다.")
 
-    driver.find_element(By.TAG_NAME, "body").click()
-    time.sleep(0.5)
-
-    for _ in range(count):
-        try:
-            pyautogui.keyDown("shift")
-            pyautogui.press("tab")
-            pyautogui.keyUp("shift")
-            time.sleep(random.randrange(1, 5) / 10)
+    _focus_body(driver)
+    try:
+        press_key(driver, "tab", count, modifiers=("shift",))
+    except Exception as e:
+        print(f"Shift+Tab 실행 중 오류 발생: {e}")
 
-        except Exception as e:
-            print(f"Shift+Tab 실행 중 오류 발생: {e}")
-            pyautogui.keyUp("shift")
-    
-    press_enter()
+    press_enter(driver)
 
 
-def press_enter():
-    """Press the Enter key using pyautogui."""
+def press_enter(driver=None):
+    """Press the Enter key (CDP when a driver is given, otherwise pyautogui)."""
     print("Enter 키를 누릅니다.")
-    pyautogui.press("enter")
+    press_key(driver, "enter", interval=0)
+
+
+def bring_to_front(driver):
+    """
+    CDP `Page.bringToFront`로 현재 탭을 활성화하고 포커스 에뮬레이션을 켭니다.
+
+    OS 창 활성화 없이도 페이지가 포커스를 가진 것처럼 동작하므로,
+    헤드리스 실행이나 여러 창을 동시에 다룰 때도 키 입력과 포커스 이벤트가 전달됩니다.
+    """
+    driver.execute_cdp_cmd("Page.bringToFront", {})
+    driver.execute_cdp_cmd("Emulation.setFocusEmulationEnabled", {"enabled": True})
+    driver.execute_script("window.focus();")
 
 
 def chrome_focuse(driver, max_retries=3, delay_between_retries=0.5):
     """
-    Windows와 macOS에서 Selenium으로 제어 중인 Chrome 브라우저 창에 포커스를 맞추고
-    화면 맨 앞으로 가져옵니다.
+    Selenium으로 제어 중인 Chrome 탭에 포커스를 맞추고 화면 맨 앞으로 가져옵니다.
+
+    CDP를 쓸 수 있으면 `bring_to_front`로 바로 처리하고, 그렇지 않으면
+    Windows와 macOS에서 pyautogui로 OS 창을 활성화합니다.
 
     Args:
         driver: 활성 Selenium WebDriver 인스턴스.
@@ -291,6 +849,15 @@ def chrome_focuse(driver, max_retries=3, delay_between_retries=0.5):
         print("오류: 유효한 WebDriver 인스턴스가 제공되지 않았습니다.")
         return False
 
+    if _use_cdp(driver):
+        try:
+            bring_to_front(driver)
+            print("CDP로 Chrome 탭을 앞으로 가져왔습니다.")
+            return True
+        except WebDriverException as e:
+            print(f"CDP 포커싱 실패. OS 창 활성화를 시도합니다: {e}")
+
+    pyautogui = _pyautogui()
     system_os = platform.system()
     print(f"운영체제: {system_os}. Chrome 창 포커싱 시작...")
 
@@ -431,7 +998,6 @@ def chrome_focuse(driver, max_retries=3, delay_between_retries=0.5):
 def slider_drag(driver, slider_xpath, thumb_xpath, target_value):
     if element_click(driver, slider_xpath):
         print("트랙 클릭 성공 또는 시도됨.")
-        time.sleep(0.5)
 
         try:
             wait = WebDriverWait(driver, 10)
@@ -488,7 +1054,15 @@ def slider_drag(driver, slider_xpath, thumb_xpath, target_value):
             ).release().perform()
 
             print(f"슬라이더 값을 {target_value}(으)로 설정 시도 완료.")
-            time.sleep(1)
+            try:
+                wait_until(
+                    driver,
+                    lambda d: abs(float(thumb_element.get_attribute("aria-valuenow")) - target_value) < 0.5,
+                    timeout=2,
+                    label="슬라이더 값 반영",
+                )
+            except TimeoutException:
+                pass
 
             updated_value = float(thumb_element.get_attribute("aria-valuenow"))
             print(f"변경 후 실제 값 (aria-valuenow): {updated_value}")
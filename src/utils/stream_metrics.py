@@ -0,0 +1,206 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import deque
+
+STREAM_METRICS_LOG_PATH = os.path.join("data", "logs", "stream_metrics.jsonl")
+
+
+def _usage_dict(usage_metadata) -> dict:
+    if usage_metadata is None:
+        return {}
+    fields = (
+        "prompt_token_count",
+        "cached_content_token_count",
+        "candidates_token_count",
+        "thoughts_token_count",
+        "total_token_count",
+    )
+    return {
+        field: getattr(usage_metadata, field, None)
+        for field in fields
+        if getattr(usage_metadata, field, None) is not None
+    }
+
+
+class _CallRecorder:
+    """스트리밍 호출 하나의 시각과 조각 정보를 모아 이벤트로 만듭니다."""
+
+    def __init__(self, model: str, stage: str):
+        self.model = model
+        self.stage = stage
+        self.started_at = time.time()
+        self._start = time.monotonic()
+        self._first_chunk = None
+        self.chunks = 0
+        self.output_chars = 0
+        self.usage = {}
+
+    def on_chunk(self, chunk):
+        if self._first_chunk is None:
+            self._first_chunk = time.monotonic()
+        self.chunks += 1
+        self.output_chars += len(getattr(chunk, "text", None) or "")
+        # usage_metadata는 보통 마지막 조각에 누적값으로 담겨 오므로 마지막 값을 사용합니다.
+        usage = _usage_dict(getattr(chunk, "usage_metadata", None))
+        if usage:
+            self.usage = usage
+
+    def event(self, status: str, error=None) -> dict:
+        duration = time.monotonic() - self._start
+        ttft = self._first_chunk - self._start if self._first_chunk is not None else None
+        output_tokens = self.usage.get("candidates_token_count")
+        if output_tokens is None:
+            output_tokens = self.output_chars // 2
+        generation_seconds = duration - ttft if ttft is not None else 0.0
+        return {
+            "model": self.model,
+            "stage": self.stage,
+            "status": status,
+            "error": str(error) if error else None,
+            "started_at": self.started_at,
+            "ttft_seconds": ttft,
+            "duration_seconds": duration,
+            "chunks": self.chunks,
+            "output_chars": self.output_chars,
+            "output_tokens": output_tokens,
+            "tokens_per_second": (
+                output_tokens / generation_seconds if generation_seconds > 0 else None
+            ),
+            "usage": self.usage,
+        }
+
+
+class StreamMetrics:
+    """
+    스트리밍 Gemini 호출의 지연 시간과 처리량을 기록합니다.
+
+    호출마다 시작 시각, 첫 조각까지의 시간(TTFT), 전체 소요 시간, 조각 수,
+    출력 글자/토큰 수, usage 메타데이터를 담은 이벤트를 남기고,
+    모델과 단계별로 집계합니다. `log_path`가 있으면 이벤트를 JSONL로 덧붙여 저장합니다.
+    TTFT에는 스케줄러 대기와 재시도 시간이 포함됩니다.
+    """
+
+    def __init__(self, log_path: str = None, max_events: int = 1000):
+        """
+        Args:
+            log_path (str, optional): 이벤트를 저장할 JSONL 파일 경로. None이면 저장하지 않습니다.
+            max_events (int, optional): 메모리에 보관할 최근 이벤트 수. Defaults to 1000.
+        """
+        self.log_path = log_path
+        self._events = deque(maxlen=max_events)
+        self._aggregates = {}
+        self._lock = threading.Lock()
+
+    def track(self, stream, model: str, stage: str):
+        """
+        스트림을 감싸 각 조각을 그대로 전달하면서 호출 이벤트를 기록합니다.
+
+        Args:
+            stream: 응답 조각 이터레이터.
+            model (str): 호출한 모델 이름.
+            stage (str): 파이프라인 단계 이름 (예: "transcribe", "script", "detail").
+
+        Yields:
+            스트림의 각 응답 조각.
+        """
+        recorder = _CallRecorder(model, stage)
+        try:
+            for chunk in stream:
+                recorder.on_chunk(chunk)
+                yield chunk
+        except GeneratorExit:
+            self.record(recorder.event("cancelled"))
+            raise
+        except Exception as e:
+            self.record(recorder.event("error", e))
+            raise
+        self.record(recorder.event("ok"))
+
+    async def track_async(self, stream, model: str, stage: str):
+        """`track`의 비동기 버전입니다."""
+        recorder = _CallRecorder(model, stage)
+        try:
+            async for chunk in stream:
+                recorder.on_chunk(chunk)
+                yield chunk
+        except (GeneratorExit, asyncio.CancelledError):
+            self.record(recorder.event("cancelled"))
+            raise
+        except Exception as e:
+            self.record(recorder.event("error", e))
+            raise
+        self.record(recorder.event("ok"))
+
+    def record(self, event: dict):
+        """호출 이벤트 하나를 저장하고 집계에 반영합니다."""
+        key = f"{event['model']}:{event['stage']}"
+        with self._lock:
+            self._events.append(event)
+            aggregate = self._aggregates.setdefault(
+                key,
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "ttft_seconds": [],
+                    "duration_seconds": 0.0,
+                    "output_tokens": 0,
+                    "generation_seconds": 0.0,
+                },
+            )
+            aggregate["calls"] += 1
+            if event["status"] == "error":
+                aggregate["errors"] += 1
+            if event["ttft_seconds"] is not None:
+                aggregate["ttft_seconds"].append(event["ttft_seconds"])
+                aggregate["generation_seconds"] += (
+                    event["duration_seconds"] - event["ttft_seconds"]
+                )
+            aggregate["duration_seconds"] += event["duration_seconds"]
+            aggregate["output_tokens"] += event["output_tokens"]
+
+            if self.log_path:
+                try:
+                    os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                    with open(self.log_path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(event, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    print(f"경고: 스트리밍 지표를 기록하지 못했습니다: {e}")
+
+    def events(self) -> list:
+        """최근 호출 이벤트 목록을 반환합니다."""
+        with self._lock:
+            return list(self._events)
+
+    def summary(self) -> dict:
+        """`모델:단계`별 호출 수, 오류 수, TTFT(평균/p50/p95), 평균 소요 시간, 초당 토큰 수를 반환합니다."""
+        with self._lock:
+            result = {}
+            for key, aggregate in self._aggregates.items():
+                ttfts = sorted(aggregate["ttft_seconds"])
+                result[key] = {
+                    "calls": aggregate["calls"],
+                    "errors": aggregate["errors"],
+                    "avg_ttft_seconds": sum(ttfts) / len(ttfts) if ttfts else None,
+                    "p50_ttft_seconds": ttfts[len(ttfts) // 2] if ttfts else None,
+                    "p95_ttft_seconds": (
+                        ttfts[min(len(ttfts) - 1, int(len(ttfts) * 0.95))] if ttfts else None
+                    ),
+                    "avg_duration_seconds": aggregate["duration_seconds"] / aggregate["calls"],
+                    "tokens_per_second": (
+                        aggregate["output_tokens"] / aggregate["generation_seconds"]
+                        if aggregate["generation_seconds"] > 0
+                        else None
+                    ),
+                }
+            return result
+
+
+_metrics = StreamMetrics(STREAM_METRICS_LOG_PATH)
+
+
+def get_stream_metrics() -> StreamMetrics:
+    """프로세스 전체에서 공유하는 `StreamMetrics`를 반환합니다."""
+    return _metrics
@@ -0,0 +1,47 @@
+import os
+
+
+class StreamingTextWriter:
+    """
+    생성 중인 텍스트를 조각이 도착할 때마다 `<path>.part` 파일에 이어 씁니다.
+
+    생성이 끝나면 `commit()`으로 원래 경로에 원자적으로 옮기고, 중간에 실패하거나
+    프로그램이 종료되면 `.part` 파일에 그때까지의 결과가 남습니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): 최종 파일 경로.
+        """
+        self.path = path
+        self.part_path = path + ".part"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(self.part_path, "w", encoding="utf-8")
+
+    def write(self, text: str):
+        """조각을 이어 쓰고 바로 디스크로 내보냅니다."""
+        self._file.write(text)
+        self._file.flush()
+
+    def reset(self):
+        """지금까지 쓴 내용을 지웁니다. 이미 쓴 조각을 다른 응답으로 바꿔야 할 때 사용합니다."""
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.flush()
+
+    def commit(self) -> str:
+        """
+        `.part` 파일을 최종 경로로 옮깁니다.
+
+        Returns:
+            str: 최종 파일 경로.
+        """
+        self._file.close()
+        os.replace(self.part_path, self.path)
+        return self.path
+
+    def close(self):
+        """최종 경로로 옮기지 않고 파일을 닫습니다. 부분 결과는 `.part` 파일에 남습니다."""
+        if not self._file.closed:
+            self._file.close()
@@ -0,0 +1,69 @@
+import re
+
+# 단독으로 쓰인 감탄사형 군말만 지웁니다. "그", "이제", "약간"처럼 내용어로도 쓰이는 말은 남겨 두고,
+# 조사로 띄어 쓰일 수 있는 "에"는 "에에"처럼 늘어진 경우만 지웁니다.
+_FILLER = re.compile(
+    r"^(?:음+|어+|으+음*|아+|에{2,}|엄+|흠+|um+|uh+|erm+|hmm+)[~.,…]*$", re.IGNORECASE
+)
+_DIGIT = re.compile(r"\d")
+# 이 횟수 이상 연속으로 반복된 표현만 말 더듬기로 보고 합칩니다. "1 2 1 2"처럼 두 번 나오는 표현은 남깁니다.
+_MIN_REPEATS = 3
+_PUNCTUATION = re.compile(r"[,.!?…~]+$")
+_SPACES = re.compile(r"[ \t 　]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _normalize_token(token: str) -> str:
+    return _PUNCTUATION.sub("", token).lower()
+
+
+def _collapse_repeats(tokens, max_ngram: int = 4):
+    # 같은 n-그램이 _MIN_REPEATS번 이상 이어지면 한 번만 남깁니다 ("그 그 그" → "그").
+    # 숫자가 들어간 표현은 반복되어도 내용일 수 있으므로 합치지 않습니다.
+    normalized = [_normalize_token(token) for token in tokens]
+    result, i = [], 0
+    while i < len(tokens):
+        for n in range(1, max_ngram + 1):
+            ngram = normalized[i : i + n]
+            if len(ngram) < n or any(_DIGIT.search(token) for token in ngram):
+                continue
+            count = 1
+            while normalized[i + count * n : i + (count + 1) * n] == ngram:
+                count += 1
+            if count >= _MIN_REPEATS:
+                # 문장 부호가 붙은 뒤쪽 표현을 살리기 위해 마지막 반복을 남깁니다.
+                result.extend(tokens[i + (count - 1) * n : i + count * n])
+                i += count * n
+                break
+        else:
+            result.append(tokens[i])
+            i += 1
+    return result
+
+
+def clean_transcript(text: str, max_ngram: int = 4) -> str:
+    """
+    강의 음성 스크립트에서 군말, 말 더듬기, 반복 표현, 불필요한 공백을 정리합니다.
+
+    모델을 호출하지 않는 결정적 정리 과정이며, 줄 구분은 유지합니다.
+    자막처럼 같은 줄이 바로 이어서 반복되면 한 줄만 남깁니다.
+
+    Args:
+        text (str): 원본 스크립트.
+        max_ngram (int, optional): 세 번 이상 연속 반복을 합칠 최대 어절 수. Defaults to 4.
+
+    Returns:
+        str: 정리된 스크립트.
+    """
+    lines = []
+    previous = None
+    for line in text.replace("\r\n", "\n").split("\n"):
+        tokens = [
+            token for token in _SPACES.split(line.strip()) if token and not _FILLER.match(token)
+        ]
+        key = [_normalize_token(token) for token in tokens]
+        if key and key == previous:
+            continue
+        previous = key
+        lines.append(" ".join(_collapse_repeats(tokens, max_ngram)))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
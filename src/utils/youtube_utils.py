@@ -0,0 +1,124 @@
+import re
+import html
+from urllib.parse import urlparse, parse_qs
+
+_VIDEO_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{11}$")
+_PATH_PREFIXES = ("/shorts/", "/embed/", "/live/", "/v/")
+_YOUTUBE_DOMAINS = ("youtube.com", "youtube-nocookie.com")
+
+
+def extract_video_id(youtube_url: str):
+    """
+    YouTube URL에서 정규화된 동영상 ID(11자리)를 추출합니다.
+
+    `watch?v=`, `youtu.be/`, `/shorts/`, `/embed/`, `/live/` 형식을 지원합니다.
+
+    Args:
+        youtube_url (str): YouTube 동영상 URL.
+
+    Returns:
+        str or None: 동영상 ID. 유효한 ID를 찾지 못하면 None.
+    """
+    if not youtube_url:
+        return None
+
+    parsed = urlparse(youtube_url.strip())
+    host = (parsed.hostname or "").lower()
+    candidate = None
+
+    if host == "youtu.be":
+        candidate = parsed.path.lstrip("/").split("/")[0]
+    elif any(host == domain or host.endswith("." + domain) for domain in _YOUTUBE_DOMAINS):
+        if parsed.path == "/watch":
+            candidate = parse_qs(parsed.query).get("v", [None])[0]
+        else:
+            for prefix in _PATH_PREFIXES:
+                if parsed.path.startswith(prefix):
+                    candidate = parsed.path[len(prefix):].split("/")[0]
+                    break
+
+    if candidate and _VIDEO_ID_PATTERN.match(candidate):
+        return candidate
+    return None
+
+
+_VTT_TAG_PATTERN = re.compile(r"<[^>]+>")
+_VTT_SKIP_PREFIXES = ("WEBVTT", "Kind:", "Language:", "NOTE", "STYLE", "REGION")
+
+
+def select_caption_track(info: dict, languages=("ko",), preferred_ext="vtt"):
+    """
+    yt-dlp가 추출한 동영상 정보에서 사용할 자막 트랙을 고릅니다.
+
+    수동 자막을 자동 생성 자막보다 우선하며, `languages` 순서대로 탐색합니다.
+
+    Args:
+        info (dict): `YoutubeDL.extract_info`의 반환값.
+        languages (tuple[str], optional): 선호 언어 코드 목록. Defaults to ("ko",).
+        preferred_ext (str, optional): 선호 자막 형식. Defaults to "vtt".
+
+    Returns:
+        dict or None: `url`, `ext`, `language`, `automatic` 키를 가진 트랙 정보.
+            사용할 수 있는 트랙이 없으면 None.
+    """
+    for source, automatic in (("subtitles", False), ("automatic_captions", True)):
+        tracks_by_lang = info.get(source) or {}
+        for language in languages:
+            candidates = [
+                lang
+                for lang in tracks_by_lang
+                if lang == language or lang.startswith(f"{language}-")
+            ]
+            for lang in sorted(candidates, key=lambda l: (l != language, l)):
+                for track in tracks_by_lang[lang]:
+                    if track.get("ext") == preferred_ext and track.get("url"):
+                        return {
+                            "url": track["url"],
+                            "ext": track["ext"],
+                            "language": lang,
+                            "automatic": automatic,
+                        }
+    return None
+
+
+def clean_vtt_captions(vtt_text: str) -> str:
+    """
+    WebVTT 자막을 타이밍 정보 없는 일반 텍스트로 변환합니다.
+
+    헤더, 큐 번호, 타이밍 줄, 인라인 태그를 제거하고, 자동 생성 자막에서
+    이전 줄이 다음 큐에 반복되거나 점점 길어지며 반복되는(rolling caption)
+    중복을 제거합니다.
+
+    Args:
+        vtt_text (str): WebVTT 형식의 자막 원문.
+
+    Returns:
+        str: 정리된 자막 텍스트.
+    """
+    lines = []
+    skip_block = False
+    for raw_line in vtt_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            skip_block = False
+            continue
+        if skip_block:
+            continue
+        if line.startswith(_VTT_SKIP_PREFIXES):
+            skip_block = line.startswith(("NOTE", "STYLE", "REGION"))
+            continue
+        if "-->" in line or line.isdigit():
+            continue
+
+        text = html.unescape(_VTT_TAG_PATTERN.sub("", line)).strip()
+        text = " ".join(text.split())
+        if not text:
+            continue
+
+        if lines and text in lines[-3:]:
+            continue
+        if lines and text.startswith(lines[-1]):
+            lines[-1] = text
+            continue
+        lines.append(text)
+    return " ".join(lines)
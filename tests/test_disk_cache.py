@@ -0,0 +1,67 @@
+from src.utils import disk_cache
+from src.utils.disk_cache import DiskCache, get_disk_cache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache_with_clock(tmp_path, monkeypatch, **options):
+    clock = _Clock()
+    monkeypatch.setattr(disk_cache.time, "time", clock)
+    return DiskCache(str(tmp_path), **options), clock
+
+
+def test_evicts_least_recently_used_entry(tmp_path, monkeypatch):
+    cache, clock = _cache_with_clock(tmp_path, monkeypatch, max_entries=2)
+    cache.set("a", "1")
+    clock.now += 1
+    cache.set("b", "2")
+    clock.now += 1
+    assert cache.get("a") == "1"
+    clock.now += 1
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(list(tmp_path.glob("*.txt"))) == 2
+
+
+def test_evicts_until_total_size_fits(tmp_path, monkeypatch):
+    cache, clock = _cache_with_clock(tmp_path, monkeypatch, max_bytes=10)
+    cache.set("a", "12345")
+    clock.now += 1
+    cache.set("b", "12345")
+    clock.now += 1
+    cache.set("c", "123")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "12345"
+    assert cache.stats()["bytes"] == 8
+
+
+def test_expired_entry_is_a_miss(tmp_path, monkeypatch):
+    cache, clock = _cache_with_clock(tmp_path, monkeypatch, ttl_seconds=60)
+    cache.set("a", "1")
+    clock.now += 61
+
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "entries": 0, "bytes": 0}
+
+
+def test_index_survives_reopen(tmp_path):
+    DiskCache(str(tmp_path)).set("a", "값")
+    assert DiskCache(str(tmp_path)).get("a") == "값"
+
+
+def test_get_disk_cache_shares_instance_per_directory(tmp_path):
+    first = get_disk_cache(str(tmp_path / "shared"), max_entries=5)
+    second = get_disk_cache(str(tmp_path / "shared" / "."))
+
+    assert first is second
+    assert get_disk_cache(str(tmp_path / "other")) is not first
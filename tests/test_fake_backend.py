@@ -0,0 +1,184 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from google.genai import errors
+
+from src.modules import gemini_responder
+from src.modules.gemini_responder import GeminiResponder
+from src.utils import gemini_scheduler
+from src.utils.fake_gemini import FakeGeminiClient
+from src.utils.gemini_client import get_gemini_client, set_client_factory
+from src.utils.gemini_scheduler import GeminiScheduler
+from src.utils.stream_metrics import get_stream_metrics
+
+PRIMARY = GeminiResponder.STAGE_MODEL_POLICIES["script"]["model"]
+HEDGE = GeminiResponder.STAGE_MODEL_POLICIES["script"]["hedge_model"]
+SCRIPT_DATA = {"script": "원본 강의 스크립트입니다.", "lecture_title": "자료형", "professor_name": "홍길동"}
+
+
+class _PerModelClient(FakeGeminiClient):
+    """모델마다 첫 조각 지연과 오류를 따로 정하는 대역입니다."""
+
+    def __init__(self, ttft=None, failing_models=(), **options):
+        super().__init__(ttft_jitter_seconds=0.0, chunk_interval_seconds=0.0, **options)
+        self.ttft = ttft or {}
+        self.failing_models = failing_models
+
+    def _start_stream(self, model, contents, config):
+        plan = super()._start_stream(model, contents, config)
+        plan["ttft"] = self.ttft.get(model, 0.0)
+        if model in self.failing_models:
+            plan["error"] = errors.ClientError(
+                400, {"error": {"code": 400, "message": "bad request (fake)", "status": "INVALID_ARGUMENT"}}
+            )
+        return plan
+
+
+@pytest.fixture(scope="module", autouse=True)
+def no_metrics_log(tmp_path_factory):
+    # 공유 스트리밍 지표가 작업 디렉토리의 data/logs에 기록하지 않도록 합니다.
+    # 취소된 헤지 요청은 테스트가 끝난 뒤에 기록될 수 있으므로 모듈 전체에 적용합니다.
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(
+            get_stream_metrics(),
+            "log_path",
+            str(tmp_path_factory.mktemp("metrics") / "stream_metrics.jsonl"),
+        )
+        yield
+
+
+@pytest.fixture
+def use_fake_client(monkeypatch, tmp_path):
+    for name in ("GOOGLE_API_KEY", "GEMINI_API_KEY", "GOOGLE_API_KEYS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(gemini_responder, "RESPONSE_CACHE_DIR", str(tmp_path / "responses"))
+
+    def install(client):
+        set_client_factory(lambda api_key: client)
+        return client
+
+    yield install
+    set_client_factory(None)
+
+
+def _wait_for_event(timeout=5.0, **fields):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for event in get_stream_metrics().events():
+            if all(event[key] == value for key, value in fields.items()):
+                return event
+        time.sleep(0.05)
+    return None
+
+
+def _responder(**options):
+    return GeminiResponder(prompt_mode="script", clean_input=False, **options)
+
+
+def test_scheduler_retries_injected_errors(monkeypatch, use_fake_client):
+    # 격리 대기가 실제로 흐르지 않도록 스케줄러의 시계만 앞당깁니다.
+    clock = {"now": 0.0}
+    monkeypatch.setattr(
+        gemini_scheduler,
+        "time",
+        SimpleNamespace(
+            monotonic=lambda: clock["now"],
+            sleep=lambda seconds: clock.update(now=clock["now"] + seconds),
+        ),
+    )
+    client = use_fake_client(
+        FakeGeminiClient(
+            responses={"test-model": "완료"},
+            ttft_seconds=0.0,
+            ttft_jitter_seconds=0.0,
+            rate_limit_error_rate=0.3,
+            server_error_rate=0.3,
+            seed=1,
+        )
+    )
+    scheduler = GeminiScheduler(max_retries=20, base_delay=0.0)
+
+    for _ in range(5):
+        response = scheduler.call(
+            "test-model",
+            lambda api_key: get_gemini_client(api_key).models.generate_content(
+                model="test-model", contents="질문"
+            ),
+        )
+        assert response.text == "완료"
+
+    failures = client.stats["rate_limited"] + client.stats["server_errors"]
+    assert client.stats["rate_limited"] > 0 and client.stats["server_errors"] > 0
+    assert scheduler.retries == failures
+    assert client.stats["requests"] == 5 + failures
+
+
+def test_response_cache_hit_skips_model(use_fake_client):
+    client = use_fake_client(_PerModelClient(responses={PRIMARY: "생성된 스크립트"}))
+    responder = _responder(use_cache=True)
+
+    assert responder.generate_response(**SCRIPT_DATA) == "생성된 스크립트"
+    chunks = []
+    assert responder.generate_response(on_chunk=chunks.append, **SCRIPT_DATA) == "생성된 스크립트"
+
+    assert client.stats["requests"] == 1
+    assert chunks == ["생성된 스크립트"]
+    assert responder.response_cache.stats()["hits"] == 1
+
+
+def test_hedge_answer_used_when_primary_stalls_and_not_cached(use_fake_client):
+    use_fake_client(
+        _PerModelClient(
+            responses={PRIMARY: "주 모델 답변", HEDGE: "대체 모델 답변"},
+            ttft={PRIMARY: 1.0, HEDGE: 0.0},
+        )
+    )
+    before = GeminiResponder.hedge_stats()
+    responder = _responder(use_cache=True, hedge_after_seconds=0.1)
+    chunks = []
+
+    result = responder.generate_response(
+        on_chunk=chunks.append, on_reset=lambda: chunks.append("RESET"), **SCRIPT_DATA
+    )
+
+    after = GeminiResponder.hedge_stats()
+    assert result == "대체 모델 답변"
+    assert chunks == ["대체 모델 답변"]
+    assert after["requests"] - before["requests"] == 1
+    assert after["hedged"] - before["hedged"] == 1
+    assert after["hedge_wins"] - before["hedge_wins"] == 1
+    # 대체 모델의 답변은 주 모델의 응답 캐시에 남기지 않습니다.
+    assert responder.response_cache.stats()["entries"] == 0
+    # 진 쪽(주 모델) 요청은 첫 조각을 받는 즉시 취소됩니다.
+    assert _wait_for_event(model=PRIMARY, status="cancelled")
+
+
+def test_hedge_falls_back_to_primary_when_hedge_fails(use_fake_client):
+    use_fake_client(
+        _PerModelClient(
+            responses={PRIMARY: "주 모델 답변"},
+            ttft={PRIMARY: 0.5, HEDGE: 0.0},
+            failing_models=(HEDGE,),
+        )
+    )
+    before = GeminiResponder.hedge_stats()
+    responder = _responder(use_cache=True, hedge_after_seconds=0.1)
+
+    assert responder.generate_response(**SCRIPT_DATA) == "주 모델 답변"
+
+    after = GeminiResponder.hedge_stats()
+    assert after["hedged"] - before["hedged"] == 1
+    assert after["hedge_wins"] == before["hedge_wins"]
+    assert responder.response_cache.stats()["entries"] == 1
+
+
+def test_requests_without_hedging_are_counted(use_fake_client):
+    use_fake_client(_PerModelClient(responses={PRIMARY: "답변"}))
+    before = GeminiResponder.hedge_stats()
+
+    _responder(use_cache=False).generate_response(**SCRIPT_DATA)
+
+    after = GeminiResponder.hedge_stats()
+    assert after["requests"] - before["requests"] == 1
+    assert after["hedged"] == before["hedged"]
@@ -0,0 +1,138 @@
+import pytest
+from google.genai import errors
+
+from src.utils import gemini_scheduler
+from src.utils.gemini_scheduler import GeminiScheduler, is_retryable_error
+
+
+class _FakeTime:
+    """sleep이 시계를 앞당기는 가짜 시간입니다. 격리 대기가 실제로 흐르지 않게 합니다."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = _FakeTime()
+    monkeypatch.setattr(gemini_scheduler, "time", fake)
+    return fake
+
+
+def _api_error(code, retry_delay=None):
+    error = {"code": code, "message": "error", "status": "ERROR"}
+    if retry_delay:
+        error["details"] = [{"retryDelay": retry_delay}]
+    return errors.APIError(code, {"error": error})
+
+
+class _Request:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.keys = []
+
+    def __call__(self, api_key):
+        self.keys.append(api_key)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_retryable_errors():
+    assert is_retryable_error(_api_error(429))
+    assert is_retryable_error(_api_error(503))
+    assert not is_retryable_error(_api_error(400))
+    assert not is_retryable_error(ValueError("bad"))
+
+
+def test_non_retryable_error_is_raised_immediately(fake_time):
+    scheduler = GeminiScheduler()
+    request = _Request(_api_error(400))
+
+    with pytest.raises(errors.APIError):
+        scheduler.call("test-model", request, api_keys=["key-a"])
+
+    assert len(request.keys) == 1
+    assert scheduler.retries == 0
+
+
+def test_server_error_is_retried_with_backoff(fake_time):
+    scheduler = GeminiScheduler(base_delay=1.0, max_delay=4.0)
+    request = _Request(_api_error(503), _api_error(503), "ok")
+
+    assert scheduler.call("test-model", request, api_keys=["key-a"]) == "ok"
+    assert scheduler.retries == 2
+    assert len(fake_time.sleeps) == 2
+    assert all(0 <= delay <= 4.0 for delay in fake_time.sleeps)
+
+
+def test_gives_up_after_max_retries(fake_time):
+    scheduler = GeminiScheduler(max_retries=2, base_delay=0.0)
+    request = _Request(*[_api_error(503)] * 3)
+
+    with pytest.raises(errors.APIError):
+        scheduler.call("test-model", request, api_keys=["key-a"])
+
+    assert len(request.keys) == 3
+    assert scheduler.retries == 2
+
+
+def test_rate_limited_key_is_quarantined_and_other_key_used(fake_time):
+    scheduler = GeminiScheduler(quarantine_seconds=60.0)
+    request = _Request(_api_error(429), "ok")
+
+    assert scheduler.call("test-model", request, api_keys=["key-a", "key-b"]) == "ok"
+    assert request.keys[1] != request.keys[0]
+    assert fake_time.sleeps == [0.0]
+
+    stats = {usage["label"]: usage for usage in scheduler.key_stats().values()}
+    limited = next(usage for usage in stats.values() if usage["rate_limited"])
+    assert limited["quarantined_seconds"] == pytest.approx(60.0)
+
+
+def test_quarantine_uses_server_retry_delay(fake_time):
+    scheduler = GeminiScheduler(quarantine_seconds=60.0)
+    request = _Request(_api_error(429, retry_delay="27s"), "ok")
+
+    assert scheduler.call("test-model", request, api_keys=["key-a"]) == "ok"
+    # 키가 하나뿐이면 격리가 풀릴 때까지 기다렸다가 같은 키로 재시도합니다.
+    assert request.keys == ["key-a", "key-a"]
+    assert sum(fake_time.sleeps) >= 27.0
+
+
+def test_stream_is_not_retried_after_first_chunk(fake_time):
+    scheduler = GeminiScheduler(base_delay=0.0)
+    calls = []
+
+    def request(api_key):
+        calls.append(api_key)
+        yield "first"
+        raise _api_error(503)
+
+    chunks = []
+    with pytest.raises(errors.APIError):
+        for chunk in scheduler.stream("test-model", request, api_keys=["key-a"]):
+            chunks.append(chunk)
+
+    assert chunks == ["first"]
+    assert len(calls) == 1
+
+
+def test_key_stats_keep_keys_with_same_suffix_apart(fake_time):
+    scheduler = GeminiScheduler()
+    for api_key in ("first-key-1234", "second-key-1234"):
+        scheduler.call("test-model", lambda key: "ok", api_keys=[api_key])
+
+    stats = scheduler.key_stats()
+    assert len(stats) == 2
+    assert all(usage["requests"] == 1 for usage in stats.values())
+    assert all("first" not in usage["label"] for usage in stats.values())
@@ -0,0 +1,42 @@
+from src.modules.video_to_text import merge_overlapping_transcripts
+
+
+def test_merges_overlapping_boundary_once():
+    first = "오늘은 함수의 정의를 배우고 그 다음에 함수를 호출하는 방법을 살펴봅니다"
+    second = "그 다음에 함수를 호출하는 방법을 살펴봅니다 마지막으로 예제를 풉니다"
+
+    assert merge_overlapping_transcripts([first, second]) == (
+        "오늘은 함수의 정의를 배우고 그 다음에 함수를 호출하는 방법을 살펴봅니다 마지막으로 예제를 풉니다"
+    )
+
+
+def test_overlap_ignores_punctuation_and_case():
+    first = "We start with Python basics and then Move On To loops."
+    second = "then move on to loops, which repeat code."
+
+    assert merge_overlapping_transcripts([first, second]) == (
+        "We start with Python basics and then Move On To loops. which repeat code."
+    )
+
+
+def test_short_overlap_is_concatenated():
+    first = "하나 둘 셋 넷"
+    second = "셋 넷 다섯 여섯"
+
+    assert merge_overlapping_transcripts([first, second]) == "하나 둘 셋 넷 셋 넷 다섯 여섯"
+
+
+def test_overlap_outside_window_is_not_detected():
+    first = "a b c d " + " ".join(f"w{i}" for i in range(20))
+    second = "a b c d e f"
+
+    merged = merge_overlapping_transcripts([first, second], window_words=10)
+
+    assert merged == f"{first} {second}"
+
+
+def test_merges_three_chunks_and_skips_empty_input():
+    chunks = ["일 이 삼 사 오 육", "삼 사 오 육 칠 팔", "오 육 칠 팔 구 십"]
+
+    assert merge_overlapping_transcripts(chunks) == "일 이 삼 사 오 육 칠 팔 구 십"
+    assert merge_overlapping_transcripts([]) == ""
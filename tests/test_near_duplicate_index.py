@@ -0,0 +1,62 @@
+import pytest
+
+from src.utils.near_duplicate_index import NearDuplicateIndex
+
+SCRIPT = (
+    "안녕하세요 오늘은 파이썬의 리스트와 딕셔너리를 비교해 보겠습니다. "
+    "리스트는 순서가 있는 자료형이고 딕셔너리는 키와 값의 쌍으로 이루어져 있습니다. "
+    "각 자료형을 언제 쓰면 좋은지 예제와 함께 살펴보겠습니다."
+)
+CONDITIONS = {"target_audience": "일반인", "lecture_title": "자료형"}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return NearDuplicateIndex(str(tmp_path / "index.json"))
+
+
+def test_finds_near_duplicate_with_same_conditions(index):
+    index.add(SCRIPT, CONDITIONS, "생성 결과")
+    # 띄어쓰기와 문장 부호만 다른 스크립트는 같은 강의로 봅니다.
+    variant = SCRIPT.replace(". ", "\n").replace("안녕하세요 ", "안녕하세요, ")
+
+    result = index.query(variant, CONDITIONS)
+
+    assert result is not None
+    assert result[0] == "생성 결과"
+    assert result[1] >= index.threshold
+
+
+def test_different_conditions_or_text_miss(index):
+    index.add(SCRIPT, CONDITIONS, "생성 결과")
+
+    assert index.query(SCRIPT, dict(CONDITIONS, target_audience="중학생")) is None
+    assert index.query("전혀 다른 주제인 미적분의 극한 개념을 설명합니다.", CONDITIONS) is None
+    assert (index.hits, index.misses) == (0, 2)
+
+
+def test_signature_is_deterministic_across_instances(tmp_path):
+    first = NearDuplicateIndex(str(tmp_path / "a.json"))
+    second = NearDuplicateIndex(str(tmp_path / "b.json"))
+
+    assert first.signature(SCRIPT) == second.signature(SCRIPT)
+    assert len(first.signature(SCRIPT)) == first.num_perm
+
+
+def test_entries_persist_and_oldest_is_evicted(tmp_path):
+    path = str(tmp_path / "index.json")
+    index = NearDuplicateIndex(path, max_entries=1)
+    index.add(SCRIPT, CONDITIONS, "첫 결과")
+    index.add("완전히 다른 강의 스크립트로 통계학의 표본 분포를 다룹니다.", CONDITIONS, "둘째 결과")
+
+    reopened = NearDuplicateIndex(path, max_entries=1)
+
+    assert reopened.query(SCRIPT, CONDITIONS) is None
+    assert reopened.query(
+        "완전히 다른 강의 스크립트로 통계학의 표본 분포를 다룹니다.", CONDITIONS
+    )[0] == "둘째 결과"
+
+
+def test_bands_must_divide_num_perm(tmp_path):
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(str(tmp_path / "index.json"), num_perm=64, bands=10)
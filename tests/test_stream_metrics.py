@@ -0,0 +1,109 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import stream_metrics
+from src.utils.stream_metrics import StreamMetrics
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return 1_700_000_000.0 + self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(stream_metrics, "time", clock)
+    return clock
+
+
+def _stream(clock, texts, ttft=1.0, interval=0.5, usage=None, error=None):
+    # 첫 조각까지 ttft초, 이후 조각마다 interval초가 지난 것으로 시계를 움직입니다.
+    for index, text in enumerate(texts):
+        clock.now += ttft if index == 0 else interval
+        last = index == len(texts) - 1
+        yield SimpleNamespace(text=text, usage_metadata=usage if last else None)
+    if error:
+        raise error
+
+
+def test_records_ttft_chunks_and_chars(clock, tmp_path):
+    log_path = tmp_path / "logs" / "metrics.jsonl"
+    metrics = StreamMetrics(str(log_path))
+    usage = SimpleNamespace(prompt_token_count=100, candidates_token_count=30, total_token_count=130)
+
+    chunks = list(
+        metrics.track(_stream(clock, ["안녕", "하세요", "!"], usage=usage), "flash", "script")
+    )
+
+    assert [chunk.text for chunk in chunks] == ["안녕", "하세요", "!"]
+    (event,) = metrics.events()
+    assert event["status"] == "ok"
+    assert event["ttft_seconds"] == pytest.approx(1.0)
+    assert event["duration_seconds"] == pytest.approx(2.0)
+    assert event["chunks"] == 3
+    assert event["output_chars"] == 6
+    assert event["output_tokens"] == 30
+    assert event["tokens_per_second"] == pytest.approx(30.0)
+    assert json.loads(log_path.read_text(encoding="utf-8")) == event
+
+
+def test_estimates_tokens_from_chars_without_usage(clock):
+    metrics = StreamMetrics()
+
+    list(metrics.track(_stream(clock, ["가나다라", "마바"]), "flash", "detail"))
+
+    assert metrics.events()[0]["output_tokens"] == 3
+
+
+def test_aggregates_per_model_and_stage(clock):
+    metrics = StreamMetrics()
+    for ttft in (1.0, 3.0):
+        list(metrics.track(_stream(clock, ["a" * 20], ttft=ttft), "flash", "script"))
+    list(metrics.track(_stream(clock, ["b" * 20], ttft=0.5), "flash-lite", "script"))
+    with pytest.raises(RuntimeError):
+        list(
+            metrics.track(
+                _stream(clock, ["c"], ttft=2.0, error=RuntimeError("끊김")), "flash", "detail"
+            )
+        )
+
+    summary = metrics.summary()
+
+    assert set(summary) == {"flash:script", "flash-lite:script", "flash:detail"}
+    assert summary["flash:script"]["calls"] == 2
+    assert summary["flash:script"]["avg_ttft_seconds"] == pytest.approx(2.0)
+    assert summary["flash:script"]["p50_ttft_seconds"] == pytest.approx(3.0)
+    assert summary["flash:script"]["avg_duration_seconds"] == pytest.approx(2.0)
+    assert summary["flash-lite:script"]["avg_ttft_seconds"] == pytest.approx(0.5)
+    assert summary["flash:detail"]["errors"] == 1
+    assert metrics.events()[-1]["error"] == "끊김"
+
+
+def test_closing_stream_early_records_cancelled(clock):
+    metrics = StreamMetrics()
+    tracked = metrics.track(_stream(clock, ["a", "b", "c"]), "flash", "script")
+
+    next(tracked)
+    tracked.close()
+
+    (event,) = metrics.events()
+    assert event["status"] == "cancelled"
+    assert event["chunks"] == 1
+
+
+def test_keeps_only_recent_events(clock):
+    metrics = StreamMetrics(max_events=2)
+    for _ in range(3):
+        list(metrics.track(_stream(clock, ["a"]), "flash", "script"))
+
+    assert len(metrics.events()) == 2
+    assert metrics.summary()["flash:script"]["calls"] == 3
@@ -0,0 +1,58 @@
+import os
+
+from src.utils import streaming_writer
+from src.utils.streaming_writer import StreamingTextWriter
+
+
+def test_chunks_are_visible_in_part_file_before_commit(tmp_path):
+    path = tmp_path / "out" / "script.txt"
+    writer = StreamingTextWriter(str(path))
+    writer.write("첫 조각 ")
+    writer.write("둘째 조각")
+
+    assert not path.exists()
+    assert (tmp_path / "out" / "script.txt.part").read_text(encoding="utf-8") == "첫 조각 둘째 조각"
+    writer.close()
+
+
+def test_commit_moves_part_file_with_os_replace(tmp_path, monkeypatch):
+    path = tmp_path / "script.txt"
+    path.write_text("이전 결과", encoding="utf-8")
+    replaced = []
+    real_replace = os.replace
+
+    def recording_replace(src, dst):
+        replaced.append((src, dst))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(streaming_writer.os, "replace", recording_replace)
+    writer = StreamingTextWriter(str(path))
+    writer.write("새 결과")
+
+    assert writer.commit() == str(path)
+    assert replaced == [(str(path) + ".part", str(path))]
+    assert path.read_text(encoding="utf-8") == "새 결과"
+    assert not (tmp_path / "script.txt.part").exists()
+
+
+def test_abort_keeps_partial_output_and_final_file(tmp_path):
+    path = tmp_path / "script.txt"
+    path.write_text("이전 결과", encoding="utf-8")
+    writer = StreamingTextWriter(str(path))
+    writer.write("중간까지 생성된")
+    writer.close()
+    writer.close()
+
+    assert path.read_text(encoding="utf-8") == "이전 결과"
+    assert (tmp_path / "script.txt.part").read_text(encoding="utf-8") == "중간까지 생성된"
+
+
+def test_reset_discards_written_chunks(tmp_path):
+    path = tmp_path / "script.txt"
+    writer = StreamingTextWriter(str(path))
+    writer.write("버릴 내용이 더 깁니다")
+    writer.reset()
+    writer.write("대체 답변")
+    writer.commit()
+
+    assert path.read_text(encoding="utf-8") == "대체 답변"
@@ -0,0 +1,46 @@
+import pytest
+
+from src.utils.transcript_cleaner import clean_transcript
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("음 오늘은 어 함수를 배웁니다", "오늘은 함수를 배웁니다"),
+        ("um so uh we start", "so we start"),
+        ("음... 에에, 그러니까", "그러니까"),
+        # 조사로 띄어 쓴 "에"와 내용어로 쓰인 "그", "이제"는 남깁니다.
+        ("에 대한 설명입니다", "에 대한 설명입니다"),
+        ("그 책을 이제 펴 보세요", "그 책을 이제 펴 보세요"),
+    ],
+)
+def test_removes_standalone_fillers_only(text, expected):
+    assert clean_transcript(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("그 그 그 문제는", "그 문제는"),
+        ("이 부분 이 부분 이 부분이 중요합니다.", "이 부분 이 부분 이 부분이 중요합니다."),
+        ("이 부분 이 부분 이 부분, 중요합니다.", "이 부분, 중요합니다."),
+        # 두 번 반복은 강조일 수 있으므로 남깁니다.
+        ("정말 정말 중요합니다", "정말 정말 중요합니다"),
+    ],
+)
+def test_collapses_runs_of_three_or_more(text, expected):
+    assert clean_transcript(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["1 2 1 2 3", "3 3 3 개", "2024년 2024년 2024년 자료"],
+)
+def test_keeps_numeric_repeats(text):
+    assert clean_transcript(text) == text
+
+
+def test_drops_consecutive_duplicate_lines_and_normalizes_whitespace():
+    text = "첫 줄입니다\r\n첫   줄입니다\n\n\n\n다음 줄\t입니다\n첫 줄입니다"
+
+    assert clean_transcript(text) == "첫 줄입니다\n\n다음 줄 입니다\n첫 줄입니다"
@@ -0,0 +1,40 @@
+import pytest
+
+from src.utils.youtube_utils import extract_video_id
+
+VIDEO_ID = "dQw4w9WgXcQ"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        f"https://www.youtube.com/watch?v={VIDEO_ID}",
+        f"https://youtube.com/watch?v={VIDEO_ID}&t=42s",
+        f"https://m.youtube.com/watch?feature=share&v={VIDEO_ID}",
+        f"https://youtu.be/{VIDEO_ID}?si=abc",
+        f"https://www.youtube.com/shorts/{VIDEO_ID}",
+        f"https://www.youtube.com/embed/{VIDEO_ID}",
+        f"https://www.youtube.com/live/{VIDEO_ID}?feature=share",
+        f"https://www.youtube-nocookie.com/embed/{VIDEO_ID}",
+        f"  https://www.youtube.com/watch?v={VIDEO_ID}  ",
+    ],
+)
+def test_extract_video_id_supported_formats(url):
+    assert extract_video_id(url) == VIDEO_ID
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        None,
+        "",
+        f"https://notyoutube.com/watch?v={VIDEO_ID}",
+        f"https://youtube.com.example.com/watch?v={VIDEO_ID}",
+        f"https://example.com/watch?v={VIDEO_ID}",
+        "https://www.youtube.com/watch?v=short",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ!",
+        "https://www.youtube.com/playlist?list=PL1234567890",
+    ],
+)
+def test_extract_video_id_rejects_invalid_urls(url):
+    assert extract_video_id(url) is None